@@ -0,0 +1,61 @@
+"""
+Measure how much time the framework itself adds to a test run.
+
+Usage:
+    python -m benchmarks
+    python -m benchmarks -k json --rounds 50
+    python -m benchmarks --output benchmarks/baseline.json
+    python -m benchmarks --baseline benchmarks/baseline.json --threshold 15
+"""
+import argparse
+import os
+import sys
+
+from benchmarks.harness import (
+    compare_results, format_comparison, format_results, read_results, run_benchmarks, write_results
+)
+from config.config import REPORTS_DIR
+
+DEFAULT_OUTPUT = os.path.join(REPORTS_DIR, "benchmarks.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the test framework")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose module or function name contains this")
+    parser.add_argument("--rounds", type=int, default=30, help="Timed rounds per benchmark (default: 30)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"Results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--baseline", help="Compare median timings with this results file")
+    parser.add_argument("--threshold", type=float, default=10,
+                        help="Fail when a median is more than this many percent slower than the baseline (default: 10)")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many microseconds (default: 1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.pattern, rounds=args.rounds)
+    if not results:
+        print("No benchmarks matched", file=sys.stderr)
+        return 2
+
+    for line in format_results(results):
+        print(line)
+    write_results(results, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        rows = compare_results(results, read_results(args.baseline), args.threshold, args.min_delta_us)
+        print()
+        for line in format_comparison(rows, args.threshold):
+            print(line)
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:g}%: "
+                  f"{', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
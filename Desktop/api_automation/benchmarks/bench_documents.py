@@ -0,0 +1,39 @@
+import random
+import string
+
+from benchmarks.harness import benchmark, measure
+from utils.document_validator import PhraseMatcher
+
+# Size of the generated document and the phrase counts it is searched for
+DOCUMENT_CHARS = 1_000_000
+PHRASE_COUNTS = (10, 1000)
+
+
+def make_document(seed=1):
+    """Return paragraphs of random words adding up to about DOCUMENT_CHARS, and the words"""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+    paragraphs = [" ".join(rng.choice(words) for _ in range(150)) for _ in range(DOCUMENT_CHARS // 900)]
+    return paragraphs, words
+
+
+@benchmark
+def document_phrases(rounds):
+    """Time finding missing phrases in a 1 MB document: substring search per phrase and paragraph, and the matchers"""
+    paragraphs, words = make_document()
+    rng = random.Random(2)
+    results = {}
+    for count in PHRASE_COUNTS:
+        # Two-word phrases, half of them in the document
+        phrases = [" ".join(rng.sample(words, 2)) + ("" if index % 2 else "zz") for index in range(count)]
+
+        def substring_per_paragraph():
+            return [phrase for phrase in phrases if not any(phrase in paragraph for paragraph in paragraphs)]
+
+        searched, automaton = PhraseMatcher(phrases, use_automaton=False), PhraseMatcher(phrases, use_automaton=True)
+        results[f"documents.substring_per_paragraph_{count}_phrases"] = measure(substring_per_paragraph, rounds=rounds)
+        results[f"documents.matcher_search_{count}_phrases"] = measure(lambda: searched.missing(paragraphs),
+                                                                        rounds=rounds)
+        results[f"documents.matcher_automaton_{count}_phrases"] = measure(lambda: automaton.missing(paragraphs),
+                                                                           rounds=rounds)
+    return results
@@ -0,0 +1,32 @@
+import json
+from itertools import islice
+
+from benchmarks.harness import benchmark, measure
+from data.factories import LoginFactory, ValuationFactory
+from data.valuation_data import valid_valuation_payload
+
+# Payloads generated per timed round
+BATCH = 10_000
+
+
+@benchmark
+def payload_generation(rounds):
+    """Time building unique valuation and login bodies: dict and json.dumps per payload, and the factories"""
+    valuations = ValuationFactory(seed=1)
+    logins = LoginFactory(seed=1)
+
+    def dict_and_dumps():
+        for index in range(BATCH):
+            json.dumps({**valid_valuation_payload, "name": valuations.name(index)}).encode()
+
+    def drain(stream):
+        for _ in islice(stream, BATCH):
+            pass
+
+    return {
+        "factory.dict_json_dumps_valuation": measure(dict_and_dumps, rounds=rounds, inner=1),
+        "factory.valuation_bodies": measure(lambda: drain(valuations.bodies()), rounds=rounds, inner=1),
+        "factory.valuation_stream_10pct_invalid": measure(lambda: drain(valuations.stream(invalid_rate=0.1)),
+                                                          rounds=rounds, inner=1),
+        "factory.login_bodies": measure(lambda: drain(logins.bodies()), rounds=rounds, inner=1),
+    }
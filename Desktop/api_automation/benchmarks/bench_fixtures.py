@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.harness import benchmark
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE_FILE = os.path.join("benchmarks", "fixture_probe.py")
+
+
+def run_probe(tests, use_conftest):
+    """Run the probe tests in a new pytest process and return the microseconds between tests"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "gaps.json")
+        env = dict(os.environ, FIXTURE_PROBE_TESTS=str(tests), FIXTURE_PROBE_OUTPUT=output)
+        command = [sys.executable, "-m", "pytest", PROBE_FILE, "-q", "-p", "no:cacheprovider"]
+        if not use_conftest:
+            command.append("--noconftest")
+        subprocess.run(command, env=env, cwd=PROJECT_DIR, check=True, stdout=subprocess.DEVNULL)
+        with open(output) as gaps_file:
+            return json.load(gaps_file)
+
+
+@benchmark
+def fixture_overhead(rounds):
+    """
+    Time what conftest.py fixtures and hooks add to each test.
+
+    The same trivial tests run once with conftest.py and once without; the gap
+    between consecutive tests is pytest's own per-test work plus the conftest work.
+    """
+    tests = max(rounds, 2) * 5
+    with_conftest = run_probe(tests, use_conftest=True)
+    without_conftest = sorted(run_probe(tests, use_conftest=False))
+    baseline = without_conftest[len(without_conftest) // 2]
+    return {
+        "fixtures.per_test_with_conftest": with_conftest,
+        "fixtures.per_test_without_conftest": without_conftest,
+        "fixtures.conftest_overhead": [gap - baseline for gap in with_conftest],
+    }
@@ -0,0 +1,44 @@
+import io
+import json
+
+from requests import Response
+
+from benchmarks.harness import benchmark, measure
+from stub_server.fixtures import build_valuations
+from utils.json_stream import ResultStream
+
+# Sizes of the `results` lists to decode
+RESULT_SIZES = (100, 1_000, 10_000)
+
+
+def make_page(size):
+    """Return a valuation list page with `size` results, as the API sends it"""
+    return json.dumps({"total": size, "pageNo": 1, "perPage": size, "pages": 1,
+                       "results": build_valuations(count=size)}).encode()
+
+
+@benchmark
+def json_decode(rounds):
+    """Time decoding pages with large `results` lists: directly, through Response.json() and streamed"""
+    samples = {}
+    for size in RESULT_SIZES:
+        body = make_page(size)
+        inner = max(10_000 // size, 1)
+
+        def decode_response():
+            response = Response()
+            response._content = body
+            response.encoding = "utf-8"
+            return response.json()
+
+        def stream_response():
+            response = Response()
+            response.raw = io.BytesIO(body)
+            response.encoding = "utf-8"
+            for _ in ResultStream(response):
+                pass
+
+        samples[f"json.loads_{size}_results"] = measure(lambda: json.loads(body), rounds=rounds, inner=inner)
+        samples[f"json.response_json_{size}_results"] = measure(decode_response, rounds=rounds, inner=inner)
+        samples[f"json.stream_{size}_results"] = measure(stream_response, rounds=rounds, inner=inner)
+    return samples
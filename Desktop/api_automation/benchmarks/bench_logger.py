@@ -0,0 +1,76 @@
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+
+from benchmarks.harness import benchmark, measure
+from config.config import LOG_FORMAT
+from utils.logger import RecordQueueHandler, get_logger
+
+URL = "https://d3g8su2w1x0h24.cloudfront.net/api/valuation?perPage=10&pageNo=1&q=&username=mohit"
+
+
+def log_request(logger):
+    """Log what send_request logs for one successful request"""
+    logger.info(f"Sending GET request to {URL}")
+    logger.info("Response status code: 200 (41 ms, reused connection)")
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(f"benchmarks.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+@benchmark
+def logger_calls(rounds):
+    """Time one logger call as send_request makes it, and the cost of f-strings below the log level"""
+    logger = get_logger()
+    headers = {"Content-Type": "application/json", "Authorization": "Token bench-token"}
+    return {
+        "logger.info_fstring": measure(lambda: logger.info(f"Sending GET request to {URL}"),
+                                       rounds=rounds, inner=1_000),
+        "logger.debug_fstring_filtered": measure(lambda: logger.debug(f"Request headers: {headers}"),
+                                                 rounds=rounds, inner=10_000),
+        "logger.debug_args_filtered": measure(lambda: logger.debug("Request headers: %s", headers),
+                                              rounds=rounds, inner=10_000),
+    }
+
+
+@benchmark
+def logging_per_request(rounds):
+    """
+    Time the logging of one request with a file handler on the calling thread (the old
+    basicConfig setup) and with the queue handler utils.logger now uses.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        file_handler = logging.FileHandler(os.path.join(directory, "sync.log"))
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        sync_logger = make_logger("sync", file_handler)
+
+        queued_file_handler = logging.FileHandler(os.path.join(directory, "queued.log"))
+        queued_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        records = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(records, queued_file_handler)
+        queued_logger = make_logger("queued", RecordQueueHandler(records))
+        listener.start()
+        try:
+            samples = {
+                "logger.file_handler_per_request": measure(lambda: log_request(sync_logger),
+                                                           rounds=rounds, inner=500),
+                "logger.queue_handler_per_request": measure(lambda: log_request(queued_logger),
+                                                            rounds=rounds, inner=500),
+            }
+        finally:
+            listener.stop()
+            for handler in (file_handler, queued_file_handler):
+                sync_logger.removeHandler(handler)
+                handler.close()
+    samples["logger.saved_per_request"] = [
+        sync - queued for sync, queued in
+        zip(samples["logger.file_handler_per_request"], samples["logger.queue_handler_per_request"])
+    ]
+    return samples
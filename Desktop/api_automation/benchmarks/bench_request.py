@@ -0,0 +1,69 @@
+from benchmarks.harness import benchmark, measure
+from config.config import TEST_TIMEOUT
+from data.test_data import default_headers
+from endpoints.registry import Route, valuation_list
+from endpoints.valuation_endpoints import get_valuation_list_endpoint
+from stub_server.server import StubConfig, StubServer
+from utils.metrics import MetricsCollector
+from utils.request_handler import add_request_listener, get_session, remove_request_listener, send_request
+
+BENCH_TOKEN = "Token bench-token"
+
+
+@benchmark
+def request_overhead(rounds):
+    """
+    Time send_request against a local stub and a bare session.get on the same pooled session.
+
+    The difference is what the framework adds to every request: logging, timing,
+    retry bookkeeping and the metrics listener the test session registers.
+    """
+    collector = MetricsCollector()
+    server = StubServer(port=0, config=StubConfig(tokens=[BENCH_TOKEN])).start()
+    url = f"{server.url}/api/dealer_radius_factor"
+    headers = {"Authorization": BENCH_TOKEN}
+    params = {"type": "StepsOptions"}
+    session = get_session()
+    add_request_listener(collector.record)
+    try:
+        framework = []
+        bare = []
+        # Alternate between the two so both see the same machine load
+        for _ in range(rounds):
+            framework.extend(measure(lambda: send_request("GET", url, headers=headers, params=params),
+                                     rounds=1, inner=20))
+            bare.extend(measure(lambda: session.get(url, headers=headers, params=params, timeout=TEST_TIMEOUT),
+                                rounds=1, inner=20))
+    finally:
+        remove_request_listener(collector.record)
+        server.stop()
+    return {
+        "request.send_request": framework,
+        "request.session_get": bare,
+        "request.overhead": [with_framework - without for with_framework, without in zip(framework, bare)],
+    }
+
+
+@benchmark
+def request_preparation(rounds):
+    """Time the per-request work tests do before calling send_request"""
+    def build_request():
+        headers = default_headers.copy()
+        headers["Authorization"] = BENCH_TOKEN
+        headers["Content-Type"] = "text/plain"
+        return get_valuation_list_endpoint(per_page=10, page_no=1, username="mohit"), headers
+
+    def build_search_url():
+        # Plain string building, as before the route registry (no encoding)
+        return f"http://stub/api/valuation?perPage={10}&pageNo={1}&q={'Estimate'}&username={'mohit'}"
+
+    ids = iter(range(10 ** 9))
+    # A route with a typed path parameter, as the stub server's valuation delete route
+    valuation = Route("valuation", "/api/valuation/{valuation_id:int}")
+    return {
+        "request.build_headers_and_url": measure(build_request, rounds=rounds, inner=10_000),
+        "request.url_fstring": measure(build_search_url, rounds=rounds, inner=10_000),
+        "request.url_route": measure(lambda: valuation_list.url(per_page=10, page_no=1, query="Estimate",
+                                                                username="mohit"), rounds=rounds, inner=10_000),
+        "request.url_route_new_id": measure(lambda: valuation.url(valuation_id=next(ids)), rounds=rounds, inner=10_000),
+    }
@@ -0,0 +1,30 @@
+from benchmarks.harness import benchmark, measure
+from stub_server.fixtures import build_factors
+from utils.schema_validator import get_validator, validate_response
+
+# Number of factors on the page that is validated
+PAGE_SIZE = 10_000
+
+
+def make_factor_page(size):
+    """Return a factor list page with `size` results, built from the stub factors"""
+    factors = build_factors()
+    results = [dict(factors[index % len(factors)], id=index + 1) for index in range(size)]
+    return {"total": size, "pageNo": 1, "perPage": size, "pages": 1, "results": results}
+
+
+@benchmark
+def schema_validation(rounds):
+    """Time validating a large factor page with the compiled check and with jsonschema alone"""
+    page = make_factor_page(PAGE_SIZE)
+    validator, _ = get_validator("factor_list")
+
+    def validate_with_jsonschema():
+        for error in validator.iter_errors(page):
+            raise AssertionError(error.message)
+
+    return {
+        f"schema.validate_response_{PAGE_SIZE}_factors": measure(lambda: validate_response("factor_list", page),
+                                                                 rounds=rounds),
+        f"schema.jsonschema_{PAGE_SIZE}_factors": measure(validate_with_jsonschema, rounds=rounds),
+    }
@@ -0,0 +1,38 @@
+import json
+
+from benchmarks.bench_schema import make_factor_page
+from benchmarks.harness import benchmark, measure
+from utils.snapshot import canonical, diff, normalize
+
+# Number of factors on the compared page
+PAGE_SIZE = 10_000
+
+
+def parsed_page():
+    """Helper function to build a factor page the way a response parses, with no objects shared between factors"""
+    return json.loads(json.dumps(make_factor_page(PAGE_SIZE)))
+
+
+@benchmark
+def snapshot_comparison(rounds):
+    """Time comparing a large factor page with its snapshot: equal, with one changed field, and with deepdiff"""
+    # Imported here: deepdiff is only the baseline to compare with
+    from deepdiff import DeepDiff
+
+    stored = normalize(parsed_page(), ["results[*].createdOn"])
+    stored_text = canonical(stored)
+    same = parsed_page()
+    changed = parsed_page()
+    changed["results"][PAGE_SIZE // 2]["weight"][1]["weight_value"] = 4
+
+    def compare_equal():
+        assert canonical(normalize(same, ["results[*].createdOn"])) == stored_text
+
+    return {
+        f"snapshot.compare_equal_{PAGE_SIZE}_factors": measure(compare_equal, rounds=rounds),
+        f"snapshot.diff_one_change_{PAGE_SIZE}_factors": measure(
+            lambda: diff(stored, normalize(changed, ["results[*].createdOn"])), rounds=rounds),
+        f"snapshot.deepdiff_one_change_{PAGE_SIZE}_factors": measure(
+            lambda: DeepDiff(stored, changed, exclude_regex_paths=[r"root\['results'\]\[\d+\]\['createdOn'\]"]),
+            rounds=rounds),
+    }
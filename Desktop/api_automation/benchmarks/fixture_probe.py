@@ -0,0 +1,23 @@
+"""
+Trivial tests run by bench_fixtures.py to time what conftest.py adds to every test.
+
+Each test records when it ran; the last one writes the gaps between tests to the file
+named by FIXTURE_PROBE_OUTPUT.
+"""
+import json
+import os
+import time
+import pytest
+
+PROBE_TESTS = int(os.getenv("FIXTURE_PROBE_TESTS", 200))
+
+_started = []
+
+@pytest.mark.parametrize("index", range(PROBE_TESTS))
+def test_probe(index):
+    """Record when this test ran"""
+    _started.append(time.perf_counter())
+    if index == PROBE_TESTS - 1:
+        gaps = [(later - earlier) * 1_000_000 for earlier, later in zip(_started, _started[1:])]
+        with open(os.environ["FIXTURE_PROBE_OUTPUT"], "w") as output_file:
+            json.dump(gaps, output_file)
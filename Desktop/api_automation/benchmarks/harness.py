@@ -0,0 +1,177 @@
+import importlib
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+from utils.metrics import percentile
+
+# Registered benchmark functions, in registration order
+_benchmarks = []
+
+
+def benchmark(func):
+    """
+    Register a benchmark function.
+
+    The function gets the number of rounds to run and returns {result name: samples},
+    where samples are microseconds per operation. One function can return several
+    results that share an expensive setup (e.g. a stub server).
+    """
+    _benchmarks.append(func)
+    return func
+
+
+def measure(func, rounds, inner=1, warmup=1):
+    """
+    Time `func` and return microseconds per call for each round.
+
+    Parameters:
+        func (callable): Operation to time, called without arguments
+        rounds (int): Number of timed rounds
+        inner (int): Calls per round, so fast operations are not lost in timer resolution
+        warmup (int): Untimed rounds run first
+
+    Returns:
+        list: Microseconds per call, one value per round
+    """
+    samples = []
+    for iteration in range(warmup + rounds):
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        elapsed = time.perf_counter() - start
+        if iteration >= warmup:
+            samples.append(elapsed / inner * 1_000_000)
+    return samples
+
+
+@dataclass
+class BenchmarkResult:
+    """Summary of the samples of one benchmark, in microseconds per operation"""
+
+    name: str
+    rounds: int
+    min_us: float
+    median_us: float
+    mean_us: float
+    p90_us: float
+    stdev_us: float
+
+    @classmethod
+    def from_samples(cls, name, samples):
+        ordered = sorted(samples)
+        return cls(
+            name=name,
+            rounds=len(ordered),
+            min_us=round(ordered[0], 3),
+            median_us=round(statistics.median(ordered), 3),
+            mean_us=round(statistics.fmean(ordered), 3),
+            p90_us=round(percentile(ordered, 90), 3),
+            stdev_us=round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def load_benchmarks():
+    """Import every benchmarks/bench_*.py module so their benchmarks register"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.startswith("bench_") and file_name.endswith(".py"):
+            importlib.import_module(f"benchmarks.{file_name[:-3]}")
+    return list(_benchmarks)
+
+
+def run_benchmarks(pattern=None, rounds=30):
+    """
+    Run the registered benchmarks.
+
+    Parameters:
+        pattern (str): Only run benchmark functions whose module or name contains this text
+        rounds (int): Timed rounds per benchmark
+
+    Returns:
+        list: BenchmarkResult objects
+    """
+    results = []
+    for func in load_benchmarks():
+        qualified = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        if pattern and pattern not in qualified:
+            continue
+        for name, samples in func(rounds).items():
+            results.append(BenchmarkResult.from_samples(name, samples))
+    return results
+
+
+def write_results(results, path):
+    """Write results as JSON together with the interpreter and machine they ran on"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+    with open(path, "w") as results_file:
+        json.dump(data, results_file, indent=2)
+
+
+def read_results(path):
+    with open(path) as results_file:
+        return json.load(results_file)["results"]
+
+
+def compare_results(results, baseline, threshold_pct, min_delta_us=1.0):
+    """
+    Compare median timings with a baseline.
+
+    A benchmark regressed when its median is more than `threshold_pct` percent and more
+    than `min_delta_us` microseconds slower, so sub-microsecond jitter is not reported.
+
+    Parameters:
+        results (list): BenchmarkResult objects of this run
+        baseline (dict): {name: result dict} read from a results file
+        threshold_pct (float): Slowdown in percent that counts as a regression
+        min_delta_us (float): Smallest slowdown in microseconds that counts as a regression
+
+    Returns:
+        list: (name, baseline median, current median, change in percent or None, regressed) tuples
+    """
+    rows = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None or not base["median_us"]:
+            rows.append((result.name, None, result.median_us, None, False))
+            continue
+        delta = result.median_us - base["median_us"]
+        change = delta / base["median_us"] * 100
+        rows.append((result.name, base["median_us"], result.median_us, change,
+                     change > threshold_pct and delta > min_delta_us))
+    return rows
+
+
+def format_results(results):
+    """Return the results as text table lines"""
+    width = max([len(result.name) for result in results] + [9])
+    lines = [f"{'benchmark':<{width}}  {'rounds':>6}  {'min':>11}  {'median':>11}  {'p90':>11}  {'stdev':>11}"]
+    for result in results:
+        lines.append(f"{result.name:<{width}}  {result.rounds:>6}  {result.min_us:>9.1f}us  "
+                     f"{result.median_us:>9.1f}us  {result.p90_us:>9.1f}us  {result.stdev_us:>9.1f}us")
+    return lines
+
+
+def format_comparison(rows, threshold_pct):
+    """Return the baseline comparison as text table lines"""
+    width = max([len(row[0]) for row in rows] + [9])
+    lines = [f"{'benchmark':<{width}}  {'baseline':>11}  {'current':>11}  {'change':>8}"]
+    for name, base, current, change, regressed in rows:
+        base_text = f"{base:>9.1f}us" if base is not None else f"{'-':>11}"
+        change_text = f"{change:>+7.1f}%" if change is not None else f"{'new':>8}"
+        flag = f"  REGRESSION (> {threshold_pct:g}%)" if regressed else ""
+        lines.append(f"{name:<{width}}  {base_text}  {current:>9.1f}us  {change_text}{flag}")
+    return lines
@@ -1,14 +1,140 @@
-from .settings import BASE_URL, AUTH_TOKEN
+import os
+
+from .settings import get_settings, load_dotenv_once
 
 # Test Configuration
-TEST_TIMEOUT = 30  # seconds
-MAX_RETRIES = 3
+# BASE_URL, AUTH_TOKEN, TEST_TIMEOUT and the POOL_* names are looked up in get_settings() on
+# access (see __getattr__ below). Code that has to follow the pytest options (--env, --base-url,
+# --request-timeout, --pool-*) calls get_settings() when it needs a value instead.
+MAX_RETRIES = 3  # total attempts per request, including the first one
+
+# Connection Pool Configuration
+# Each process (and so each pytest-xdist worker) keeps one pooled session. Its sizes come
+# from POOL_CONNECTIONS, POOL_MAXSIZE and POOL_BLOCK (see config/settings.py).
+
+# Cleanup Configuration (see utils/resource_tracker.py)
+# Valuations created by the tests are deleted at the end of the session.
+# The API documents no route that deletes a valuation, so they are only deleted when
+# VALUATION_DELETE_PATH names one (see config/settings.py and endpoints/registry.py)
+
+# Soak Configuration (pytest --soak=DURATION, see utils/soak.py)
+SOAK_MIN_SAMPLES = 5  # requests an endpoint needs in a window for its latency to be compared
+
+# Auth Configuration
+AUTH_TOKEN_REFRESH_MARGIN = 60  # refresh tokens this many seconds before they expire
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOGS_DIR = "logs"
 
 # Test Data Configuration
 TEST_DATA_DIR = "data"
+CASSETTES_DIR = os.path.join("tests", "cassettes")  # recorded responses for --transport=record/replay
+CASSETTE_LOCKS_DIR = os.path.join(".cache", "cassette_locks")  # lock files of cassettes being saved, kept out of git
+SNAPSHOTS_DIR = os.path.join("tests", "snapshots")  # golden responses compared by the snapshot fixture
+SNAPSHOT_MAX_CHANGES = 50  # differences listed when a response does not match its snapshot
 REPORTS_DIR = "reports"
-LOGS_DIR = "logs"
+EVENTS_DIR = os.path.join(REPORTS_DIR, "events")  # JSON-lines event logs written with --event-log
+
+
+def _list(name, default):
+    """Return the comma-separated values of environment variable `name`"""
+    return [value.strip() for value in os.getenv(name, default).split(",") if value.strip()]
+
+
+# Names read from the environment (and .env) on first access, then kept (see __getattr__ below)
+_ENVIRONMENT_VALUES = {
+    # Retry Configuration
+    "RETRY_BACKOFF_BASE": lambda: float(os.getenv("RETRY_BACKOFF_BASE", 0.5)),  # seconds, doubled on every retry
+    "RETRY_BACKOFF_MAX": lambda: float(os.getenv("RETRY_BACKOFF_MAX", 8)),  # longest single backoff in seconds
+    "RETRY_AFTER_MAX": lambda: float(os.getenv("RETRY_AFTER_MAX", 30)),  # longest Retry-After header we will wait for
+    "RETRY_BUDGET_RATIO": lambda: float(os.getenv("RETRY_BUDGET_RATIO", 0.2)),  # retries allowed per request sent
+    "RETRY_BUDGET_MIN_RETRIES": lambda: int(os.getenv("RETRY_BUDGET_MIN_RETRIES", 10)),  # retries always allowed
+    "RETRY_BUDGET_MAX_BACKOFF": lambda: float(os.getenv("RETRY_BUDGET_MAX_BACKOFF", 60)),  # total backoff allowed per session
+
+    # Default number of requests send_many keeps in flight at once
+    "ASYNC_CONCURRENCY": lambda: int(os.getenv("ASYNC_CONCURRENCY", 10)),
+
+    # Bytes read at a time when a response list is parsed while it downloads (see utils/json_stream.py)
+    "STREAM_CHUNK_SIZE": lambda: int(os.getenv("STREAM_CHUNK_SIZE", 64 * 1024)),
+
+    # Response Cache Configuration (enabled with --response-cache, see utils/response_cache.py)
+    # Only GET responses of these endpoints are cached; they serve the same data for the whole run.
+    "RESPONSE_CACHE_ENDPOINTS": lambda: _list(
+        "RESPONSE_CACHE_ENDPOINTS", "/api/get_documents_by_section,/api/dealer_radius_factor,/api/factor"
+    ),
+    "RESPONSE_CACHE_TTL": lambda: float(os.getenv("RESPONSE_CACHE_TTL", 300)),  # seconds before an entry is revalidated
+    "RESPONSE_CACHE_MAX_ENTRIES": lambda: int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256)),
+
+    # Single-Flight Configuration (enabled with --single-flight, see utils/single_flight.py)
+    # With --single-flight-workers, responses are shared between xdist workers through this folder.
+    "SINGLE_FLIGHT_DIR": lambda: os.getenv("SINGLE_FLIGHT_DIR", os.path.join(".cache", "single_flight")),
+
+    # Cleanup Configuration (see utils/resource_tracker.py)
+    "CLEANUP_BATCH_SIZE": lambda: int(os.getenv("CLEANUP_BATCH_SIZE", 50)),  # resources deleted per batch
+    "CLEANUP_CONCURRENCY": lambda: int(os.getenv("CLEANUP_CONCURRENCY", 8)),  # DELETE requests in flight at once
+    "CLEANUP_RETRIES": lambda: int(os.getenv("CLEANUP_RETRIES", 2)),  # extra rounds for deletes that failed
+    "CLEANUP_RETRY_DELAY": lambda: float(os.getenv("CLEANUP_RETRY_DELAY", 1)),  # seconds before the first extra round, doubled after
+
+    # Test Scheduling Configuration (pytest -n, see utils/duration_history.py)
+    "TEST_DURATIONS_FILE": lambda: os.getenv("TEST_DURATIONS_FILE", os.path.join("reports", "test_durations.json")),
+    # Tests using these session fixtures are kept on the same worker where possible
+    "SCHEDULE_AFFINITY_FIXTURES": lambda: _list("SCHEDULE_AFFINITY_FIXTURES", "auth_provider"),
+
+    # Soak Configuration (pytest --soak=DURATION, see utils/soak.py)
+    "SOAK_WINDOW_SECONDS": lambda: float(os.getenv("SOAK_WINDOW_SECONDS", 60)),  # length of one sampling window
+    "SOAK_WARMUP_WINDOWS": lambda: int(os.getenv("SOAK_WARMUP_WINDOWS", 1)),  # first windows left out while pools and caches fill
+    # Rise over the run (after warm-up) flagged as a leak when a value keeps growing
+    "SOAK_GROWTH_LIMITS": lambda: {
+        "rss_mb": float(os.getenv("SOAK_RSS_GROWTH_MB", 50)),
+        "open_fds": int(os.getenv("SOAK_FD_GROWTH", 10)),
+        "pools": int(os.getenv("SOAK_POOL_GROWTH", 3)),
+    },
+    "SOAK_LATENCY_DRIFT": lambda: float(os.getenv("SOAK_LATENCY_DRIFT", 0.5)),  # p90 rise flagged as drift (0.5: 50 % slower)
+    "SOAK_ERROR_RATE_RISE": lambda: float(os.getenv("SOAK_ERROR_RATE_RISE", 0.05)),  # error rate rise flagged (0.05: 5 points)
+
+    # Auth Configuration
+    "AUTH_TOKEN_TTL": lambda: int(os.getenv("AUTH_TOKEN_TTL", 3600)),  # seconds, used when the login response has no expiry
+    "AUTH_CACHE_FILE": lambda: os.getenv("AUTH_CACHE_FILE", os.path.join(".cache", "auth_token.json")),
+
+    # Local Stub Server Configuration (ENVIRONMENT=local, see stub_server/)
+    "STUB_LATENCY_MS": lambda: float(os.getenv("STUB_LATENCY_MS", 0)),  # delay added to every response
+    "STUB_LATENCY_JITTER_MS": lambda: float(os.getenv("STUB_LATENCY_JITTER_MS", 0)),  # random extra delay, up to this much
+    "STUB_ERROR_RATE": lambda: float(os.getenv("STUB_ERROR_RATE", 0)),  # share of requests answered with STUB_ERROR_STATUS
+    "STUB_ERROR_STATUS": lambda: int(os.getenv("STUB_ERROR_STATUS", 503)),
+    "STUB_SEED": lambda: os.getenv("STUB_SEED"),  # makes injected latency and errors repeatable
+
+    # Logging Configuration
+    "LOG_JSON": lambda: os.getenv("LOG_JSON", "false").lower() == "true",  # write JSON lines (.jsonl) instead of text
+    "LOG_MAX_BYTES": lambda: int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024)),  # rotate each log file at this size
+    "LOG_BACKUP_COUNT": lambda: int(os.getenv("LOG_BACKUP_COUNT", 5)),  # rotated files kept per process
+    "LOG_KEEP_RUNS": lambda: int(os.getenv("LOG_KEEP_RUNS", 0)),  # log files of older runs are deleted at start (0: keep all)
+
+    # Test Data Configuration
+    "FACTORY_SEED": lambda: os.getenv("FACTORY_SEED"),  # makes generated payloads repeatable (see data/factories.py)
+    "EVENT_LOG_BATCH_SIZE": lambda: int(os.getenv("EVENT_LOG_BATCH_SIZE", 500)),  # events buffered before writing
+    "EVENT_LOG_FLUSH_SECONDS": lambda: float(os.getenv("EVENT_LOG_FLUSH_SECONDS", 2)),  # longest time an event stays buffered
+}
+
+# Names resolved from the settings of this process on every access
+_SETTING_NAMES = {
+    "BASE_URL": "base_url",
+    "AUTH_TOKEN": "auth_token",
+    "TEST_TIMEOUT": "test_timeout",  # seconds
+    "POOL_CONNECTIONS": "pool_connections",  # number of hosts to keep pools for
+    "POOL_MAXSIZE": "pool_maxsize",  # keep-alive connections per host
+    "POOL_BLOCK": "pool_block",  # wait for a free connection instead of opening extra ones
+    "VALUATION_DELETE_PATH": "valuation_delete_path",  # route that deletes one valuation ("": none)
+}
+
+
+def __getattr__(name):
+    if name in _SETTING_NAMES:
+        return getattr(get_settings(), _SETTING_NAMES[name])
+    if name in _ENVIRONMENT_VALUES:
+        # Read .env before the environment, then keep the value so later lookups skip __getattr__
+        load_dotenv_once()
+        value = globals()[name] = _ENVIRONMENT_VALUES[name]()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,218 @@
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Get current environment from environment variable, default to 'dev'
-CURRENT_ENV = os.getenv('ENVIRONMENT', 'dev')
-
-# Environment-specific configurations
-ENVIRONMENTS = {
-    'dev': {
-        'BASE_URL': 'https://d3g8su2w1x0h24.cloudfront.net',
-        'AUTH_TOKEN': os.getenv('DEV_AUTH_TOKEN', ''),
-    },
-    'staging': {
-        'BASE_URL': 'https://staging-d3g8su2w1x0h24.cloudfront.net',  # Example staging URL
-        'AUTH_TOKEN': os.getenv('STAGING_AUTH_TOKEN', ''),
-    },
-    'prod': {
-        'BASE_URL': 'https://prod-d3g8su2w1x0h24.cloudfront.net',  # Example production URL
-        'AUTH_TOKEN': os.getenv('PROD_AUTH_TOKEN', ''),
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields, replace
+
+# Base URL of each environment; the token of each comes from <ENV>_AUTH_TOKEN (see get_environments)
+ENVIRONMENT_URLS = {
+    'dev': 'https://d3g8su2w1x0h24.cloudfront.net',
+    'staging': 'https://staging-d3g8su2w1x0h24.cloudfront.net',  # Example staging URL
+    'prod': 'https://prod-d3g8su2w1x0h24.cloudfront.net',  # Example production URL
+    'local': 'http://127.0.0.1:8765',  # bundled stub server (stub_server/), LOCAL_BASE_URL overrides it
+}
+
+# Settings of this process, loaded on first use (see get_settings)
+_settings = None
+_dotenv_loaded = False
+_lock = threading.Lock()
+
+
+def _find_dotenv():
+    """Return the .env file in this folder or the closest folder above it, or None"""
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, '.env')
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def load_dotenv_once():
+    """Load environment variables from the .env file, once per process"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    dotenv_path = _find_dotenv()
+    if dotenv_path:
+        # Imported here: python-dotenv takes a while to import and is only needed with a .env file
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path)
+
+
+def _env_value(name, default, convert):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name}={value!r} is not a valid {convert.__name__}") from None
+
+
+def _to_bool(value):
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_environments():
+    """
+    Return the settings of every environment.
+
+    Returns:
+        dict: {environment name: {"BASE_URL": ..., "AUTH_TOKEN": ...}}
+    """
+    load_dotenv_once()
+    environments = {
+        env: {'BASE_URL': url, 'AUTH_TOKEN': os.getenv(f'{env.upper()}_AUTH_TOKEN', '')}
+        for env, url in ENVIRONMENT_URLS.items()
     }
+    environments['local']['BASE_URL'] = os.getenv('LOCAL_BASE_URL', ENVIRONMENT_URLS['local'])
+    environments['local']['AUTH_TOKEN'] = os.getenv('LOCAL_AUTH_TOKEN', 'Token local-stub-token')
+    return environments
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Settings of one test run, read from the environment (and .env) once per process.
+
+    The object is frozen: use configure() or override_settings() to change settings,
+    e.g. from the pytest command line (--env, --base-url, --request-timeout, ...).
+    It converts to a plain dict (to_dict) to be passed to xdist workers.
+
+    Parameters:
+        env (str): Environment name (ENVIRONMENT, default: dev)
+        base_url (str): Base URL of the API under test
+        auth_token (str): Static Authorization header value of the environment
+        auth_username (str): Login username for the auth provider (AUTH_USERNAME)
+        auth_password (str): Login password for the auth provider (AUTH_PASSWORD)
+        documents_auth_token (str): Token accepted by get_documents_by_section (DOCUMENTS_AUTH_TOKEN)
+        test_timeout (float): Default request timeout in seconds (TEST_TIMEOUT)
+        pool_connections (int): Number of hosts to keep connection pools for (POOL_CONNECTIONS)
+        pool_maxsize (int): Keep-alive connections per host (POOL_MAXSIZE)
+        pool_block (bool): Wait for a free connection instead of opening extra ones (POOL_BLOCK)
+        valuation_delete_path (str): Route that deletes one valuation, containing {valuation_id} or
+            {valuation_id:int} (VALUATION_DELETE_PATH, default: none, created valuations are kept)
+    """
+
+    env: str = 'dev'
+    base_url: str = ENVIRONMENT_URLS['dev']
+    auth_token: str = ''
+    auth_username: str = ''
+    auth_password: str = ''
+    documents_auth_token: str = ''
+    test_timeout: float = 30
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    valuation_delete_path: str = ''
+
+    @classmethod
+    def from_environment(cls, env=None):
+        """Read the settings of `env` (default: ENVIRONMENT) from environment variables and .env"""
+        load_dotenv_once()
+        env = env or os.getenv('ENVIRONMENT', 'dev')
+        environments = get_environments()
+        # Unknown environments use the dev settings
+        current = environments.get(env, environments['dev'])
+        return cls(
+            env=env,
+            base_url=current['BASE_URL'],
+            auth_token=current['AUTH_TOKEN'],
+            # Login credentials for the auth provider (utils/auth.py).
+            # When they are not set, auth_token is used as a static token.
+            auth_username=os.getenv('AUTH_USERNAME', ''),
+            auth_password=os.getenv('AUTH_PASSWORD', ''),
+            documents_auth_token=os.getenv('DOCUMENTS_AUTH_TOKEN', ''),
+            test_timeout=_env_value('TEST_TIMEOUT', cls.test_timeout, float),
+            pool_connections=_env_value('POOL_CONNECTIONS', cls.pool_connections, int),
+            pool_maxsize=_env_value('POOL_MAXSIZE', cls.pool_maxsize, int),
+            pool_block=_env_value('POOL_BLOCK', cls.pool_block, _to_bool),
+            valuation_delete_path=os.getenv('VALUATION_DELETE_PATH', ''),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        names = {field.name for field in fields(cls)}
+        return cls(**{name: value for name, value in data.items() if name in names})
+
+
+def get_settings():
+    """Return the settings of this process, reading them on first use"""
+    global _settings
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = Settings.from_environment()
+    return _settings
+
+
+def configure(settings=None, env=None, **overrides):
+    """
+    Replace the settings of this process.
+
+    Parameters:
+        settings (Settings): Settings to use as they are (e.g. the ones sent to an xdist worker)
+        env (str): Read the settings of another environment first
+        **overrides: Settings fields to change; None values are ignored
+
+    Returns:
+        Settings: The new settings
+
+    Example:
+        configure(env="local", test_timeout=5)
+    """
+    global _settings
+    if settings is None:
+        settings = Settings.from_environment(env) if env else get_settings()
+    changes = {name: value for name, value in overrides.items() if value is not None}
+    with _lock:
+        _settings = replace(settings, **changes) if changes else settings
+    return _settings
+
+
+@contextmanager
+def override_settings(**overrides):
+    """
+    Change settings inside a block, e.g. in one test.
+
+    Example:
+        with override_settings(base_url=stub.url):
+            send_request("GET", valuation_list.url(), headers=headers)
+    """
+    global _settings
+    previous = get_settings()
+    configure(**overrides)
+    try:
+        yield get_settings()
+    finally:
+        with _lock:
+            _settings = previous
+
+
+# Module-level names used before the settings object existed; read from it on every access
+_SETTING_NAMES = {
+    'CURRENT_ENV': 'env',
+    'BASE_URL': 'base_url',
+    'AUTH_TOKEN': 'auth_token',
+    'AUTH_USERNAME': 'auth_username',
+    'AUTH_PASSWORD': 'auth_password',
+    'DOCUMENTS_AUTH_TOKEN': 'documents_auth_token',
 }
 
-# Get current environment settings
-CURRENT_SETTINGS = ENVIRONMENTS.get(CURRENT_ENV, ENVIRONMENTS['dev'])
 
-# Export environment-specific settings
-BASE_URL = CURRENT_SETTINGS['BASE_URL']
-AUTH_TOKEN = CURRENT_SETTINGS['AUTH_TOKEN'] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _SETTING_NAMES:
+        return getattr(get_settings(), _SETTING_NAMES[name])
+    if name == 'ENVIRONMENTS':
+        return get_environments()
+    if name == 'CURRENT_SETTINGS':
+        settings = get_settings()
+        return {'BASE_URL': settings.base_url, 'AUTH_TOKEN': settings.auth_token}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,50 @@
 import pytest
-from utils.logger import get_logger
+from utils.logger import get_logger, prune_logs
+from utils.request_handler import (
+    add_request_listener, capture_requests, close_session, enable_resource_tracking, enable_response_cache,
+    enable_single_flight, get_connection_stats, get_resource_tracker, get_response_cache, get_single_flight,
+    get_worker_id, set_current_test, set_response_hashing
+)
+from utils.latency import check_latency_budget
+from utils.auth import get_auth_provider
+from utils.cassette import TRANSPORT_MODES, use_transport, save_cassettes
+from utils.metrics import MetricsCollector
+from utils.event_log import EventLog, event_log_path
+from utils.response_cache import ResponseCache, format_cache_stats, merge_cache_stats
+from utils.single_flight import SingleFlight, format_single_flight_stats, new_run_directory
+from utils.duration_history import DurationHistory
+from utils.resource_tracker import ResourceTracker, TrackedEndpoint, format_cleanup_report, merge_cleanup_reports
+from utils.retry_policy import get_current_test_stats, get_session_budget
+from utils.soak import SoakMonitor, parse_duration
+from utils.snapshot import Snapshot, updated_snapshots
 import os
+from urllib.parse import urlsplit
+from config.config import REPORTS_DIR, CASSETTES_DIR, SNAPSHOTS_DIR, EVENTS_DIR, LOG_KEEP_RUNS, SOAK_WINDOW_SECONDS, TEST_DURATIONS_FILE
+from config.settings import ENVIRONMENT_URLS, Settings, configure, get_settings
+from endpoints.registry import valuation_create, valuation_delete_route
+from endpoints.valuation_endpoints import get_valuation_endpoint
 
 logger = get_logger()
 
+# Latency records of every request sent in this session
+metrics_collector = MetricsCollector()
+LATENCY_REPORT_PATH = os.path.join(REPORTS_DIR, "latency_report.json")
+
+# JSON-lines log of every request, written with --event-log
+event_log = None
+
+# Result of deleting this process's created resources, and the ones sent by xdist workers
+cleanup_report = None
+worker_cleanup_reports = []
+
+# Snapshot files written with --update-snapshots by the xdist workers
+worker_updated_snapshots = []
+
+# Resource and latency samples of a --soak run, and the cleanup after each of its passes
+soak_monitor = None
+SOAK_REPORT_PATH = os.path.join(REPORTS_DIR, "soak_report.json")
+soak_cleanup_reports = []
+
 @pytest.fixture(scope="session")
 def setup_logging():
     """Setup logging for test session"""
@@ -15,17 +56,483 @@ def setup_logging():
 def log_test_info(request):
     """Log test information before and after each test"""
     logger.info(f"Starting test: {request.node.name}")
+    set_current_test(request.node.nodeid)
+    cache = get_response_cache()
+    if cache is not None:
+        cache.bypass = request.node.get_closest_marker("no_response_cache") is not None
+    retry_stats = get_current_test_stats()
+    retry_stats.reset()
     yield
+    # Session fixtures the test used, so the scheduler can keep their tests together
+    request.node.user_properties.append(("session_fixtures", [
+        name for name, fixture_defs in request.node._fixtureinfo.name2fixturedefs.items()
+        if fixture_defs[-1].scope == "session"
+    ]))
+    # Report retries so flaky endpoints show up next to the test that hit them
+    request.node.user_properties.append(("retries", retry_stats.retries))
+    request.node.user_properties.append(("retry_backoff_seconds", round(retry_stats.backoff_seconds, 3)))
+    if retry_stats.retries:
+        logger.warning(f"Test {request.node.name} needed {retry_stats.retries} retries "
+                       f"({retry_stats.backoff_seconds:.2f} s backing off)")
+    set_current_test(None)
     logger.info(f"Completed test: {request.node.name}")
 
+@pytest.fixture(scope="session")
+def auth_provider():
+    """Auth provider that logs in once and shares the token across xdist workers"""
+    return get_auth_provider()
+
+@pytest.fixture(scope="session")
+def auth_token(auth_provider):
+    """Valid Authorization header value, for tests that build their headers by hand; prefer auth=auth_provider"""
+    return auth_provider.get_token()
+
+@pytest.fixture(scope="session", autouse=True)
+def created_resources(request):
+    """Record the valuations the tests create and delete them, in concurrent batches, at the end of the session"""
+    global cleanup_report
+    endpoints = cleanup_endpoints()
+    tracker = ResourceTracker(endpoints)
+    # Replayed responses did not create anything
+    if request.config.getoption("keep_created") or request.config.getoption("transport") == "replay":
+        yield tracker
+        return
+    if not endpoints:
+        logger.info("VALUATION_DELETE_PATH is not set; valuations created by the tests are kept")
+        yield tracker
+        return
+    enable_resource_tracking(tracker)
+    yield tracker
+    enable_resource_tracking(None)
+    cleanup_report = tracker.cleanup()
+
+@pytest.fixture(scope="session")
+def request_metrics():
+    """Latency records of every request sent in this session"""
+    return metrics_collector
+
+@pytest.fixture
+def batch_requests():
+    """Send many requests concurrently and get the responses back in order"""
+    # Imported here: asyncio is slow to import and most test modules do not need it
+    from utils.async_request_handler import send_many
+    return send_many
+
+@pytest.fixture
+def run_suite(tmp_path):
+    """Run pytest with this suite's conftest on a test file written to tmp_path and return the finished process"""
+    # Imported here: only the tests that start pytest in a subprocess need them
+    import subprocess
+    import sys
+    import textwrap
+
+    def run(source, *args):
+        (tmp_path / "test_generated.py").write_text(textwrap.dedent(source))
+        env = {name: value for name, value in os.environ.items() if not name.startswith("PYTEST_")}
+        env.update(ENVIRONMENT="local", PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run([sys.executable, "-m", "pytest", "-p", "conftest", "-p", "no:cacheprovider",
+                               "-q", *args, "test_generated.py"],
+                              cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    return run
+
+@pytest.fixture
+def snapshot(request):
+    """Compare responses with golden files in tests/snapshots/<env> (--update-snapshots writes them)"""
+    # Every environment has its own data (the local stub makes up most of it), so each has its own golden files
+    directory = os.path.join(SNAPSHOTS_DIR, get_settings().env)
+    return Snapshot(request.node.nodeid, update=request.config.getoption("update_snapshots"), directory=directory)
+
+@pytest.fixture(scope="session")
+def settings():
+    """Settings of this run (environment, base URL, timeouts, pool sizes)"""
+    return get_settings()
+
+def cleanup_endpoints():
+    """Endpoints whose created resources are deleted at the end of the session (none without VALUATION_DELETE_PATH)"""
+    if valuation_delete_route() is None:
+        return []
+    return [TrackedEndpoint(valuation_create.url(), "Valuation_id", get_valuation_endpoint)]
+
+def pytest_addoption(parser):
+    """Add command line options"""
+    parser.addoption(
+        "--env", choices=sorted(ENVIRONMENT_URLS),
+        help="Environment to test (default: ENVIRONMENT from the environment or .env, else dev)"
+    )
+    parser.addoption(
+        "--base-url",
+        help="Send requests to this base URL instead of the environment's (e.g. http://127.0.0.1:8765)"
+    )
+    parser.addoption(
+        "--request-timeout", type=float,
+        help="Default timeout of every request in seconds (default: TEST_TIMEOUT, else 30)"
+    )
+    parser.addoption(
+        "--pool-connections", type=int,
+        help="Number of hosts to keep connection pools for (default: POOL_CONNECTIONS, else 10)"
+    )
+    parser.addoption(
+        "--pool-maxsize", type=int,
+        help="Keep-alive connections per host and worker (default: POOL_MAXSIZE, else 10)"
+    )
+    parser.addoption(
+        "--transport", choices=TRANSPORT_MODES, default="live",
+        help="live: send requests to the API; record: send them and save the responses to cassettes; "
+             "replay: answer requests from the cassettes without network"
+    )
+    parser.addoption(
+        "--cassette-dir", default=CASSETTES_DIR,
+        help=f"Folder for recorded cassettes (default: {CASSETTES_DIR})"
+    )
+    parser.addoption(
+        "--event-log", action="store_true",
+        help="Write one JSON line per request (endpoint, status, timings, sizes, retries) to --event-log-dir; "
+             "summarise the files with python -m utils.event_log"
+    )
+    parser.addoption(
+        "--event-log-dir", default=EVENTS_DIR,
+        help=f"Folder for event logs, one file per xdist worker (default: {EVENTS_DIR})"
+    )
+    parser.addoption(
+        "--event-log-hash-bodies", action="store_true",
+        help="Add a truncated SHA-256 of each response body to the event log"
+    )
+    parser.addoption(
+        "--response-cache", action="store_true",
+        help="Answer repeated GETs of static reference data (documents, factors, dealer radius steps) "
+             "from an in-memory cache; tests marked no_response_cache always send their requests"
+    )
+    parser.addoption(
+        "--single-flight", action="store_true",
+        help="Let identical reads (GET, HEAD, OPTIONS) sent at the same time by threads of a worker share one request"
+    )
+    parser.addoption(
+        "--single-flight-workers", action="store_true",
+        help="Like --single-flight, and also share responses between xdist workers through SINGLE_FLIGHT_DIR"
+    )
+    parser.addoption(
+        "--keep-created", action="store_true",
+        help="Do not delete the valuations the tests created at the end of the session"
+    )
+    parser.addoption(
+        "--update-snapshots", action="store_true",
+        help="Write the snapshots of tests using the snapshot fixture that are missing or differ, instead of failing"
+    )
+    parser.addoption(
+        "--soak", metavar="DURATION",
+        help="Run the selected tests over and over for DURATION (e.g. 30m, 8h, 1h30m), sampling memory, "
+             "open files, connection pools and latency per window, and report leaks and latency drift"
+    )
+    parser.addoption(
+        "--soak-window", type=float, default=SOAK_WINDOW_SECONDS,
+        help=f"Seconds per sampling window of --soak (default: {SOAK_WINDOW_SECONDS:.0f})"
+    )
+    parser.addoption(
+        "--schedule", choices=["lpt", "xdist"], default="lpt",
+        help="With -n: lpt hands out the longest tests first, using the durations recorded in "
+             "--durations-file (default); xdist uses the plain xdist scheduler"
+    )
+    parser.addoption(
+        "--durations-file", default=TEST_DURATIONS_FILE,
+        help=f"History of test durations, updated after every run (default: {TEST_DURATIONS_FILE})"
+    )
+
 def pytest_configure(config):
     """Configure pytest"""
+    configure_settings(config)
     config.addinivalue_line(
         "markers", "smoke: mark test as smoke test"
     )
     config.addinivalue_line(
         "markers", "api: mark test as API test"
     )
+    config.addinivalue_line(
+        "markers",
+        "latency(p95_ms=None, samples=20, warmup=2): re-send the test's GET requests and fail "
+        "when a latency percentile (p50_ms, p90_ms, p95_ms, p99_ms, max_ms) is over budget"
+    )
+    config.addinivalue_line(
+        "markers", "no_response_cache: send every request of the test, even with --response-cache"
+    )
+    configure_soak(config)
+    # A soak run would keep every request record for hours; its windows summarise latency instead
+    if soak_monitor is None:
+        add_request_listener(metrics_collector.record)
+    if not is_xdist_worker(config):
+        prune_logs(LOG_KEEP_RUNS)
+    if config.getoption("event_log"):
+        global event_log
+        event_log = EventLog(event_log_path(config.getoption("event_log_dir")))
+        add_request_listener(event_log.record)
+        set_response_hashing(config.getoption("event_log_hash_bodies"))
+    if config.getoption("response_cache"):
+        enable_response_cache(ResponseCache())
+    configure_single_flight(config)
+    use_transport(config.getoption("transport"), config.getoption("cassette_dir"))
+    start_stub_server(config)
+
+def configure_settings(config):
+    """Apply the command line settings; xdist workers use the settings sent by the controller"""
+    if is_xdist_worker(config) and "settings" in config.workerinput:
+        configure(Settings.from_dict(config.workerinput["settings"]))
+        return
+    configure(
+        env=config.getoption("env"),
+        base_url=config.getoption("base_url"),
+        test_timeout=config.getoption("request_timeout"),
+        pool_connections=config.getoption("pool_connections"),
+        pool_maxsize=config.getoption("pool_maxsize"),
+    )
+
+def configure_soak(config):
+    """Set up the soak monitor for --soak"""
+    global soak_monitor
+    if not config.getoption("soak"):
+        return
+    if getattr(config.option, "dist", "no") != "no":
+        raise pytest.UsageError("--soak runs the tests in one process; leave out -n/--dist")
+    try:
+        duration = parse_duration(config.getoption("soak"))
+    except ValueError as e:
+        raise pytest.UsageError(f"--soak: {e}") from None
+    soak_monitor = SoakMonitor(duration, window_seconds=config.getoption("soak_window"))
+    add_request_listener(soak_monitor.record)
+
+def configure_single_flight(config):
+    """Share identical concurrent reads for --single-flight; xdist workers use the controller's folder"""
+    across_workers = config.getoption("single_flight_workers")
+    if not (config.getoption("single_flight") or across_workers):
+        return
+    directory = None
+    if across_workers:
+        directory = config.workerinput["single_flight_dir"] if is_xdist_worker(config) else new_run_directory()
+    enable_single_flight(SingleFlight(directory))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Send the settings of this run to an xdist worker, so it does not read them again"""
+    node.workerinput["settings"] = get_settings().to_dict()
+    flight = get_single_flight()
+    if flight is not None and flight.directory:
+        node.workerinput["single_flight_dir"] = flight.directory
+
+# Stub server started for ENVIRONMENT=local
+local_stub = None
+
+def start_stub_server(config):
+    """Serve the stub API at the base URL for ENVIRONMENT=local (xdist workers use the controller's server)"""
+    global local_stub
+    settings = get_settings()
+    if settings.env != "local" or is_xdist_worker(config) or config.getoption("transport") == "replay":
+        return
+    # Imported here: the stub server pulls in asyncio, which only ENVIRONMENT=local runs need
+    from stub_server.server import StubServer
+    server = StubServer.for_url(settings.base_url)
+    try:
+        local_stub = server.start()
+    except OSError as e:
+        logger.info(f"Not starting the stub server ({e}); using the server already at {settings.base_url}")
+
+def pytest_unconfigure(config):
+    """Stop the stub server and remove the responses the workers shared"""
+    if local_stub is not None:
+        local_stub.stop()
+    flight = get_single_flight()
+    if flight is not None and not is_xdist_worker(config):
+        flight.clear()
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Check latency budgets of tests marked with @pytest.mark.latency"""
+    marker = item.get_closest_marker("latency")
+    if marker is None:
+        return (yield)
+
+    # Run the test as usual while remembering which requests it sent
+    with capture_requests() as captured:
+        result = yield
+
+    failures = check_latency_budget(captured, **marker.kwargs)
+    if failures:
+        pytest.fail("\n\n".join(failures), pytrace=False)
+    return result
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """With --soak, run the selected tests over and over until the soak duration is up"""
+    # Collection errors and --collect-only are left to the default loop
+    if soak_monitor is None or session.testsfailed or session.config.option.collectonly or not session.items:
+        return None
+    items = session.items
+    soak_monitor.start()
+    index, nextitem = 0, items[0]
+    while nextitem is not None:
+        item = nextitem
+        index = (index + 1) % len(items)
+        # Session fixtures stay set up from one pass to the next, until the time is up
+        nextitem = None if soak_monitor.expired() else items[index]
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+        if index == 0:
+            soak_monitor.passes += 1
+            # Delete what each pass created, instead of hours of valuations at the end
+            tracker = get_resource_tracker()
+            if tracker is not None and len(tracker):
+                soak_cleanup_reports.append(tracker.cleanup())
+        soak_monitor.tick()
+    soak_monitor.stop()
+    return True
+
+def is_xdist_worker(config):
+    return hasattr(config, "workerinput")
+
+# Tests that needed retries, as (nodeid, retries, backoff seconds)
+retried_tests = []
+
+# Response cache and single-flight stats of the xdist workers
+worker_cache_stats = []
+worker_single_flight_stats = []
+
+# Wall time of each test in this run (setup, call and teardown) and the session fixtures it used
+test_durations = {}
+test_fixtures = {}
+
+def pytest_runtest_logreport(report):
+    """Collect test durations and retry counts (also receives reports from xdist workers)"""
+    test_durations[report.nodeid] = test_durations.get(report.nodeid, 0.0) + report.duration
+    if soak_monitor is not None:
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            soak_monitor.test_finished(not report.failed)
+        # pytest keeps every report; captured output of passed tests would pile up over hours
+        if report.passed:
+            report.sections = []
+    if report.when != "teardown":
+        return
+    properties = dict(report.user_properties)
+    test_fixtures[report.nodeid] = properties.get("session_fixtures", [])
+    if properties.get("retries"):
+        retried_tests.append((report.nodeid, properties["retries"], properties["retry_backoff_seconds"]))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Schedule the longest tests first when durations of earlier runs are known"""
+    if config.getoption("schedule") != "lpt" or config.getoption("dist") != "load":
+        return None
+    history = DurationHistory(config.getoption("durations_file")).load()
+    if not history.tests:
+        return None
+    from utils.lpt_scheduling import LPTScheduling
+    return LPTScheduling(config, log, history)
+
+def save_test_durations(config):
+    """Add this run's test durations and request time to the history file"""
+    network = {}
+    endpoints = {}
+    for record in metrics_collector.records:
+        network[record.test_id] = network.get(record.test_id, 0.0) + record.total_ms / 1000
+        endpoints.setdefault(record.test_id, set()).add(urlsplit(record.url).path.rstrip("/"))
+    history = DurationHistory(config.getoption("durations_file")).load()
+    for nodeid, duration in test_durations.items():
+        history.update(nodeid, duration, network.get(nodeid, 0.0), test_fixtures.get(nodeid, ()),
+                       endpoints.get(nodeid, ()))
+    history.save()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge request metrics sent back by an xdist worker"""
+    metrics_collector.merge(node.workeroutput.get("request_metrics", []))
+    if "response_cache" in node.workeroutput:
+        worker_cache_stats.append(node.workeroutput["response_cache"])
+    if "single_flight" in node.workeroutput:
+        worker_single_flight_stats.append(node.workeroutput["single_flight"])
+    if "cleanup" in node.workeroutput:
+        worker_cleanup_reports.append(node.workeroutput["cleanup"])
+    worker_updated_snapshots.extend(node.workeroutput.get("updated_snapshots", []))
+
+def pytest_terminal_summary(terminalreporter):
+    """Show per-endpoint latency, soak samples, cache and single-flight stats, cleanup, snapshots and retries"""
+    lines = metrics_collector.format_summary()
+    if lines:
+        terminalreporter.section("request latency")
+        for line in lines:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Latency report written to {LATENCY_REPORT_PATH}")
+    cache = get_response_cache()
+    if cache is not None:
+        terminalreporter.section("response cache")
+        terminalreporter.write_line(format_cache_stats(merge_cache_stats([cache.stats] + worker_cache_stats)))
+    flight = get_single_flight()
+    if flight is not None:
+        terminalreporter.section("single flight")
+        terminalreporter.write_line(format_single_flight_stats(
+            merge_cache_stats([flight.stats] + worker_single_flight_stats)))
+    if soak_monitor is not None and soak_monitor.windows:
+        terminalreporter.section("soak")
+        for line in soak_monitor.format_summary():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Soak report written to {SOAK_REPORT_PATH}")
+    reports = worker_cleanup_reports + soak_cleanup_reports + ([cleanup_report] if cleanup_report else [])
+    if any(report["tracked"] for report in reports):
+        terminalreporter.section("cleanup")
+        for line in format_cleanup_report(merge_cleanup_reports(reports)):
+            terminalreporter.write_line(line)
+    snapshots = sorted(updated_snapshots + worker_updated_snapshots)
+    if snapshots:
+        terminalreporter.section("snapshots")
+        terminalreporter.write_line(f"Wrote {len(snapshots)} snapshot(s); review them before committing:")
+        for path in snapshots:
+            terminalreporter.write_line(f"  {path}")
+    if retried_tests:
+        terminalreporter.section("retries")
+        for nodeid, retries, backoff_seconds in retried_tests:
+            terminalreporter.write_line(f"{nodeid}: {retries} retries, {backoff_seconds:.2f} s backing off")
+
+def pytest_sessionfinish(session, exitstatus):
+    """Log connection reuse timings and close the pooled session"""
+    budget = get_session_budget()
+    logger.info(f"Retry budget for worker {get_worker_id()}: {budget.stats.retries} retries, "
+                f"{budget.stats.backoff_seconds:.2f} s backing off over {budget.requests} requests")
+    stats = get_connection_stats()
+    logger.info(
+        f"Connection pool summary for worker {get_worker_id()}: "
+        f"{stats['new']['count']} new connections (avg {stats['new']['avg_ms']:.0f} ms), "
+        f"{stats['reused']['count']} reused connections (avg {stats['reused']['avg_ms']:.0f} ms), "
+        f"about {stats['saved_ms']:.0f} ms saved by connection reuse"
+    )
+    provider = get_auth_provider()
+    if provider.uses_login:
+        logger.info(f"Auth provider for worker {get_worker_id()} logged in {provider.logins} times")
+    save_cassettes()
+    close_session()
+    if event_log is not None:
+        event_log.close()
+        logger.info(f"Wrote {event_log.events} request events to {event_log.path}")
 
-# Set environment variables directly
-os.environ["BASE_URL"] = "https://d3g8su2w1x0h24.cloudfront.net"
+    # Workers hand their metrics to the controller, which writes the report
+    cache = get_response_cache()
+    if cache is not None:
+        logger.info(f"Response cache for worker {get_worker_id()}: {format_cache_stats(cache.stats)}")
+    flight = get_single_flight()
+    if flight is not None:
+        logger.info(f"Single flight for worker {get_worker_id()}: {format_single_flight_stats(flight.stats)}")
+    if is_xdist_worker(session.config):
+        session.config.workeroutput["request_metrics"] = metrics_collector.to_list()
+        if cache is not None:
+            session.config.workeroutput["response_cache"] = dict(cache.stats)
+        if flight is not None:
+            session.config.workeroutput["single_flight"] = dict(flight.stats)
+        if cleanup_report is not None:
+            session.config.workeroutput["cleanup"] = cleanup_report
+        if updated_snapshots:
+            session.config.workeroutput["updated_snapshots"] = list(updated_snapshots)
+    else:
+        if metrics_collector.records:
+            metrics_collector.write_json(LATENCY_REPORT_PATH)
+        if soak_monitor is not None and soak_monitor.windows:
+            soak_monitor.write_json(SOAK_REPORT_PATH)
+        # Durations summed over soak passes would throw off the scheduler
+        if test_durations and soak_monitor is None:
+            save_test_durations(session.config)
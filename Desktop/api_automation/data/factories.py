@@ -0,0 +1,222 @@
+# Generated valuation and login payloads, for load runs and tests that need many unique bodies.
+#
+# Payloads come out as (kind, body) tuples with the body already serialized to JSON bytes,
+# built from a template instead of a dict and json.dumps per payload. Streams are lazy, so
+# a million payloads cost no memory until they are used, and repeatable for the same seed.
+import json
+import random
+from collections import namedtuple
+from datetime import datetime, timedelta
+from itertools import count as count_from
+from json.encoder import encode_basestring_ascii
+
+from config.config import FACTORY_SEED
+from data.auth_data import valid_login_payload
+from data.valuation_data import valid_valuation_payload, INVALID_DEALER_ID, INVALID_CONFIG_ID
+
+# One generated payload: kind is None for a valid payload, or names what is wrong with it
+Payload = namedtuple("Payload", ["kind", "body"])
+
+# Required valuation fields; each one can be left out to make an invalid payload
+VALUATION_REQUIRED_FIELDS = ("dealer_info_id", "name", "config_id", "dealer_id")
+
+VALUATION_INVALID_KINDS = (
+    "empty",
+    *(f"missing_{field}" for field in VALUATION_REQUIRED_FIELDS),
+    "invalid_dealer_id",
+    "invalid_config_id",
+    "wrong_type_config_id",
+)
+
+LOGIN_INVALID_KINDS = ("empty", "missing_username", "missing_password", "empty_password", "wrong_type_username")
+
+# Valuation names look like the ones the web app creates ("Estimate_22 Apr 2025 12:15:17"),
+# one second apart from a start time picked by the seed
+NAME_DATE_FORMAT = "Estimate_%d %b %Y"
+NAME_FORMAT = NAME_DATE_FORMAT + " %H:%M:%S"
+NAME_EPOCH = datetime(2025, 1, 1)
+
+# Sizes of the Faker-made word lists login payloads are combined from
+USERNAME_POOL_SIZE = 256
+PASSWORD_POOL_SIZE = 64
+
+
+def _resolve_seed(seed):
+    """Return the seed to use: the given one, FACTORY_SEED, or a random one (kept so a run can be repeated)"""
+    if seed is not None:
+        return seed
+    if FACTORY_SEED:
+        return int(FACTORY_SEED)
+    return random.randrange(2 ** 32)
+
+
+def _template(payload, field):
+    """Split the JSON of `payload` around the value of `field`, as (before, after) bytes"""
+    marker = "\x00value\x00"
+    text = json.dumps({**payload, field: marker}, separators=(",", ":"))
+    before, after = text.split(json.dumps(marker))
+    return before.encode(), after.encode()
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class ValuationFactory:
+    """
+    Generates valuation payloads for POST /api/valuation.
+
+    Valid payloads are `base` with a unique name per index, so every payload creates a
+    new valuation. Invalid payloads break one rule each (see VALUATION_INVALID_KINDS).
+
+    Parameters:
+        seed (int): Seed for names and invalid kinds (default: FACTORY_SEED, else random; see `seed`)
+        base (dict): Valid payload the generated ones are based on
+
+    Example:
+        factory = ValuationFactory(seed=7)
+        for kind, body in factory.stream(count=1_000_000, invalid_rate=0.1):
+            response = send_request("POST", endpoint, data=body, headers=headers)
+            assert (response.status_code == 200) == (kind is None)
+    """
+
+    def __init__(self, seed=None, base=valid_valuation_payload):
+        self.seed = _resolve_seed(seed)
+        self.base = dict(base)
+        rng = random.Random(self.seed)
+        self.start = NAME_EPOCH + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        self._before_name, self._after_name = _template(self.base, "name")
+
+    def name(self, index):
+        """Return the unique valuation name of payload `index`"""
+        return (self.start + timedelta(seconds=index)).strftime(NAME_FORMAT)
+
+    def body(self, index):
+        """Return the JSON bytes of valid payload `index`"""
+        return self._before_name + encode_basestring_ascii(self.name(index)).encode() + self._after_name
+
+    def payload(self, index, kind=None):
+        """Return payload `index` as a dict (valid, or broken as `kind` says)"""
+        payload = {**self.base, "name": self.name(index)}
+        if kind is None:
+            return payload
+        if kind == "empty":
+            return {}
+        if kind.startswith("missing_"):
+            del payload[kind[len("missing_"):]]
+        elif kind == "invalid_dealer_id":
+            payload["dealer_id"] = INVALID_DEALER_ID
+        elif kind == "invalid_config_id":
+            payload["config_id"] = INVALID_CONFIG_ID
+        elif kind == "wrong_type_config_id":
+            payload["config_id"] = str(payload["config_id"]) + "x"
+        else:
+            raise ValueError(f"Unknown invalid valuation kind {kind!r}; use one of {VALUATION_INVALID_KINDS}")
+        return payload
+
+    def bodies(self, count=None, start=0):
+        """Yield the JSON bytes of valid payloads `start`, `start + 1`, ... (endless without `count`)"""
+        indexes = count_from(start) if count is None else range(start, start + count)
+        midnight = self.start.replace(hour=0, minute=0, second=0)
+        first_second = int((self.start - midnight).total_seconds())
+        after = b'"' + self._after_name
+        current_day, prefix = None, None
+        for index in indexes:
+            # strftime per payload is slow: only the date part is formatted, once per day
+            day, second = divmod(first_second + index, 86400)
+            if day != current_day:
+                date = (midnight + timedelta(days=day)).strftime(NAME_DATE_FORMAT)
+                current_day, prefix = day, self._before_name + f'"{date} '.encode()
+            hours, second = divmod(second, 3600)
+            yield prefix + b"%02d:%02d:%02d" % (hours, *divmod(second, 60)) + after
+
+    def stream(self, count=None, invalid_rate=0.0, kinds=VALUATION_INVALID_KINDS):
+        """
+        Yield Payload(kind, body) tuples, valid ones with kind None.
+
+        Parameters:
+            count (int): Number of payloads (endless if None)
+            invalid_rate (float): Share of payloads that are invalid (1.0: only invalid ones)
+            kinds (tuple): Invalid kinds to pick from, in turn chosen by the seed
+        """
+        rng = random.Random(self.seed + 1)
+        for index, body in enumerate(self.bodies(count)):
+            if invalid_rate and rng.random() < invalid_rate:
+                kind = kinds[rng.randrange(len(kinds))]
+                yield Payload(kind, _json_bytes(self.payload(index, kind)))
+            else:
+                yield Payload(None, body)
+
+
+class LoginFactory:
+    """
+    Generates login payloads for POST /api/auth/user/login.
+
+    Well-formed payloads have a unique username per index (a Faker user name with the
+    index added) and a Faker password, so they are valid requests for users that do not
+    exist. Invalid payloads break one rule each (see LOGIN_INVALID_KINDS).
+    `credentials` are sent as they are, e.g. to mix real logins into a load run.
+
+    Parameters:
+        seed (int): Seed for Faker and invalid kinds (default: FACTORY_SEED, else random)
+        credentials (dict): Known-good login payload, returned by valid()
+
+    Example:
+        for kind, body in LoginFactory(seed=7).stream(count=10_000, invalid_rate=0.5):
+            response = send_request("POST", login_endpoint, data=body, headers=default_headers)
+    """
+
+    def __init__(self, seed=None, credentials=valid_login_payload):
+        # Imported here: Faker takes a while to import and only login payloads need it
+        from faker import Faker
+
+        self.seed = _resolve_seed(seed)
+        self.credentials = dict(credentials)
+        faker = Faker()
+        faker.seed_instance(self.seed)
+        # Faker is slow per call, so usernames and passwords are combined from small lists
+        self.usernames = [faker.user_name() for _ in range(USERNAME_POOL_SIZE)]
+        self.passwords = [faker.password(length=12) for _ in range(PASSWORD_POOL_SIZE)]
+
+    def valid(self):
+        """Return the JSON bytes of the known-good credentials"""
+        return _json_bytes(self.credentials)
+
+    def payload(self, index, kind=None):
+        """Return payload `index` as a dict (well-formed, or broken as `kind` says)"""
+        payload = {
+            "username": f"{self.usernames[index % USERNAME_POOL_SIZE]}{index}",
+            "password": self.passwords[index % PASSWORD_POOL_SIZE],
+        }
+        if kind is None:
+            return payload
+        if kind == "empty":
+            return {}
+        if kind.startswith("missing_"):
+            del payload[kind[len("missing_"):]]
+        elif kind == "empty_password":
+            payload["password"] = ""
+        elif kind == "wrong_type_username":
+            payload["username"] = index
+        else:
+            raise ValueError(f"Unknown invalid login kind {kind!r}; use one of {LOGIN_INVALID_KINDS}")
+        return payload
+
+    def bodies(self, count=None, start=0):
+        """Yield the JSON bytes of well-formed payloads `start`, `start + 1`, ... (endless without `count`)"""
+        indexes = count_from(start) if count is None else range(start, start + count)
+        usernames = [encode_basestring_ascii(name)[:-1].encode() for name in self.usernames]
+        passwords = [b',"password":' + encode_basestring_ascii(password).encode() + b"}" for password in self.passwords]
+        for index in indexes:
+            yield (b'{"username":' + usernames[index % USERNAME_POOL_SIZE] + str(index).encode() + b'"'
+                   + passwords[index % PASSWORD_POOL_SIZE])
+
+    def stream(self, count=None, invalid_rate=0.0, kinds=LOGIN_INVALID_KINDS):
+        """Yield Payload(kind, body) tuples, well-formed ones with kind None (see ValuationFactory.stream)"""
+        rng = random.Random(self.seed + 1)
+        for index, body in enumerate(self.bodies(count)):
+            if invalid_rate and rng.random() < invalid_rate:
+                kind = kinds[rng.randrange(len(kinds))]
+                yield Payload(kind, _json_bytes(self.payload(index, kind)))
+            else:
+                yield Payload(None, body)
@@ -0,0 +1,69 @@
+# JSON schemas of API responses, by name (see utils/schema_validator.py)
+
+
+def paginated(item_schema):
+    """Schema of the {"total", "pageNo", "perPage", "pages", "results"} envelope with the given result items"""
+    return {
+        "type": "object",
+        "required": ["total", "pageNo", "perPage", "pages", "results"],
+        "properties": {
+            "total": {"type": "integer"},
+            "pageNo": {"type": "integer"},
+            "perPage": {"type": "integer"},
+            "pages": {"type": "integer"},
+            "results": {"type": "array", "items": item_schema},
+        },
+    }
+
+
+factor_schema = {
+    "type": "object",
+    "required": ["id", "name", "kpi__name", "factortype__name", "active", "createdOn", "weight"],
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": "string"},
+        "active": {"type": "boolean"},
+        "weight": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["weight_name", "weight_value", "metric_id"],
+            },
+        },
+    },
+}
+
+# Valuation list items are not checked field by field yet
+valuation_schema = {"type": "object"}
+
+valuation_created_schema = {
+    "type": "object",
+    "required": ["Message", "Valuation_id", "Status"],
+    "properties": {
+        "Message": {"type": "string"},
+        "Valuation_id": {"type": "integer"},
+        "Status": {"type": "boolean"},
+    },
+}
+
+document_schema = {
+    "type": "object",
+    "required": ["Title", "Sections"],
+    "properties": {
+        "Title": {"type": "string"},
+        "Sections": {
+            "type": "object",
+            "additionalProperties": {"type": "array", "items": {"type": "string"}},
+        },
+    },
+}
+
+dealer_radius_factor_schema = {"type": "array", "items": {"type": "integer"}}
+
+RESPONSE_SCHEMAS = {
+    "valuation_list": paginated(valuation_schema),
+    "valuation_create": valuation_created_schema,
+    "factor_list": paginated(factor_schema),
+    "documents_by_section": document_schema,
+    "dealer_radius_factor": dealer_radius_factor_schema,
+}
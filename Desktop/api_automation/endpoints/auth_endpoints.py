@@ -1,4 +1,9 @@
-from config.config import BASE_URL
+from endpoints.registry import login
 
-# Remove trailing slash from BASE_URL if present and add path
-login_endpoint = f"{BASE_URL.rstrip('/')}/api/auth/user/login"
+
+def __getattr__(name):
+    # POST endpoint for logging in, built when it is used so the base URL
+    # from the settings (--env, --base-url) is the one of the current run
+    if name == "login_endpoint":
+        return login.url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
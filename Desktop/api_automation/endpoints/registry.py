@@ -0,0 +1,205 @@
+import re
+from functools import lru_cache
+from urllib.parse import quote
+
+from config.settings import get_settings
+
+# Path parameters in route templates: "{name}" or "{name:int}"
+PATH_PARAMETER = re.compile(r"{(\w+)(?::(int|str))?}")
+
+# Routes by name (see get_route)
+ROUTES = {}
+
+# Built URLs kept per route, so building the same URL again is a dict lookup
+URL_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=4096)
+def _encode_text(value):
+    return quote(value, safe="")
+
+
+def _encode(route, name, kind, value):
+    """Return `value` percent-encoded as a URL parameter of type `kind` (int or str)"""
+    if value.__class__ is kind:
+        return str(value) if kind is int else _encode_text(value)
+    if kind is str:
+        if not isinstance(value, (str, int, float)):
+            raise ValueError(f"{route}: {name} must be a str, got {value!r}")
+        return _encode_text(str(value))
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{route}: {name} must be an int, got {value!r}")
+    try:
+        return str(int(value))
+    except ValueError:
+        raise ValueError(f"{route}: {name} must be an int, got {value!r}") from None
+
+
+class Route:
+    """
+    A named API endpoint with a precompiled URL template.
+
+    The path can have typed parameters ("/api/valuation/{valuation_id:int}"). Query
+    parameters map Python names to the names the API uses, with a type each; they are
+    added in the order they are declared and percent-encoded, so values with spaces,
+    "&" or "#" stay one parameter. Parameters set to None are left out. The last
+    URL_CACHE_SIZE URLs built are kept, so load loops building the same URLs over and
+    over only pay for a lookup.
+
+    `key` is the same template the request metrics group this route's requests under
+    (see utils.metrics.endpoint_template), e.g. "/api/valuation?perPage&pageNo&q&username".
+
+    Parameters:
+        name (str): Route name, unique in ROUTES
+        path (str): Path template, starting with "/"
+        query (dict): {python name: (API name, int or str)} of the query parameters
+        defaults (dict): Values used for parameters that are not passed to url()
+
+    Example:
+        valuation_list = Route("valuation_list", "/api/valuation",
+                               query={"per_page": ("perPage", int), "query": ("q", str)})
+        valuation_list.url(per_page=5, query="Estimate & Co")
+        # 'https://.../api/valuation?perPage=5&q=Estimate%20%26%20Co'
+    """
+
+    def __init__(self, name, path, query=None, defaults=None):
+        self.name = name
+        self.path = path
+        self.defaults = dict(defaults or {})
+
+        # Literal text and (name, type) parameters of the path, in order
+        self._path_parts = []
+        position = 0
+        for match in PATH_PARAMETER.finditer(path):
+            self._path_parts.append(path[position:match.start()])
+            self._path_parts.append((match.group(1), int if match.group(2) == "int" else str))
+            position = match.end()
+        self._path_parts.append(path[position:])
+        self._path_parameters = {part[0] for part in self._path_parts if isinstance(part, tuple)}
+
+        # (python name, "apiName=", type) of every query parameter
+        self._query = [(name, f"{_encode_text(api_name)}=", kind) for name, (api_name, kind) in (query or {}).items()]
+        self._parameters = self._path_parameters | {name for name, _, _ in self._query}
+        unknown = set(self.defaults) - self._parameters
+        if unknown:
+            raise ValueError(f"{name}: defaults for unknown parameters {sorted(unknown)}")
+
+        # Metrics show int path parameters as {id}, like the numeric path segments they become
+        template = "".join(part if isinstance(part, str) else "{id}" if part[1] is int else f"{{{part[0]}}}"
+                           for part in self._path_parts)
+        names = [api_name for _, (api_name, _) in (query or {}).items()]
+        self.key = f"{template}?{'&'.join(names)}" if names else template
+        self._urls = {}
+
+    def __repr__(self):
+        return f"Route({self.name!r}, {self.path!r})"
+
+    def __str__(self):
+        return self.name
+
+    def url(self, base_url=None, **params):
+        """
+        Build the URL of this route.
+
+        Parameters:
+            base_url (str): Scheme and host to prefix the path with (default: the base URL in the settings)
+            **params: Path and query parameters by their Python names
+
+        Returns:
+            str: Complete URL with encoded path and query parameters
+
+        Raises:
+            TypeError: If a parameter is unknown or a path parameter is missing
+            ValueError: If a parameter has the wrong type
+        """
+        if base_url is None:
+            base_url = get_settings().base_url
+        # True, 1 and 1.0 are equal keys, so the type is part of the key for each value to be checked
+        cache_key = (base_url, *((name, value.__class__, value) for name, value in params.items()))
+        try:
+            return self._urls[cache_key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable values (e.g. a list) are rejected by _build
+            cache_key = None
+
+        url = self._build(base_url, params)
+        if cache_key is not None:
+            if len(self._urls) >= URL_CACHE_SIZE:
+                self._urls.clear()
+            self._urls[cache_key] = url
+        return url
+
+    def _build(self, base_url, params):
+        if self.defaults:
+            params = {**self.defaults, **params}
+        if not self._parameters.issuperset(params):
+            unknown = sorted(set(params) - self._parameters)
+            raise TypeError(f"{self.name}: unknown parameters {unknown}")
+
+        if len(self._path_parts) == 1:
+            path = self.path
+        else:
+            pieces = []
+            for part in self._path_parts:
+                if isinstance(part, str):
+                    pieces.append(part)
+                elif params.get(part[0]) is None:
+                    raise TypeError(f"{self.name}: missing path parameter {part[0]!r}")
+                else:
+                    pieces.append(_encode(self.name, part[0], part[1], params[part[0]]))
+            path = "".join(pieces)
+
+        query = [prefix + _encode(self.name, name, kind, value)
+                 for name, prefix, kind in self._query if (value := params.get(name)) is not None]
+        if base_url[-1:] == "/":
+            base_url = base_url.rstrip("/")
+        return f"{base_url}{path}?{'&'.join(query)}" if query else base_url + path
+
+
+def register(name, path, query=None, defaults=None):
+    """Create a Route and add it to ROUTES"""
+    if name in ROUTES:
+        raise ValueError(f"Route {name!r} is already registered")
+    route = ROUTES[name] = Route(name, path, query, defaults)
+    return route
+
+
+def get_route(name):
+    """Return the registered Route called `name`"""
+    try:
+        return ROUTES[name]
+    except KeyError:
+        raise KeyError(f"Unknown route {name!r}; known routes: {', '.join(sorted(ROUTES))}") from None
+
+
+# Paging parameters shared by the list endpoints
+PAGING = {"per_page": ("perPage", int), "page_no": ("pageNo", int)}
+
+login = register("login", "/api/auth/user/login")
+valuation_list = register(
+    "valuation_list", "/api/valuation",
+    query={**PAGING, "query": ("q", str), "username": ("username", str)},
+)
+valuation_create = register("valuation_create", "/api/valuation", query={"username": ("username", str)})
+factor_list = register("factor_list", "/api/factor", query=PAGING)
+dealer_radius_factor = register("dealer_radius_factor", "/api/dealer_radius_factor", query={"type": ("type", str)})
+documents_by_section = register("documents_by_section", "/api/get_documents_by_section",
+                                query={"section": ("section", str)})
+
+
+@lru_cache(maxsize=8)
+def _valuation_delete_route(path):
+    return Route("valuation", path)
+
+
+def valuation_delete_route():
+    """
+    Return the route that deletes one valuation, or None when VALUATION_DELETE_PATH is not set.
+
+    The API does not document such a route (only the stub server has one, at
+    "/api/valuation/{valuation_id:int}"), so it comes from the settings and is not in ROUTES.
+    """
+    path = get_settings().valuation_delete_path
+    return _valuation_delete_route(path) if path else None
@@ -1,7 +1,20 @@
-from config.config import BASE_URL
+from endpoints.registry import valuation_create, valuation_delete_route, valuation_list
 
-# POST endpoint for creating valuation
-valuation_endpoint = f"{BASE_URL}/api/valuation"
+# DELETE endpoint for one valuation
+def get_valuation_endpoint(valuation_id):
+    """
+    Constructs the endpoint URL of a single valuation
+    Args:
+        valuation_id (int): Valuation_id returned when the valuation was created
+    Returns:
+        str: Complete endpoint URL
+    Raises:
+        KeyError: If VALUATION_DELETE_PATH is not set
+    """
+    route = valuation_delete_route()
+    if route is None:
+        raise KeyError("No valuation delete route; set VALUATION_DELETE_PATH to the API's route")
+    return route.url(valuation_id=valuation_id)
 
 # GET endpoint for valuation list
 def get_valuation_list_endpoint(per_page=10, page_no=1, query="", username="mohit"):
@@ -10,9 +23,16 @@ def get_valuation_list_endpoint(per_page=10, page_no=1, query="", username="mohi
     Args:
         per_page (int): Number of items per page
         page_no (int): Page number
-        query (str): Search query
+        query (str): Search query, percent-encoded (may contain spaces and "&")
         username (str): Username for filtering
     Returns:
         str: Complete endpoint URL with query parameters
     """
-    return f"{BASE_URL}/api/valuation?perPage={per_page}&pageNo={page_no}&q={query}&username={username}" 
\ No newline at end of file
+    return valuation_list.url(per_page=per_page, page_no=page_no, query=query, username=username)
+
+def __getattr__(name):
+    # POST endpoint for creating valuation, built when it is used so the base URL
+    # from the settings (--env, --base-url) is the one of the current run
+    if name == "valuation_endpoint":
+        return valuation_create.url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,67 @@
+"""
+Drive the API with the same requests the tests send.
+
+Usage:
+    python -m load --duration 60 --rps 50
+    python -m load --duration 30 --concurrency 20 --scenario valuation_list --scenario factors
+    python -m load --list
+"""
+import argparse
+import json
+import sys
+
+from load.runner import LoadRunner, format_report
+from load.scenarios import get_scenarios, get_default_scenarios
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m load", description="Run API load from the test scenarios")
+    parser.add_argument("--scenario", action="append", dest="scenarios",
+                        help="Scenario to run (repeat for more; default: every scenario that does not create data)")
+    parser.add_argument("--duration", type=float, default=30, help="Run time in seconds (default: 30)")
+    parser.add_argument("--rps", type=float, help="Target requests per second (default: send back to back)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Maximum requests in flight (default: 10)")
+    parser.add_argument("--interval", type=float, default=5, help="Report window in seconds (default: 5)")
+    parser.add_argument("--base-url", help="Send requests to this base URL instead of the configured one")
+    parser.add_argument("--seed", type=int, help="Random seed for scenario selection")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="Do not check response bodies against the schemas in data/schemas.py")
+    parser.add_argument("--list", action="store_true", help="List the available scenarios and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = get_scenarios()
+
+    if args.list:
+        for name, scenario in scenarios.items():
+            note = " (creates data)" if scenario.writes else ""
+            print(f"{name:<24} {scenario.request['method']:<5} weight={scenario.weight}{note}")
+        return 0
+
+    if args.scenarios:
+        unknown = [name for name in args.scenarios if name not in scenarios]
+        if unknown:
+            print(f"Unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        selected = [scenarios[name] for name in args.scenarios]
+    else:
+        selected = get_default_scenarios()
+
+    runner = LoadRunner(selected, duration=args.duration, rps=args.rps, concurrency=args.concurrency,
+                        interval=args.interval, base_url=args.base_url, seed=args.seed,
+                        validate=not args.no_validate)
+    report = runner.run()
+
+    for line in format_report(report):
+        print(line)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.async_request_handler import send_request_async
+from utils.logger import get_logger
+from utils.metrics import percentile
+from utils.retry_policy import NO_RETRIES
+from utils.schema_validator import ResponseSchemaError, validate_response
+
+# Initialize logger for load runs
+logger = get_logger()
+
+
+class LoadStats:
+    """
+    Request results grouped into fixed time windows.
+
+    Parameters:
+        interval (float): Window length in seconds
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.windows = {}
+        self.status_counts = {}
+        self.dropped = 0
+
+    def _window(self, now):
+        index = int((now - self.started) / self.interval)
+        return self.windows.setdefault(index, {"latencies": [], "errors": 0})
+
+    def record(self, started, latency_ms, status=None, error=None):
+        """Record a finished request in the window it started in"""
+        window = self._window(started)
+        window["latencies"].append(latency_ms)
+        key = str(status) if error is None else type(error).__name__
+        self.status_counts[key] = self.status_counts.get(key, 0) + 1
+        if error is not None or status >= 500:
+            window["errors"] += 1
+
+    @staticmethod
+    def _summarise(latencies, errors, seconds):
+        latencies = sorted(latencies)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "throughput_rps": round(count / seconds, 1) if seconds else 0.0,
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1) if count else None,
+            "p90_ms": round(percentile(latencies, 90), 1) if count else None,
+            "p99_ms": round(percentile(latencies, 99), 1) if count else None,
+            "max_ms": round(latencies[-1], 1) if count else None,
+        }
+
+    def report(self, duration):
+        """
+        Return throughput, error rate and latency percentiles per window and in total.
+
+        Returns:
+            dict: {"windows": [...], "total": {...}, "status_counts": {...}, "dropped": int}
+        """
+        windows = []
+        all_latencies = []
+        all_errors = 0
+        for index in sorted(self.windows):
+            window = self.windows[index]
+            seconds = min(self.interval, max(duration - index * self.interval, 0.0)) or self.interval
+            summary = self._summarise(window["latencies"], window["errors"], seconds)
+            summary["start_s"] = round(index * self.interval, 1)
+            windows.append(summary)
+            all_latencies.extend(window["latencies"])
+            all_errors += window["errors"]
+        return {
+            "windows": windows,
+            "total": self._summarise(all_latencies, all_errors, duration),
+            "status_counts": dict(sorted(self.status_counts.items())),
+            "dropped": self.dropped,
+        }
+
+
+class LoadRunner:
+    """
+    Sends scenario requests for a fixed duration, either at a target rate or with a fixed concurrency.
+
+    With `rps` set, requests start at that rate (open model) and at most `concurrency`
+    are in flight; requests that cannot start because the limit is reached are counted
+    as dropped. Without `rps`, `concurrency` workers send requests back to back
+    (closed model). Requests go through send_request without retries or the response
+    cache. With `validate`, 200 responses are checked against the scenario's schema and
+    mismatches count as errors.
+
+    Parameters:
+        scenarios (list): Scenario objects to pick from, by weight
+        duration (float): Run time in seconds
+        rps (float): Target requests per second, or None for the closed model
+        concurrency (int): Maximum requests in flight
+        interval (float): Report window length in seconds
+        base_url (str): Send requests to this base URL instead of the configured one
+        seed (int): Random seed for scenario selection
+        validate (bool): Check response bodies against the scenario schemas
+
+    Example:
+        runner = LoadRunner(get_default_scenarios(), duration=30, rps=50)
+        report = runner.run()
+    """
+
+    def __init__(self, scenarios, duration, rps=None, concurrency=10, interval=5.0, base_url=None, seed=None,
+                 validate=True):
+        if not scenarios:
+            raise ValueError("At least one scenario is needed")
+        self.requests = [(scenario.build(base_url), scenario.schema if validate else None, scenario.bodies)
+                         for scenario in scenarios]
+        self.names = [scenario.name for scenario in scenarios]
+        self.weights = [scenario.weight for scenario in scenarios]
+        self.duration = duration
+        self.rps = rps
+        self.concurrency = concurrency
+        self.interval = interval
+        self.random = random.Random(seed)
+
+    def _pick(self):
+        return self.random.choices(self.requests, weights=self.weights)[0]
+
+    async def _send(self, executor, stats):
+        definition, schema, bodies = self._pick()
+        definition = dict(definition)
+        if bodies is not None:
+            definition["data"] = next(bodies)
+        method = definition.pop("method")
+        url = definition.pop("url")
+        start = time.perf_counter()
+        try:
+            response = await send_request_async(method, url, executor=executor, retry_policy=NO_RETRIES, cache=False,
+                                              **definition)
+        except Exception as e:
+            stats.record(start, (time.perf_counter() - start) * 1000, error=e)
+            return
+        latency_ms = (time.perf_counter() - start) * 1000
+        if schema and response.status_code == 200:
+            try:
+                validate_response(schema, response.json())
+            except (ResponseSchemaError, ValueError) as e:
+                stats.record(start, latency_ms, status=response.status_code, error=e)
+                return
+        stats.record(start, latency_ms, status=response.status_code)
+
+    async def _closed_model(self, executor, stats, deadline):
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self._send(executor, stats)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _open_model(self, executor, stats, deadline):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def send_one():
+            try:
+                await self._send(executor, stats)
+            finally:
+                semaphore.release()
+
+        start = time.perf_counter()
+        sent = 0
+        while True:
+            next_start = start + sent / self.rps
+            if next_start >= deadline:
+                break
+            await asyncio.sleep(max(next_start - time.perf_counter(), 0))
+            sent += 1
+            if semaphore.locked():
+                stats.dropped += 1
+                continue
+            await semaphore.acquire()
+            task = asyncio.create_task(send_one())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run_async(self):
+        stats = LoadStats(self.interval)
+        deadline = stats.started + self.duration
+        mode = f"{self.rps} rps" if self.rps else f"concurrency {self.concurrency}"
+        logger.info(f"Starting load run: {', '.join(self.names)} for {self.duration} s at {mode}")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="load") as executor:
+            if self.rps:
+                await self._open_model(executor, stats, deadline)
+            else:
+                await self._closed_model(executor, stats, deadline)
+
+        report = stats.report(self.duration)
+        report["scenarios"] = self.names
+        logger.info(f"Finished load run: {report['total']}")
+        return report
+
+    def run(self):
+        """Run the load and return the report (see LoadStats.report)"""
+        return asyncio.run(self.run_async())
+
+
+def format_report(report):
+    """Return the load report as text table lines"""
+    header = f"{'window':>8}  {'requests':>8}  {'rps':>8}  {'errors':>7}  {'p50':>8}  {'p90':>8}  {'p99':>8}  {'max':>8}"
+
+    def row(label, summary):
+        def ms(value):
+            return f"{value:>6.1f}ms" if value is not None else f"{'-':>8}"
+        return (f"{label:>8}  {summary['requests']:>8}  {summary['throughput_rps']:>8.1f}  "
+                f"{summary['error_rate']:>7.2%}  {ms(summary['p50_ms'])}  {ms(summary['p90_ms'])}  "
+                f"{ms(summary['p99_ms'])}  {ms(summary['max_ms'])}")
+
+    lines = [header]
+    lines.extend(row(f"{window['start_s']}s", window) for window in report["windows"])
+    lines.append(row("total", report["total"]))
+    lines.append("status counts: " + ", ".join(f"{key}={value}" for key, value in report["status_counts"].items()))
+    if report["dropped"]:
+        lines.append(f"dropped (concurrency limit reached): {report['dropped']}")
+    return lines
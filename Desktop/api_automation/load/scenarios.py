@@ -0,0 +1,103 @@
+from config.settings import get_settings
+from endpoints.registry import dealer_radius_factor, documents_by_section, factor_list, login, valuation_create
+from endpoints.valuation_endpoints import get_valuation_list_endpoint
+from data.auth_data import valid_login_payload
+from data.test_data import default_headers, DEFAULT_USERNAME, DEFAULT_PAGE_SIZE, DEFAULT_PAGE_NUMBER
+from data.factories import ValuationFactory
+from utils.auth import AuthProvider, get_auth_provider
+
+DOCUMENT_SECTIONS = ["eula", "pp", "help", "tc"]
+
+
+class Scenario:
+    """
+    One request the load runner can send, built from the same endpoints and data as the tests.
+
+    Parameters:
+        name (str): Scenario name used on the command line and in reports
+        request (dict): send_request arguments with "method" and "url" keys
+        weight (int): How often this scenario is picked compared to the others
+        writes (bool): True if the request creates data on the server
+        schema (str): Name of the response schema in data/schemas.py that 200 responses must match
+        bodies (iterator): Pre-serialized request bodies, one per request (e.g. ValuationFactory().bodies())
+        authenticated (bool): Send the request with the auth provider of the base URL it goes to
+    """
+
+    def __init__(self, name, request, weight=1, writes=False, schema=None, bodies=None, authenticated=False):
+        self.name = name
+        self.request = request
+        self.weight = weight
+        self.writes = writes
+        self.schema = schema
+        self.bodies = bodies
+        self.authenticated = authenticated
+
+    def build(self, base_url=None):
+        """Return the send_request arguments, optionally pointed at another base URL"""
+        request = dict(self.request)
+        if base_url:
+            request["url"] = base_url.rstrip("/") + request["url"][len(get_settings().base_url.rstrip("/")):]
+        if self.authenticated:
+            # The provider logs in when the first request is sent and again when the token expires
+            request["auth"] = AuthProvider(login_url=login.url(base_url=base_url)) if base_url else get_auth_provider()
+        return request
+
+
+def _headers(content_type="application/json"):
+    headers = default_headers.copy()
+    headers["Content-Type"] = content_type
+    return headers
+
+
+def get_scenarios():
+    """
+    Return all known scenarios by name.
+
+    Returns:
+        dict: {scenario name: Scenario}
+    """
+    scenarios = [
+        Scenario("valuation_list", {
+            "method": "GET",
+            "url": get_valuation_list_endpoint(per_page=DEFAULT_PAGE_SIZE, page_no=DEFAULT_PAGE_NUMBER, username=DEFAULT_USERNAME),
+            "headers": _headers("text/plain"),
+        }, weight=4, schema="valuation_list", authenticated=True),
+        Scenario("valuation_search", {
+            "method": "GET",
+            "url": get_valuation_list_endpoint(query="Estimate"),
+            "headers": _headers("text/plain"),
+        }, weight=2, schema="valuation_list", authenticated=True),
+        Scenario("factors", {
+            "method": "GET",
+            "url": factor_list.url(),
+        }, weight=2, schema="factor_list", authenticated=True),
+        Scenario("dealer_radius_factor", {
+            "method": "GET",
+            "url": dealer_radius_factor.url(),
+            "params": {"type": "StepsOptions"},
+        }, weight=2, schema="dealer_radius_factor", authenticated=True),
+        Scenario("login", {
+            "method": "POST",
+            "url": login.url(),
+            "headers": default_headers,
+            "json": valid_login_payload,
+        }),
+        Scenario("create_valuation", {
+            "method": "POST",
+            "url": valuation_create.url(username=DEFAULT_USERNAME),
+            "headers": _headers(),
+        }, writes=True, schema="valuation_create", bodies=ValuationFactory().bodies(), authenticated=True),
+    ]
+    for section in DOCUMENT_SECTIONS:
+        scenarios.append(Scenario(f"document_{section}", {
+            "method": "GET",
+            "url": documents_by_section.url(),
+            "headers": {"Authorization": get_settings().documents_auth_token},
+            "params": {"section": section},
+        }, schema="documents_by_section"))
+    return {scenario.name: scenario for scenario in scenarios}
+
+
+def get_default_scenarios():
+    """Return the scenarios used when none are chosen: every scenario that does not create data"""
+    return [scenario for scenario in get_scenarios().values() if not scenario.writes]
@@ -0,0 +1,53 @@
+"""
+Serve the stub Digitree API used by ENVIRONMENT=local.
+
+Usage:
+    python -m stub_server
+    python -m stub_server --port 8765 --latency-ms 20 --jitter-ms 30
+    python -m stub_server --error-rate 0.1 --error-status 503 --retry-after 1 --seed 42
+"""
+import argparse
+import asyncio
+import sys
+
+from config.settings import get_environments
+from stub_server.server import StubConfig, StubServer
+
+
+def parse_args(argv=None):
+    defaults = StubConfig()
+    local_url = get_environments()["local"]["BASE_URL"]
+    parser = argparse.ArgumentParser(prog="python -m stub_server", description="Serve the stub Digitree API")
+    parser.add_argument("--host", help="Address to listen on (default: host of the local BASE_URL)")
+    parser.add_argument("--port", type=int, help=f"Port to listen on (default: port of {local_url})")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=defaults.latency_jitter_ms,
+                        help="Random extra delay, up to this many milliseconds")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Share of requests answered with --error-status (0 to 1)")
+    parser.add_argument("--error-status", type=int, default=defaults.error_status,
+                        help="Status code of injected errors (default: 503)")
+    parser.add_argument("--retry-after", type=float, help="Send this Retry-After (seconds) with injected errors")
+    parser.add_argument("--reset-rate", type=float, default=0.0,
+                        help="Share of requests whose connection is closed without a response")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed for injected latency and errors")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = StubConfig(latency_ms=args.latency_ms, latency_jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        error_status=args.error_status, retry_after=args.retry_after, reset_rate=args.reset_rate,
+                        seed=args.seed)
+    server = StubServer.for_url(get_environments()["local"]["BASE_URL"], config=config)
+    server.host = args.host or server.host
+    server.port = server.port if args.port is None else args.port
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
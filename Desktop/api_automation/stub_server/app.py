@@ -0,0 +1,187 @@
+import json
+import math
+import secrets
+import threading
+from urllib.parse import parse_qsl
+
+from stub_server.fixtures import DEALER_RADIUS_STEPS, DOCUMENTS, build_factors, build_valuations
+
+JSON_CONTENT_TYPE = "application/json"
+
+# Page returned for paths that are not API endpoints
+WEB_APP_PAGE = b"<!doctype html><html><head><title>Digitree</title></head><body><div id=\"root\"></div></body></html>"
+
+# Fields the valuation endpoint needs to create a valuation
+VALUATION_FIELDS = ("dealer_info_id", "name", "config_id", "dealer_id")
+
+
+def json_body(data):
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+class StubApp:
+    """
+    Request handlers of the stub Digitree API.
+
+    Handlers get (query dict, headers dict, body bytes) and return (status code,
+    JSON body bytes). Header names are lower-cased.
+
+    Parameters:
+        tokens (iterable): Authorization header values accepted by protected endpoints
+        users (dict): {username: password} accepted by the login endpoint
+        token_ttl (int): Lifetime in seconds reported for issued tokens
+    """
+
+    def __init__(self, tokens=(), users=None, token_ttl=3600):
+        self.tokens = {token for token in tokens if token}
+        self.users = dict(users or {})
+        self.token_ttl = token_ttl
+        self.factors = build_factors()
+        self.valuations = build_valuations()
+        self.next_valuation_id = 1000 + len(self.valuations)
+        self._lock = threading.Lock()
+        self.routes = {
+            "/api/auth/user/login": {"POST": self.login},
+            "/api/valuation": {"GET": self.list_valuations, "POST": self.create_valuation},
+            "/api/factor": {"GET": self.list_factors},
+            "/api/dealer_radius_factor": {"GET": self.dealer_radius_factor},
+            "/api/get_documents_by_section": {"GET": self.documents_by_section},
+        }
+        # Routes of single items ("/api/valuation/<id>"); handlers also get the id
+        self.item_routes = {
+            "/api/valuation": {"DELETE": self.delete_valuation},
+        }
+
+        # Responses that never change are serialized once
+        self._documents = {section: json_body(document) for section, document in DOCUMENTS.items()}
+        self._empty_document = json_body({"Title": "", "Sections": {}})
+        self._steps = json_body(DEALER_RADIUS_STEPS)
+
+    def handle(self, method, path, query, headers, body):
+        """Return (status code, body bytes, content type) for a request"""
+        path = path.rstrip("/") or "/"
+        handlers = self.routes.get(path)
+        item_id = None
+        if handlers is None:
+            collection, _, item_id = path.rpartition("/")
+            handlers = self.item_routes.get(collection) if item_id.isdigit() else None
+        if handlers is None:
+            # Like the CloudFront distribution, which serves the web app for unknown paths
+            return 200, WEB_APP_PAGE, "text/html; charset=utf-8"
+        handler = handlers.get(method)
+        if handler is None:
+            return 405, json_body({"detail": f"Method \"{method}\" not allowed."}), JSON_CONTENT_TYPE
+        if item_id is not None:
+            return (*handler(int(item_id), query, headers, body), JSON_CONTENT_TYPE)
+        return (*handler(query, headers, body), JSON_CONTENT_TYPE)
+
+    def _check_token(self, headers):
+        """Return an error response for a missing or unknown token, or None"""
+        token = headers.get("authorization")
+        if not token:
+            return 401, json_body({"detail": "Authentication credentials were not provided."})
+        if token not in self.tokens:
+            return 401, json_body({"detail": "Invalid token."})
+        return None
+
+    @staticmethod
+    def _paginate(items, query):
+        try:
+            per_page = max(int(query.get("perPage") or 10), 1)
+            page_no = max(int(query.get("pageNo") or 1), 1)
+        except ValueError:
+            return 400, json_body({"detail": "perPage and pageNo must be integers"})
+        start = (page_no - 1) * per_page
+        return 200, json_body({
+            "total": len(items),
+            "pageNo": page_no,
+            "perPage": per_page,
+            "pages": math.ceil(len(items) / per_page),
+            "results": items[start:start + per_page],
+        })
+
+    def login(self, query, headers, body):
+        try:
+            credentials = json.loads(body or b"{}")
+        except ValueError:
+            credentials = {}
+        username = credentials.get("username") if isinstance(credentials, dict) else None
+        password = credentials.get("password") if isinstance(credentials, dict) else None
+        if not username or not password or self.users.get(username) != password:
+            return 401, json_body({"status": False, "message": "Invalid username or password"})
+
+        token = secrets.token_hex(20)
+        with self._lock:
+            self.tokens.add(f"Token {token}")
+        return 200, json_body({"status": True, "message": "Login successful", "token": token,
+                               "expires_in": self.token_ttl})
+
+    def list_valuations(self, query, headers, body):
+        error = self._check_token(headers)
+        if error:
+            return error
+        username = query.get("username")
+        search = (query.get("q") or "").lower()
+        with self._lock:
+            items = [
+                valuation for valuation in self.valuations
+                if (not username or valuation["username"] == username) and search in valuation["name"].lower()
+            ]
+        return self._paginate(items, query)
+
+    def create_valuation(self, query, headers, body):
+        error = self._check_token(headers)
+        if error:
+            return error
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, json_body({"Message": "Invalid JSON", "Status": False})
+        # The real API times out on an empty payload
+        if not payload:
+            return 408, json_body({"Message": "Request Timeout", "Status": False})
+        missing = [field for field in VALUATION_FIELDS if field not in payload]
+        if missing:
+            return 400, json_body({"Message": f"Missing required fields: {', '.join(missing)}", "Status": False})
+
+        with self._lock:
+            valuation_id = self.next_valuation_id
+            self.next_valuation_id += 1
+            self.valuations.append({**payload, "id": valuation_id, "username": query.get("username", ""),
+                                    "createdOn": "2025-04-22T12:15:17Z"})
+        return 200, json_body({"Message": "Successfully Created New Valuation", "Valuation_id": valuation_id,
+                               "Status": True})
+
+    def delete_valuation(self, valuation_id, query, headers, body):
+        error = self._check_token(headers)
+        if error:
+            return error
+        with self._lock:
+            index = next((index for index, valuation in enumerate(self.valuations)
+                          if valuation["id"] == valuation_id), None)
+            if index is None:
+                return 404, json_body({"Message": "Valuation not found", "Status": False})
+            del self.valuations[index]
+        return 200, json_body({"Message": "Successfully Deleted Valuation", "Status": True})
+
+    def list_factors(self, query, headers, body):
+        return self._check_token(headers) or self._paginate(self.factors, query)
+
+    def dealer_radius_factor(self, query, headers, body):
+        error = self._check_token(headers)
+        if error:
+            return error
+        return 200, self._steps if query.get("type") == "StepsOptions" else b"[]"
+
+    def documents_by_section(self, query, headers, body):
+        # The real API fails with a 500 when the Authorization header is missing
+        if "authorization" not in headers:
+            return 500, json_body({"detail": "Internal Server Error"})
+        token = headers["authorization"]
+        if token not in self.tokens:
+            return 401, json_body({"detail": "Invalid token."})
+        return 200, self._documents.get(query.get("section"), self._empty_document)
+
+
+def parse_query(query_string):
+    return dict(parse_qsl(query_string, keep_blank_values=True))
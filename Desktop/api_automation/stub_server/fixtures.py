@@ -0,0 +1,166 @@
+# Data served by the stub server. It matches what the contract tests in tests/ expect
+# from the real API, so the whole suite can run against ENVIRONMENT=local.
+
+DEALER_RADIUS_STEPS = [1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 40, 50, 75, 100]
+
+FACTOR_NAMES = {
+    4: "Profitability % of Revenue",
+    33: "F&I (per car) Used",
+    43: "PVR (per car) Used",
+    54: "",
+    56: "Financials Test",
+    115: "PVR (New & Used)",
+    116: "F&I (New & Used)",
+    141: "PVR New",
+    142: "F&I New",
+    149: "testing",
+    155: "Inventory Turn",
+    160: "Days Supply Used",
+    161: "Days Supply New",
+    162: "Service Absorption",
+    170: "Parts Gross",
+}
+
+
+def build_factors():
+    """Return the factor list, sorted by id"""
+    factors = []
+    for factor_id, name in sorted(FACTOR_NAMES.items()):
+        factors.append({
+            "id": factor_id,
+            "name": name,
+            "kpi__name": "Financial" if factor_id < 100 else "Operational",
+            "factortype__name": "Percentage" if "%" in name else "Amount",
+            "active": factor_id != 54,
+            "createdOn": "2025-01-15T10:30:00Z",
+            "weight": [
+                {"weight_name": "Low", "weight_value": 1, "metric_id": factor_id * 10 + 1},
+                {"weight_name": "High", "weight_value": 3, "metric_id": factor_id * 10 + 2},
+            ],
+        })
+    return factors
+
+
+def build_valuations(username="mohit", count=12):
+    """Return the valuations the stub starts with"""
+    return [
+        {
+            "id": 1000 + index,
+            "name": f"Estimate_{index + 1:02d} Apr 2025 12:15:17" if index % 3 else f"Valuation {index + 1}",
+            "dealer_info_id": 21739,
+            "dealer_id": "52",
+            "config_id": 1421,
+            "isInstantReport": True,
+            "username": username,
+            "createdOn": f"2025-04-{index + 1:02d}T12:15:17Z",
+        }
+        for index in range(count)
+    ]
+
+
+DOCUMENTS = {
+    "eula": {
+        "Title": "End user’s Agreement (EULA)",
+        "Sections": {
+            "Introduction": [
+                "These Terms and Conditions form a binding agreement between you and Jump IQ, Inc. "
+                "governing your use of the services."
+            ],
+            "Definitions": [
+                "\"Aggregated Statistics\" means data and information related to Customer's use of the services.",
+                "\"Authorized User\" means Customer's employees, consultants, contractors and agents.",
+                "\"Customer Data\" means information, data and other content submitted by or on behalf of Customer.",
+                "\"Company IP\" means the services, the documentation and any and all intellectual property provided to Customer.",
+            ],
+            "Customer Responsibilities": [
+                "Customer is responsible for all uses of the services resulting from access provided by Customer."
+            ],
+            "Access and Use": [
+                "Company grants Customer a non-exclusive, non-transferable right to access and use the services.",
+                "Use restrictions: Customer shall not copy, modify or create derivative works of the services.",
+            ],
+            "Confidential Information": [
+                "Each party may disclose confidential information to the other party and shall protect it."
+            ],
+            "Intellectual Property Ownership; Feedback": [
+                "Company owns all right, title and interest in and to the Company IP."
+            ],
+            "Disclaimers": [
+                "THE COMPANY IP IS PROVIDED \"AS IS\" AND COMPANY SPECIFICALLY DISCLAIMS ALL WARRANTIES, "
+                "WHETHER EXPRESS, IMPLIED, STATUTORY OR OTHERWISE."
+            ],
+            "Indemnification": [
+                "Customer shall indemnify and hold harmless Company from any third-party claim."
+            ],
+            "Limitations of Liability": [
+                "IN NO EVENT WILL COMPANY BE LIABLE FOR ANY CONSEQUENTIAL DAMAGES, AND TOTAL LIABILITY "
+                "SHALL NOT EXCEED USD 100."
+            ],
+            "Term and Termination": [
+                "This agreement remains in effect until terminated by either party."
+            ],
+            "Miscellaneous": [
+                "This agreement is the entire agreement between the parties."
+            ],
+        },
+    },
+    "pp": {
+        "Title": "Privacy and policy",
+        "Sections": {
+            "Personal Information": [
+                "Name",
+                "Email address",
+                "Contact information",
+                "User credentials (username and password)",
+            ],
+            "Usage Data": [
+                "Log files",
+                "IP addresses",
+                "Browser type",
+                "Page visited",
+                "Date and time of access",
+            ],
+            "Device Information": [
+                "Device type",
+                "Operating system",
+                "Unique device identifiers",
+            ],
+            "How We Use Your Information": [
+                "Provide and maintain our web app",
+                "Improve and personalize user experience",
+                "Send you updates, newsletters, and promotional material",
+                "Respond to your inquiries and support requests",
+                "Analyze usage patterns and trends",
+            ],
+        },
+    },
+    "help": {
+        "Title": "HELP",
+        "Sections": {
+            f"Section {number}": [
+                "Lorem ipsum dolor sit amet consectetur. Neque volutpat elit diam nunc. "
+                "Magna sed rhoncus porttitor eget. Pulvinar augue sit nisl tempus. "
+                "Massa justo malesuada fermentum tellus."
+            ]
+            for number in (1, 2, 3)
+        },
+    },
+    "tc": {
+        "Title": "Terms & Conditions",
+        "Sections": {
+            "Section 1": [
+                "Lorem ipsum dolor sit amet consectetur.",
+                "Neque volutpat elit diam nunc.",
+                "Magna sed rhoncus porttitor eget.",
+            ],
+            "Section 2": [
+                "Pulvinar augue sit nisl tempus.",
+                "Massa justo malesuada fermentum tellus.",
+                "Vitae purus faucibus ornare suspendisse.",
+            ],
+            "Section 3": [
+                "Sed viverra tellus in hac habitasse platea dictumst.",
+            ],
+        },
+    },
+}
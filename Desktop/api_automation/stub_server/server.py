@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from config.config import (
+    AUTH_TOKEN_TTL, STUB_ERROR_RATE, STUB_ERROR_STATUS, STUB_LATENCY_JITTER_MS, STUB_LATENCY_MS, STUB_SEED
+)
+from config.settings import get_environments, get_settings
+from stub_server.app import JSON_CONTENT_TYPE, StubApp, json_body, parse_query
+from utils.logger import get_logger
+
+# Initialize logger for the stub server
+logger = get_logger()
+
+# Largest request head (request line and headers) the server reads
+MAX_HEAD_BYTES = 64 * 1024
+
+# Path that returns the server counters as JSON
+STATS_PATH = "/__stub__/stats"
+
+
+def default_users():
+    users = {"stub_user": "stub_password"}
+    settings = get_settings()
+    if settings.auth_username and settings.auth_password:
+        users[settings.auth_username] = settings.auth_password
+    return users
+
+
+def default_tokens():
+    return [get_environments()["local"]["AUTH_TOKEN"], get_settings().documents_auth_token]
+
+
+@dataclass
+class StubConfig:
+    """
+    Behaviour of the stub server.
+
+    Latency and errors are injected before the request is handled. With a seed the
+    sequence of injected delays and errors is the same on every run.
+
+    Parameters:
+        latency_ms (float): Delay added to every response
+        latency_jitter_ms (float): Random extra delay, between 0 and this value
+        error_rate (float): Share of requests answered with `error_status` (0 to 1)
+        error_status (int): Status code of injected errors
+        retry_after (float): Retry-After header sent with injected errors, in seconds (None: no header)
+        reset_rate (float): Share of requests whose connection is closed without a response
+        seed (int): Random seed for injected latency and errors
+        tokens (list): Authorization header values accepted by protected endpoints
+        users (dict): {username: password} accepted by the login endpoint
+    """
+    latency_ms: float = STUB_LATENCY_MS
+    latency_jitter_ms: float = STUB_LATENCY_JITTER_MS
+    error_rate: float = STUB_ERROR_RATE
+    error_status: int = STUB_ERROR_STATUS
+    retry_after: float = None
+    reset_rate: float = 0.0
+    seed: int = int(STUB_SEED) if STUB_SEED else None
+    tokens: list = field(default_factory=default_tokens)
+    users: dict = field(default_factory=default_users)
+
+
+def encode_response(status, body, keep_alive=True, extra_headers=(), content_type=JSON_CONTENT_TYPE):
+    """Return the raw HTTP/1.1 response bytes"""
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [
+        f"HTTP/1.1 {status} {reason}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in extra_headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def parse_head(head):
+    """
+    Parse a request head into (method, target, version, headers).
+
+    Raises:
+        ValueError: If the request line is malformed
+    """
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), target, version, headers
+
+
+class StubServer:
+    """
+    Asyncio HTTP/1.1 server with keep-alive that answers like the Digitree API.
+
+    It can run in a background thread of the test process (start/stop) or in the
+    foreground (serve_forever, used by `python -m stub_server`).
+
+    Parameters:
+        host (str): Address to listen on
+        port (int): Port to listen on (0 picks a free port)
+        config (StubConfig): Injected latency and errors, accepted tokens and users
+        idle_timeout (float): Seconds an idle keep-alive connection is kept open
+
+    Example:
+        with StubServer(port=0) as server:
+            response = send_request("GET", f"{server.url}/api/factor", headers={"Authorization": token})
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, config=None, idle_timeout=30.0):
+        self.host = host
+        self.port = port
+        self.config = config or StubConfig()
+        self.idle_timeout = idle_timeout
+        self.app = StubApp(tokens=self.config.tokens, users=self.config.users, token_ttl=AUTH_TOKEN_TTL)
+        self.random = random.Random(self.config.seed)
+        self.stats = {"connections": 0, "requests": 0, "not_modified": 0, "injected_errors": 0, "injected_resets": 0}
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    @classmethod
+    def for_url(cls, base_url, **kwargs):
+        """Build a server listening on the host and port of `base_url`"""
+        parts = urlsplit(base_url)
+        return cls(host=parts.hostname, port=parts.port or 80, **kwargs)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def _respond(self, method, target, headers, body):
+        """Return (status, body, content type, extra headers), or None to drop the connection"""
+        self.stats["requests"] += 1
+        path, _, query_string = target.partition("?")
+        if path == STATS_PATH:
+            return 200, json_body(self.stats), JSON_CONTENT_TYPE, ()
+
+        config = self.config
+        delay = config.latency_ms
+        if config.latency_jitter_ms:
+            delay += self.random.uniform(0, config.latency_jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        if config.reset_rate and self.random.random() < config.reset_rate:
+            self.stats["injected_resets"] += 1
+            return None
+        if config.error_rate and self.random.random() < config.error_rate:
+            self.stats["injected_errors"] += 1
+            extra_headers = [("Retry-After", f"{config.retry_after:g}")] if config.retry_after is not None else []
+            return config.error_status, json_body({"detail": "Injected error"}), JSON_CONTENT_TYPE, extra_headers
+
+        status, response_body, content_type = self.app.handle(method, path, parse_query(query_string), headers, body)
+        if method != "GET" or status != 200 or content_type != JSON_CONTENT_TYPE:
+            return status, response_body, content_type, ()
+        # ETags let clients revalidate cached responses with If-None-Match
+        etag = f'"{hashlib.sha1(response_body).hexdigest()[:16]}"'
+        if headers.get("if-none-match") == etag:
+            self.stats["not_modified"] += 1
+            return 304, b"", content_type, [("ETag", etag)]
+        return status, response_body, content_type, [("ETag", etag)]
+
+    async def _handle_connection(self, reader, writer):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+                except asyncio.LimitOverrunError:
+                    writer.write(encode_response(431, json_body({"detail": "Request head too large"}), False))
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+
+                try:
+                    method, target, version, headers = parse_head(head)
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    writer.write(encode_response(400, json_body({"detail": "Malformed request"}), False))
+                    break
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    writer.write(encode_response(411, json_body({"detail": "Content-Length required"}), False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                response = await self._respond(method, target, headers, body)
+                if response is None:
+                    break
+                status, response_body, content_type, extra_headers = response
+                writer.write(encode_response(status, response_body, keep_alive, extra_headers, content_type))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start_async(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEAD_BYTES, backlog=1024, reuse_address=True)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Stub server listening on {self.url}")
+
+    async def serve_forever(self):
+        """Serve in the current event loop until cancelled"""
+        await self.start_async()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """
+        Start serving in a background thread.
+
+        Raises:
+            OSError: If the address is already in use
+        """
+        started = threading.Event()
+        failure = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.start_async())
+            except OSError as e:
+                failure.append(e)
+                started.set()
+                self._loop.close()
+                return
+            started.set()
+            self._loop.run_forever()
+
+            # Drop open keep-alive connections, then stop listening
+            self._server.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="stub-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            raise failure[0]
+        return self
+
+    def stop(self):
+        """Stop a server started with start()"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+        logger.info(f"Stub server stopped after {self.stats['requests']} requests: {json.dumps(self.stats)}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
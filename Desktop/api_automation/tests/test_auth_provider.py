@@ -0,0 +1,78 @@
+import http.server
+import json
+import threading
+import pytest
+from endpoints.registry import factor_list, login
+from utils.auth import AuthProvider, TokenCache, parse_login_response
+from utils.request_handler import send_request
+
+class AuthStubHandler(http.server.BaseHTTPRequestHandler):
+    """Issues numbered tokens on login and only accepts the newest one"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    logins = 0
+
+    def _reply(self, status_code, data):
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        AuthStubHandler.logins += 1
+        self._reply(200, {"token": f"key{AuthStubHandler.logins}", "expires_in": 3600})
+
+    def do_GET(self):
+        if self.headers.get("Authorization") == f"Token key{AuthStubHandler.logins}":
+            self._reply(200, {"status": True})
+        else:
+            self._reply(401, {"status": False})
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_url():
+    """Local server with a login endpoint and one protected endpoint"""
+    AuthStubHandler.logins = 0
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), AuthStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+def make_provider(stub_url, tmp_path):
+    """Helper function to build a provider with its own cache file"""
+    return AuthProvider(login_url=login.url(base_url=stub_url), username="user", password="secret",
+                        cache=TokenCache(str(tmp_path / "auth_token.json")))
+
+def test_logs_in_once_and_shares_the_token(stub_url, tmp_path):
+    """Test that providers sharing a cache file (like xdist workers) log in only once"""
+    first = make_provider(stub_url, tmp_path)
+    second = make_provider(stub_url, tmp_path)
+    assert first.get_token() == "Token key1"
+    assert second.get_token() == "Token key1", "Second provider should reuse the cached token"
+    assert AuthStubHandler.logins == 1, f"Expected one login, but got {AuthStubHandler.logins}"
+
+def test_refreshes_token_on_401(stub_url, tmp_path):
+    """Test that a rejected token is replaced and the request sent again"""
+    provider = make_provider(stub_url, tmp_path)
+    provider.get_token()
+    AuthStubHandler.logins += 1  # the server now only accepts a newer token
+
+    response = send_request("GET", factor_list.url(base_url=stub_url), auth=provider)
+    assert response.status_code == 200, f"Expected status code 200 after refresh, but got {response.status_code}"
+    assert response.history and response.history[0].status_code == 401, "Expected the first attempt to get 401"
+
+def test_uses_static_token_without_credentials(tmp_path):
+    """Test that AUTH_TOKEN is used when no login credentials are configured"""
+    provider = AuthProvider(username="", password="", static_token="Token static",
+                            cache=TokenCache(str(tmp_path / "auth_token.json")))
+    assert provider.get_token() == "Token static"
+
+def test_parse_login_response():
+    """Test reading tokens from the supported login response formats"""
+    assert parse_login_response({"token": "abc"})["token"] == "Token abc"
+    assert parse_login_response({"data": {"access": "Bearer xyz", "expires_at": 100}}) == {"token": "Bearer xyz", "expires_at": 100}
@@ -0,0 +1,24 @@
+from benchmarks.harness import BenchmarkResult, compare_results, measure, read_results, write_results
+
+def make_result(name, median_us):
+    """Helper function to build a result with the given median"""
+    return BenchmarkResult.from_samples(name, [median_us] * 3)
+
+def test_measure_returns_one_sample_per_round():
+    """Test that warm-up rounds are not part of the samples"""
+    calls = []
+    samples = measure(lambda: calls.append(1), rounds=5, inner=10, warmup=2)
+    assert len(samples) == 5, f"Expected 5 samples, but got {len(samples)}"
+    assert len(calls) == 70, f"Expected 70 calls including warm-up, but got {len(calls)}"
+
+def test_compare_flags_regressions_over_threshold(tmp_path):
+    """Test that only slowdowns over both the percent and absolute thresholds fail"""
+    path = str(tmp_path / "baseline.json")
+    write_results([make_result("slower", 100), make_result("tiny", 0.2), make_result("faster", 100)], path)
+    current = [make_result("slower", 120), make_result("tiny", 0.4), make_result("faster", 90), make_result("new", 5)]
+
+    rows = {row[0]: row for row in compare_results(current, read_results(path), threshold_pct=10)}
+    assert rows["slower"][4], f"Expected a 20% slowdown to be a regression: {rows['slower']}"
+    assert not rows["tiny"][4], f"Expected a 0.2 us slowdown to be ignored: {rows['tiny']}"
+    assert not rows["faster"][4], f"Expected a speedup not to be a regression: {rows['faster']}"
+    assert rows["new"][1] is None and not rows["new"][4], f"Expected a new benchmark without baseline: {rows['new']}"
@@ -0,0 +1,68 @@
+import json
+import time
+from urllib.parse import urlsplit
+
+import pytest
+from endpoints.registry import factor_list, login
+from stub_server.server import StubConfig, StubServer
+from utils.auth import AuthProvider, TokenCache
+from utils.cassette import CassetteMiss, save_cassettes, transport
+from utils.request_handler import send_request
+
+STUB_TOKEN = "Token cassette-token"
+
+pytestmark = pytest.mark.no_response_cache
+
+@pytest.fixture
+def stub():
+    """Stub server whose responses are recorded"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN], users={"user": "secret"})).start()
+    yield server
+    server.stop()
+
+def get_factors(base_url, **kwargs):
+    """Helper function to fetch the first page of factors"""
+    return send_request("GET", factor_list.url(base_url=base_url), headers={"Authorization": STUB_TOKEN}, **kwargs)
+
+def make_provider(base_url, cache_path):
+    """Helper function to build a provider whose cached token the server no longer accepts"""
+    cache = TokenCache(str(cache_path))
+    provider = AuthProvider(login_url=login.url(base_url=base_url), username="user", password="secret", cache=cache)
+    cache_path.write_text(json.dumps({provider.cache_key: {"token": "Token revoked", "expires_at": time.time() + 3600}}))
+    return provider
+
+def test_recorded_responses_are_replayed_without_network(stub, tmp_path):
+    """Test that replay answers recorded requests, including a 401 resent by the auth provider, with the server down"""
+    base_url = stub.url
+    with transport("record", str(tmp_path), hosts=[urlsplit(base_url).netloc]):
+        recorded = get_factors(base_url, params={"pageNo": 2})
+        refreshed = send_request("GET", factor_list.url(base_url=base_url),
+                                 auth=make_provider(base_url, tmp_path / "recorded_token.json"))
+        save_cassettes()
+    assert refreshed.status_code == 200 and refreshed.history[0].status_code == 401, "Expected a refresh to be recorded"
+    cassette_locks = [path.name for path in tmp_path.glob("*.json.lock") if "token" not in path.name]
+    assert cassette_locks == [], f"Expected the cassette lock files to be kept out of the cassette folder: {cassette_locks}"
+    stub.stop()
+
+    with transport("replay", str(tmp_path), hosts=[urlsplit(base_url).netloc]):
+        replayed = get_factors(base_url, params={"pageNo": 2})
+        refreshed = send_request("GET", factor_list.url(base_url=base_url),
+                                 auth=make_provider(base_url, tmp_path / "replayed_token.json"))
+    assert (replayed.status_code, replayed.json()) == (200, recorded.json()), "Expected the recorded response"
+    assert refreshed.status_code == 200, f"Expected the replayed refresh to succeed, got {refreshed.status_code}"
+    assert refreshed.history[0].status_code == 401, "Expected the replayed 401 to be resent"
+
+def test_unrecorded_requests_miss_and_other_hosts_stay_live(stub, tmp_path):
+    """Test that replay raises CassetteMiss for new requests and leaves hosts it does not replay alone"""
+    with transport("record", str(tmp_path), hosts=["recorded.example:443"]):
+        get_factors(stub.url)
+        save_cassettes()
+    assert not list(tmp_path.glob("*.json")), "Expected requests to other hosts not to be recorded"
+
+    with transport("replay", str(tmp_path), hosts=[urlsplit(stub.url).netloc]):
+        with pytest.raises(CassetteMiss, match="No recorded response"):
+            get_factors(stub.url)
+    requests_before = stub.stats["requests"]
+    with transport("replay", str(tmp_path), hosts=["recorded.example:443"]):
+        assert get_factors(stub.url).status_code == 200, "Expected a live response from the stub"
+    assert stub.stats["requests"] - requests_before == 1, "Expected the request to reach the stub"
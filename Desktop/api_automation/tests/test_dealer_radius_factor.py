@@ -1,16 +1,15 @@
 import pytest
-from config.settings import BASE_URL, AUTH_TOKEN
+from endpoints.registry import dealer_radius_factor
 from utils.request_handler import send_request
+from utils.schema_validator import validate_response
 
 @pytest.mark.api
-def test_get_dealer_radius_factor():
+@pytest.mark.latency(p95_ms=300, samples=20)
+def test_get_dealer_radius_factor(auth_provider, snapshot):
     """
     Test to validate the dealer radius factor API response
     """
-    endpoint = f"{BASE_URL}/api/dealer_radius_factor"
-    headers = {
-        "Authorization": AUTH_TOKEN
-    }
+    endpoint = dealer_radius_factor.url()
     params = {
         "type": "StepsOptions"
     }
@@ -18,7 +17,7 @@ def test_get_dealer_radius_factor():
     response = send_request(
         "GET",
         endpoint,
-        headers=headers,
+        auth=auth_provider,
         params=params
     )
 
@@ -26,8 +25,8 @@ def test_get_dealer_radius_factor():
     assert response.status_code == 200, "Failed to get dealer radius factor"
     data = response.json()
     
-    # Validate response is a list
-    assert isinstance(data, list), "Response should be a list"
+    # Validate response is a list of integers
+    validate_response("dealer_radius_factor", data)
     
     # Validate expected values exist
     expected_values = [1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 40, 50, 75, 100]
@@ -43,10 +42,9 @@ def test_get_dealer_radius_factor():
     # Validate values are in ascending order
     assert data == sorted(data), "Values are not in ascending order"
     
-    # Validate all values are integers
-    for value in data:
-        assert isinstance(value, int), f"Value {value} is not an integer"
-    
     # Validate minimum and maximum values
     assert min(data) == 1, "Minimum value should be 1"
-    assert max(data) == 100, "Maximum value should be 100"
\ No newline at end of file
+    assert max(data) == 100, "Maximum value should be 100"
+    
+    # Compare the steps, in order, with the stored snapshot
+    snapshot.assert_match(data)
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+from stub_server.fixtures import DOCUMENTS
+from utils.document_validator import EVERY_PARAGRAPH, DocumentContentError, DocumentSpec, PhraseMatcher
+
+def test_matcher_agrees_with_substring_search():
+    """Test that both matcher modes find exactly the phrases a substring search finds, overlapping ones included"""
+    rng = random.Random(23)
+    for _ in range(500):
+        phrases = list({"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))})
+        texts = ["".join(rng.choice("abcd") for _ in range(rng.randint(0, 20))) for _ in range(rng.randint(0, 3))]
+        expected = [phrase for phrase in phrases if not any(phrase in text for text in texts)]
+        for use_automaton in (True, False):
+            matcher = PhraseMatcher(phrases, use_automaton=use_automaton)
+            assert matcher.missing(texts) == expected, f"Wrong result for {phrases} in {texts} (automaton={use_automaton})"
+            folded = PhraseMatcher([phrase.upper() for phrase in phrases], ignore_case=True, use_automaton=use_automaton)
+            assert folded.missing(texts) == [phrase.upper() for phrase in expected], "Wrong result ignoring case"
+
+def test_phrases_do_not_match_across_paragraphs():
+    """Test that a phrase split over two paragraphs is not found"""
+    for use_automaton in (True, False):
+        matcher = PhraseMatcher(["AS IS"], use_automaton=use_automaton)
+        assert matcher.missing(["PROVIDED AS", "IS"]) == ["AS IS"], "Expected paragraphs to be searched separately"
+
+def test_all_problems_are_reported_together():
+    """Test that one check reports every missing section and phrase of a document, not just the first"""
+    spec = DocumentSpec(
+        "EULA",
+        title_phrases=["Agreement (EULA)"],
+        sections=["Introduction", "Disclaimers", "Warranty"],
+        phrases={("Introduction", 0): ["Jump IQ, Inc.", "Acme Corp"], "Disclaimers": ["AS IS", "AS WAS"]},
+        phrases_ignore_case={"Definitions": ["customer data", "reseller"], EVERY_PARAGRAPH: ["services"]},
+    )
+    problems = spec.check(DOCUMENTS["eula"])
+    assert problems[:4] == [
+        "missing section 'Warranty'",
+        "section 'Introduction' paragraph 0 is missing 'Acme Corp'",
+        "section 'Disclaimers' is missing 'AS WAS'",
+        "section 'Definitions' is missing 'reseller'",
+    ], f"Unexpected problems: {problems}"
+    assert "section 'Miscellaneous' paragraph 0 is missing 'services'" in problems, f"Unexpected problems: {problems}"
+
+    with pytest.raises(DocumentContentError, match=r"EULA: \d+ problem\(s\)"):
+        spec.validate(DOCUMENTS["eula"])
@@ -0,0 +1,32 @@
+import pytest
+from endpoints.registry import documents_by_section
+from config.settings import DOCUMENTS_AUTH_TOKEN
+from utils.schema_validator import validate_response
+
+@pytest.mark.api
+def test_get_all_document_sections(batch_requests):
+    """
+    Test that every document section can be fetched, sending all sections in one concurrent batch
+    """
+    endpoint = documents_by_section.url()
+    headers = {
+        "Authorization": DOCUMENTS_AUTH_TOKEN
+    }
+    expected_titles = {
+        "eula": "Agreement (EULA)",
+        "pp": "Privacy and policy",
+        "help": "HELP",
+        "tc": "Terms & Conditions"
+    }
+
+    responses = batch_requests([
+        {"method": "GET", "url": endpoint, "headers": headers, "params": {"section": section}}
+        for section in expected_titles
+    ], concurrency=len(expected_titles))
+
+    for (section, expected_title), response in zip(expected_titles.items(), responses):
+        assert response.status_code == 200, f"Failed to get {section} content"
+        data = response.json()
+        validate_response("documents_by_section", data)
+        assert expected_title in data["Title"], f"Incorrect title for {section}: {data['Title']}"
+        assert data["Sections"], f"Expected sections for {section}"
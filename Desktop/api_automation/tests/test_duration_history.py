@@ -0,0 +1,43 @@
+from utils.duration_history import DurationHistory, estimate_makespan, plan_work_units
+
+def make_history(tmp_path, tests):
+    """Helper function to build a history from {nodeid: (duration, fixtures)}"""
+    history = DurationHistory(str(tmp_path / "durations.json"))
+    for nodeid, (duration, fixtures) in tests.items():
+        history.update(nodeid, duration, fixtures=fixtures)
+    return history
+
+def test_history_is_smoothed_and_saved(tmp_path):
+    """Test that durations are averaged over runs and survive a save and load"""
+    history = make_history(tmp_path, {"t.py::a": (2.0, ["auth_provider"])})
+    history.update("t.py::a", 4.0, network=1.0, fixtures=["auth_provider"], endpoints=["/api/factor"])
+    history.save()
+
+    loaded = DurationHistory(history.path).load()
+    entry = loaded.tests["t.py::a"]
+    assert entry["duration"] == 3.0 and entry["runs"] == 2, f"Unexpected entry: {entry}"
+    assert loaded.resources("t.py::a") == ["auth_provider", "/api/factor"], f"Unexpected entry: {entry}"
+    assert loaded.cost("t.py::unknown") == 3.0, "Tests without history should cost the median"
+
+def test_units_are_longest_first_and_keep_fixture_users_together(tmp_path):
+    """Test that tests sharing a fixture form units no longer than an even share of the suite"""
+    tests = {f"t.py::auth{index}": (1.0, ["auth_provider"]) for index in range(6)}
+    tests.update({"t.py::slow": (5.0, []), "t.py::fast": (0.5, [])})
+    history = make_history(tmp_path, tests)
+
+    units = plan_work_units(list(tests), history, workers=3, affinity=["auth_provider"])
+    names = [name for name, _, _ in units]
+    assert names[0] == "t.py::slow" and names[-1] == "t.py::fast", f"Expected longest first, got {names}"
+    auth_units = [nodeids for name, nodeids, _ in units if name.startswith("shared:auth_provider")]
+    assert [len(nodeids) for nodeids in auth_units] == [3, 3], f"Unexpected auth units: {auth_units}"
+
+def test_lpt_beats_collection_order(tmp_path):
+    """Test that handing out the longest units first shortens the estimated makespan"""
+    tests = {f"t.py::short{index}": (1.0, []) for index in range(8)}
+    tests["t.py::long"] = (8.0, [])
+    history = make_history(tmp_path, tests)
+    in_order = [(nodeid, [nodeid], history.cost(nodeid)) for nodeid in tests]
+
+    lpt = estimate_makespan(plan_work_units(list(tests), history, workers=2, affinity=[]), workers=2)
+    assert lpt == 8.0, f"Expected the long test to run alongside all the others, got {lpt}"
+    assert estimate_makespan(in_order, workers=2) == 12.0, "Expected collection order to finish later"
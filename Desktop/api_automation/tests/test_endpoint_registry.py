@@ -0,0 +1,65 @@
+from urllib.parse import parse_qsl, urlsplit
+import pytest
+from config.settings import override_settings
+from endpoints.registry import ROUTES, Route, get_route, valuation_delete_route, valuation_list
+from endpoints.valuation_endpoints import get_valuation_endpoint, get_valuation_list_endpoint
+from utils.metrics import endpoint_template
+
+# Route with a typed path parameter, like the stub server's valuation delete route
+valuation = Route("valuation", "/api/valuation/{valuation_id:int}")
+
+def test_query_values_are_percent_encoded():
+    """Test that search text with spaces, "&", "=" and "#" stays one query parameter"""
+    query = "Estimate & Co = 100% #1"
+    url = get_valuation_list_endpoint(per_page=5, page_no=2, query=query, username="mohit")
+    parts = urlsplit(url)
+    assert parts.fragment == "", f"Expected no fragment in {url}"
+    assert parse_qsl(parts.query, keep_blank_values=True) == [
+        ("perPage", "5"), ("pageNo", "2"), ("q", query), ("username", "mohit")
+    ], f"Unexpected query in {url}"
+    assert valuation_list.url(base_url="http://stub:1/", per_page=None) == "http://stub:1/api/valuation", \
+        "Expected parameters set to None to be left out"
+
+def test_parameters_are_typed():
+    """Test that wrong types, unknown and missing parameters are rejected"""
+    assert valuation.url(base_url="http://stub:1", valuation_id="1012") == "http://stub:1/api/valuation/1012"
+    with pytest.raises(ValueError, match="per_page must be an int"):
+        valuation_list.url(per_page="ten")
+    with pytest.raises(ValueError, match="valuation_id must be an int"):
+        valuation.url(valuation_id="../factor")
+    with pytest.raises(TypeError, match="unknown parameters"):
+        valuation_list.url(perPage=10)
+    with pytest.raises(TypeError, match="missing path parameter"):
+        valuation.url()
+    with pytest.raises(KeyError, match="Unknown route"):
+        get_route("valuations")
+
+def test_cached_urls_do_not_skip_type_checks():
+    """Test that a value equal to a cached one (True == 1 == 1.0) is still checked against its type"""
+    assert valuation.url(base_url="http://stub:1", valuation_id=1) == "http://stub:1/api/valuation/1"
+    for value in (True, 1.0):
+        with pytest.raises(ValueError, match="valuation_id must be an int"):
+            valuation.url(base_url="http://stub:1", valuation_id=value)
+    assert valuation_list.url(base_url="http://stub:1", query=1) != valuation_list.url(base_url="http://stub:1", query=1.0), \
+        "Expected equal values of different types to get their own URLs"
+
+def test_route_keys_match_metrics():
+    """Test that every route's key is the endpoint name the request metrics use for its URLs"""
+    samples = {"valuation_id": 1012, "per_page": 10, "page_no": 1, "query": "", "username": "mohit",
+               "type": "StepsOptions", "section": "eula"}
+    for route in ROUTES.values():
+        params = {name: value for name, value in samples.items() if name in route._parameters}
+        url = route.url(**params)
+        assert endpoint_template(url) == route.key, f"{route.name}: {url} is grouped as {endpoint_template(url)}, not {route.key}"
+        assert route.url(**params) is url, f"{route.name}: expected the second URL to come from the cache"
+
+def test_valuation_delete_route_is_opt_in():
+    """Test that valuations have no delete URL until VALUATION_DELETE_PATH names the route"""
+    with override_settings(valuation_delete_path=""):
+        assert valuation_delete_route() is None, "Expected no delete route without VALUATION_DELETE_PATH"
+        with pytest.raises(KeyError, match="VALUATION_DELETE_PATH"):
+            get_valuation_endpoint(1012)
+    with override_settings(base_url="http://stub:1", valuation_delete_path="/api/valuations/{valuation_id:int}/remove"):
+        assert get_valuation_endpoint(1012) == "http://stub:1/api/valuations/1012/remove", "Expected the configured route"
+        assert "valuation" not in ROUTES or ROUTES["valuation"] is not valuation_delete_route(), \
+            "Expected the configured route to stay out of ROUTES"
@@ -1,15 +1,48 @@
 import pytest
-from config.settings import BASE_URL, AUTH_TOKEN
+from endpoints.registry import documents_by_section
+from config.settings import DOCUMENTS_AUTH_TOKEN
 from utils.request_handler import send_request
+from utils.schema_validator import validate_response
+from utils.retry_policy import NO_RETRIES
+from utils.document_validator import DocumentSpec
+
+EULA_SPEC = DocumentSpec(
+    "EULA",
+    # The title is checked without its apostrophe, whose type differs between environments
+    title_phrases=["End user", "Agreement (EULA)"],
+    sections=[
+        "Introduction",
+        "Definitions",
+        "Customer Responsibilities",
+        "Access and Use",
+        "Confidential Information",
+        "Intellectual Property Ownership; Feedback",
+        "Disclaimers",
+        "Indemnification",
+        "Limitations of Liability",
+        "Term and Termination",
+        "Miscellaneous"
+    ],
+    phrases={
+        ("Introduction", 0): ["Terms and Conditions", "Jump IQ, Inc."],
+        "Definitions": ["Aggregated Statistics", "Authorized User", "Customer Data", "Company IP"],
+        ("Disclaimers", 0): ["AS IS"],
+        ("Limitations of Liability", 0): ["IN NO EVENT", "USD 100"]
+    },
+    phrases_ignore_case={
+        "Access and Use": ["non-exclusive", "restrictions"],
+        ("Disclaimers", 0): ["warranties"]
+    }
+)
 
 def test_get_eula_content():
     """
     Test to validate the EULA content structure and key sections
     """
     # Set up endpoint and headers
-    endpoint = f"{BASE_URL}/api/get_documents_by_section"
+    endpoint = documents_by_section.url()
     headers = {
-        "Authorization": "kmuq8h4632zkos90deea0f71kxeyvx98j5r9ncdnqh09cjasw9sh5rkdakx2hrxh"  # Using the provided token
+        "Authorization": DOCUMENTS_AUTH_TOKEN
     }
     
     # Set up query parameters
@@ -30,75 +63,18 @@ def test_get_eula_content():
     data = response.json()
     
     # Validate main structure
-    assert "Title" in data, "Title field is missing"
-    assert "Sections" in data, "Sections field is missing"
+    validate_response("documents_by_section", data)
     
-    # Print actual title for debugging
-    print(f"Actual title: {data['Title']}")
-    print(f"Title characters: {[ord(c) for c in data['Title']]}")
-    
-    # Validate title by checking content without caring about apostrophe type
-    actual_title = data["Title"]
-    expected_title = "End user's Agreement (EULA)"  # Using the exact format from the API
-    assert "End user" in actual_title and "Agreement (EULA)" in actual_title, "Incorrect EULA title format"
-    
-    # Validate required sections
-    required_sections = [
-        "Introduction",
-        "Definitions",
-        "Customer Responsibilities",
-        "Access and Use",
-        "Confidential Information",
-        "Intellectual Property Ownership; Feedback",
-        "Disclaimers",
-        "Indemnification",
-        "Limitations of Liability",
-        "Term and Termination",
-        "Miscellaneous"
-    ]
-    
-    # Check all required sections exist
-    for section in required_sections:
-        assert section in data["Sections"], f"Missing required section: {section}"
-    
-    # Validate specific content in key sections
-    intro_content = data["Sections"]["Introduction"][0]
-    assert "Terms and Conditions" in intro_content, "Introduction missing key terms"
-    assert "Jump IQ, Inc." in intro_content, "Introduction missing company name"
-    
-    # Validate Definitions section
-    definitions = data["Sections"]["Definitions"]
-    required_definitions = [
-        "Aggregated Statistics",
-        "Authorized User",
-        "Customer Data",
-        "Company IP"
-    ]
-    for definition in required_definitions:
-        assert any(definition in d for d in definitions), f"Missing definition for: {definition}"
-    
-    # Validate Access and Use section
-    access_use = data["Sections"]["Access and Use"]
-    assert any("non-exclusive" in item.lower() for item in access_use), "Missing license terms"
-    assert any("restrictions" in item.lower() for item in access_use), "Missing use restrictions"
-    
-    # Validate Disclaimers section
-    disclaimers = data["Sections"]["Disclaimers"][0]
-    assert "AS IS" in disclaimers, "Missing AS IS disclaimer"
-    assert "warranties" in disclaimers.lower(), "Missing warranty disclaimer"
-    
-    # Validate Limitations of Liability section
-    liability = data["Sections"]["Limitations of Liability"][0]
-    assert "IN NO EVENT" in liability, "Missing liability limitation"
-    assert "USD 100" in liability, "Missing liability cap"
+    # Check the title, sections and key phrases, reporting everything that is missing at once
+    EULA_SPEC.validate(data)
 
 def test_eula_invalid_section():
     """
     Test handling of invalid section parameter
     """
-    endpoint = f"{BASE_URL}/api/get_documents_by_section"
+    endpoint = documents_by_section.url()
     headers = {
-        "Authorization": "kmuq8h4632zkos90deea0f71kxeyvx98j5r9ncdnqh09cjasw9sh5rkdakx2hrxh"  # Using the provided token
+        "Authorization": DOCUMENTS_AUTH_TOKEN
     }
     
     # Test with invalid section
@@ -118,30 +94,33 @@ def test_eula_invalid_section():
     data = response.json()
     assert not data["Sections"], "Expected empty sections for invalid section"
 
+@pytest.mark.no_response_cache
 def test_eula_missing_auth():
     """
     Test handling of missing authorization
     """
-    endpoint = f"{BASE_URL}/api/get_documents_by_section"
+    endpoint = documents_by_section.url()
     params = {
         "section": "eula"
     }
     
-    # Send request without auth header
+    # Send request without auth header, once, since the 500 is expected
     response = send_request(
         "GET",
         endpoint,
-        params=params
+        params=params,
+        retry_policy=NO_RETRIES
     )
     
     # The API returns 500 for missing auth
     assert response.status_code == 500, "Expected 500 for missing authorization"
 
+@pytest.mark.no_response_cache
 def test_eula_invalid_auth():
     """
     Test handling of invalid authorization token
     """
-    endpoint = f"{BASE_URL}/api/get_documents_by_section"
+    endpoint = documents_by_section.url()
     headers = {
         "Authorization": "invalid_token"
     }
@@ -0,0 +1,48 @@
+import gzip
+import json
+from utils.event_log import EventLog, aggregate, main
+from utils.metrics import RequestRecord
+
+def make_record(endpoint="/api/factor", status=200, total_ms=10.0, retries=0):
+    """Helper function to build a record like send_request passes to listeners"""
+    return RequestRecord(method="GET", url=f"https://host{endpoint}", endpoint=endpoint, status=status,
+                         test_id="tests/test_x.py::test_x", total_ms=total_ms, response_bytes=100, retries=retries)
+
+def test_events_are_written_in_batches(tmp_path):
+    """Test that events stay buffered until a batch is full or the log is closed"""
+    path = tmp_path / "events.jsonl"
+    event_log = EventLog(str(path), batch_size=3, flush_seconds=60)
+    event_log.record(make_record())
+    event_log.record(make_record())
+    assert not path.exists(), "Expected events to be buffered"
+
+    event_log.record(make_record())
+    assert len(path.read_text().splitlines()) == 3, "Expected a full batch to be written"
+
+    event_log.record(make_record(status=503, retries=2))
+    event_log.close()
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(events) == 4, f"Expected 4 events after close, but got {len(events)}"
+    assert events[-1]["status"] == 503 and events[-1]["retries"] == 2, f"Unexpected event: {events[-1]}"
+    assert "url" not in events[-1], "Events should hold the URL template, not the full URL"
+
+def test_aggregate_plain_and_gzipped_files(tmp_path, capsys):
+    """Test per-endpoint totals and percentiles over several files, skipping bad lines"""
+    event_log = EventLog(str(tmp_path / "events_gw0.jsonl"))
+    for total_ms in range(1, 101):
+        event_log.record(make_record(total_ms=float(total_ms)))
+    event_log.close()
+    with gzip.open(tmp_path / "events_gw1.jsonl.gz", "wt") as gz_file:
+        gz_file.write('{"method":"GET","endpoint":"/api/valuation","status":500,"total_ms":5}\n{broken\n')
+
+    endpoints, bad_lines = aggregate([str(tmp_path)])
+    factor = endpoints["GET /api/factor"].to_dict()
+    assert factor["count"] == 100, f"Expected 100 factor events, but got {factor['count']}"
+    assert abs(factor["p50_ms"] - 50) <= 1.5, f"Expected p50 near 50 ms, but got {factor['p50_ms']}"
+    assert abs(factor["p99_ms"] - 99) <= 2.5, f"Expected p99 near 99 ms, but got {factor['p99_ms']}"
+    assert endpoints["GET /api/valuation"].errors == 1, "Expected the 500 to count as an error"
+    assert bad_lines == 1, f"Expected one unreadable line, but got {bad_lines}"
+
+    assert main([str(tmp_path), "--top", "1", "--sort", "count"]) == 0
+    output = capsys.readouterr().out
+    assert "GET /api/factor" in output and "/api/valuation" not in output, f"Unexpected output: {output}"
@@ -0,0 +1,52 @@
+from endpoints.registry import valuation_create
+import json
+from itertools import islice
+import pytest
+from data.factories import LoginFactory, ValuationFactory, VALUATION_REQUIRED_FIELDS
+from stub_server.server import StubConfig, StubServer
+from utils.request_handler import send_request
+
+STUB_TOKEN = "Token factories-token"
+
+def test_valuation_bodies_are_repeatable_and_unique():
+    """Test that the same seed gives the same bodies, each a valid payload with its own name"""
+    factory = ValuationFactory(seed=11)
+    bodies = list(factory.bodies(5000))
+    assert bodies == list(ValuationFactory(seed=11).bodies(5000)), "Expected the same bodies for the same seed"
+    assert bodies != list(ValuationFactory(seed=12).bodies(5000)), "Expected other bodies for another seed"
+
+    payloads = [json.loads(body) for body in bodies]
+    assert payloads[:50] == [factory.payload(index) for index in range(50)], "Bodies should match payload()"
+    assert len({payload["name"] for payload in payloads}) == 5000, "Expected every valuation name to be unique"
+    assert all(field in payloads[-1] for field in VALUATION_REQUIRED_FIELDS), f"Unexpected payload: {payloads[-1]}"
+
+def test_invalid_valuation_payloads_break_their_rule():
+    """Test that every invalid payload is missing exactly what its kind says"""
+    for kind, body in ValuationFactory(seed=11).stream(count=200, invalid_rate=1.0):
+        payload = json.loads(body)
+        if kind == "empty":
+            assert payload == {}, f"Expected an empty payload, got {payload}"
+        elif kind.startswith("missing_"):
+            assert kind[len("missing_"):] not in payload, f"{kind} payload still has the field: {payload}"
+
+def test_login_bodies_are_unique():
+    """Test that well-formed login bodies have a unique username and a password"""
+    payloads = [json.loads(body) for body in LoginFactory(seed=11).bodies(1000)]
+    assert len({payload["username"] for payload in payloads}) == 1000, "Expected every username to be unique"
+    assert all(payload["password"] for payload in payloads), "Expected every payload to have a password"
+
+@pytest.mark.api
+def test_stub_accepts_only_valid_valuation_payloads():
+    """Test generated payloads against the stub: valid ones are created, ones missing fields are rejected"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN])).start()
+    headers = {"Authorization": STUB_TOKEN, "Content-Type": "application/json"}
+    kinds = ("empty", *(f"missing_{field}" for field in VALUATION_REQUIRED_FIELDS))
+    try:
+        for kind, body in islice(ValuationFactory(seed=11).stream(invalid_rate=0.5, kinds=kinds), 40):
+            response = send_request("POST", valuation_create.url(base_url=server.url), data=body, headers=headers)
+            if kind is None:
+                assert response.status_code == 200, f"Expected a valid payload to be created, got {response.text}"
+            else:
+                assert response.status_code in (400, 408), f"Expected {kind} to be rejected, got {response.status_code}"
+    finally:
+        server.stop()
@@ -1,95 +1,61 @@
 import pytest
-from config.settings import BASE_URL, AUTH_TOKEN
+from endpoints.registry import factor_list
 from utils.request_handler import send_request
+from utils.json_stream import stream_results
+from utils.paginator import Paginator
+from utils.schema_validator import item_validator, validate_response
 
-def test_get_factors():
+# Factor fields that change between runs (the schema still requires them)
+UNCHECKED_FACTOR_FIELDS = ["results[*].createdOn"]
+
+def test_get_factors(auth_provider, snapshot):
     """
     Test to validate the Factors API response structure and content
     """
-    endpoint = f"{BASE_URL}/api/factor"
-    headers = {
-        "Authorization": AUTH_TOKEN
-    }
+    endpoint = factor_list.url()
 
     response = send_request(
         "GET",
         endpoint,
-        headers=headers
+        auth=auth_provider
     )
 
     # Verify response status
     assert response.status_code == 200, "Failed to get factors"
     data = response.json()
     
-    # Validate main structure
-    assert "total" in data, "Missing 'total' field"
-    assert "pageNo" in data, "Missing 'pageNo' field"
-    assert "perPage" in data, "Missing 'perPage' field"
-    assert "pages" in data, "Missing 'pages' field"
-    assert "results" in data, "Missing 'results' field"
-    
-    # Validate pagination fields
-    assert isinstance(data["total"], int), "Total should be an integer"
-    assert isinstance(data["pageNo"], int), "Page number should be an integer"
-    assert isinstance(data["perPage"], int), "Per page should be an integer"
-    assert isinstance(data["pages"], int), "Pages should be an integer"
-    
-    # Validate results is a list
-    assert isinstance(data["results"], list), "Results should be a list"
-    
-    # Validate each factor in results
-    for factor in data["results"]:
-        # Check required fields
-        assert "id" in factor, "Factor missing 'id' field"
-        assert "name" in factor, "Factor missing 'name' field"
-        assert "kpi__name" in factor, "Factor missing 'kpi__name' field"
-        assert "factortype__name" in factor, "Factor missing 'factortype__name' field"
-        assert "active" in factor, "Factor missing 'active' field"
-        assert "createdOn" in factor, "Factor missing 'createdOn' field"
-        assert "weight" in factor, "Factor missing 'weight' field"
-        
-        # Validate field types
-        assert isinstance(factor["id"], int), "Factor id should be an integer"
-        assert isinstance(factor["name"], str), "Factor name should be a string"
-        assert isinstance(factor["active"], bool), "Active should be a boolean"
-        assert isinstance(factor["weight"], list), "Weight should be a list"
-        
-        # Validate weight structure
-        for weight_item in factor["weight"]:
-            assert "weight_name" in weight_item, "Weight missing 'weight_name' field"
-            assert "weight_value" in weight_item, "Weight missing 'weight_value' field"
-            assert "metric_id" in weight_item, "Weight missing 'metric_id' field"
-    
-    # Validate specific factors exist
-    expected_factors = {
-        4: "Profitability % of Revenue",
-        33: "F&I (per car) Used",
-        43: "PVR (per car) Used",
-        54: "",
-        56: "Financials Test",
-        115: "PVR (New & Used)",
-        116: "F&I (New & Used)",
-        141: "PVR New",
-        142: "F&I New",
-        149: "testing"
-    }
-    
-    # Create a dictionary of actual factors for easier lookup
-    actual_factors = {factor["id"]: factor["name"] for factor in data["results"]}
-    
-    # Validate all expected factors exist with correct names
-    for factor_id, expected_name in expected_factors.items():
-        assert factor_id in actual_factors, f"Factor with id {factor_id} is missing"
-        assert actual_factors[factor_id] == expected_name, f"Factor {factor_id} name mismatch. Expected: {expected_name}, Got: {actual_factors[factor_id]}"
-    
-    # Validate no unexpected factors exist
-    for factor_id in actual_factors:
-        assert factor_id in expected_factors, f"Unexpected factor id found: {factor_id}"
-    
-    # Validate pagination values
-    assert data["total"] == 15, "Incorrect total count"
-    assert data["pageNo"] == 1, "Incorrect page number"
-    assert data["perPage"] == 10, "Incorrect items per page"
-    assert data["pages"] == 2, "Incorrect total pages"
+    # Validate the response envelope and every factor with its weights
+    validate_response("factor_list", data)
     
-    
\ No newline at end of file
+    # Compare the first page with the stored snapshot; the order of the factors was never part of the contract
+    page = dict(data, results=sorted(data["results"], key=lambda factor: factor["id"]))
+    snapshot.assert_match(page, ignore=UNCHECKED_FACTOR_FIELDS)
+
+
+@pytest.mark.api
+def test_get_all_factor_pages(auth_provider):
+    """
+    Test that crawling every page of the Factors API returns each factor once
+    """
+    factors = Paginator(factor_list.url(), per_page=10, prefetch=2, schema="factor_list",
+                        auth=auth_provider)
+    ids = [factor["id"] for factor in factors]
+
+    assert factors.total == 15, f"Expected total to be 15, but got {factors.total}"
+    assert factors.page_count == 2, f"Expected 2 pages, but got {factors.page_count}"
+    assert len(ids) == factors.total, f"Expected {factors.total} factors over all pages, but got {len(ids)}"
+    assert len(set(ids)) == len(ids), f"Factors repeated across pages: {ids}"
+    assert all(isinstance(factor_id, int) for factor_id in ids), "Factor ids should be integers"
+
+def test_stream_factors_in_one_page(auth_provider):
+    """
+    Test requesting every factor in one large page, checking each row while the body downloads
+    """
+    factors = stream_results("GET", factor_list.url(), params={"perPage": 1000},
+                             auth=auth_provider,
+                             validators=[item_validator("factor_list")])
+    ids = [factor["id"] for factor in factors]
+
+    assert factors.envelope["pages"] == 1, f"Expected 1 page, but got {factors.envelope['pages']}"
+    assert len(ids) == factors.envelope["total"], f"Expected {factors.envelope['total']} factors, but got {len(ids)}"
+    assert len(set(ids)) == len(ids), f"Factors repeated in the page: {ids}"
@@ -0,0 +1,72 @@
+import io
+import pytest
+from endpoints.registry import dealer_radius_factor, valuation_list
+from requests import Response
+from stub_server.server import StubConfig, StubServer
+from utils.json_stream import JsonStreamError, ResultStream, stream_results
+from utils.request_handler import send_request
+from utils.schema_validator import item_validator
+
+STUB_TOKEN = "Token json-stream-token"
+
+@pytest.fixture(scope="module")
+def stub_url():
+    """Stub server with 12 valuations for user mohit"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN])).start()
+    yield server.url
+    server.stop()
+
+def make_response(body):
+    """Helper function to build a streamed response from raw bytes"""
+    response = Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    response.encoding = "utf-8"
+    return response
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_streamed_items_match_full_parse(stub_url, chunk_size):
+    """Test that streaming a page gives the same items and envelope as response.json()"""
+    url = valuation_list.url(base_url=stub_url)
+    kwargs = {"params": {"username": "mohit", "perPage": 20}, "headers": {"Authorization": STUB_TOKEN}}
+    expected = send_request("GET", url, **kwargs).json()
+
+    results = stream_results("GET", url, validators=[item_validator("valuation_list")], chunk_size=chunk_size, **kwargs)
+    items = list(results)
+    assert items == expected["results"], "Expected the streamed items to match the parsed body"
+    assert results.count == 12, f"Expected 12 items, but got {results.count}"
+    assert results.envelope == {key: value for key, value in expected.items() if key != "results"}, \
+        f"Unexpected envelope: {results.envelope}"
+
+def test_top_level_list(stub_url):
+    """Test streaming an endpoint whose body is a list"""
+    results = stream_results("GET", dealer_radius_factor.url(base_url=stub_url), key=None, chunk_size=4,
+                             params={"type": "StepsOptions"}, headers={"Authorization": STUB_TOKEN},
+                             validators=[item_validator("dealer_radius_factor")])
+    steps = list(results)
+    assert steps[:3] == [1, 2, 3] and steps[-1] == 100, f"Unexpected steps: {steps}"
+
+def test_validator_stops_at_first_bad_row():
+    """Test that the first failing item stops the stream and its index is reported"""
+    body = b'{"total": 4, "results": [{"id": 1}, {"id": 2}, {"id": -3}, {"id": 4}]}'
+
+    def positive_id(item):
+        assert item["id"] > 0, f"id {item['id']} is not positive"
+
+    results = ResultStream(make_response(body), validators=[positive_id], chunk_size=8)
+    seen = []
+    with pytest.raises(AssertionError, match=r"results\[2\]: id -3 is not positive"):
+        for item in results:
+            seen.append(item["id"])
+    assert seen == [1, 2], f"Expected only the rows before the bad one, but got {seen}"
+
+@pytest.mark.parametrize("body, message", [
+    (b'{"total": 1}', "no 'results' list"),
+    (b'{"results": 5}', "not a list"),
+    (b'{"results": [1, 2', "end of body"),
+    (b'{"results": [1} ', "Expected one of"),
+])
+def test_malformed_bodies(body, message):
+    """Test that bodies without a well-formed results list raise JsonStreamError"""
+    with pytest.raises(JsonStreamError, match=message):
+        list(ResultStream(make_response(body), chunk_size=3))
@@ -0,0 +1,75 @@
+import pytest
+from endpoints.registry import dealer_radius_factor
+from stub_server.server import StubConfig, StubServer
+from utils.latency import check_latency_budget, format_histogram, measure_latency
+
+STUB_TOKEN = "Token latency-token"
+
+pytestmark = pytest.mark.no_response_cache
+
+@pytest.fixture(scope="module")
+def stub():
+    """Stub server whose latency is measured"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN])).start()
+    yield server
+    server.stop()
+
+def captured_steps(stub, params):
+    """Helper function to build what capture_requests() records for a dealer radius steps request"""
+    return [("GET", dealer_radius_factor.url(base_url=stub.url),
+             {"headers": {"Authorization": STUB_TOKEN}, "params": params})]
+
+def test_histogram_counts_timings_per_bucket():
+    """Test that each timing is counted in its bucket and bars are scaled to the largest bucket"""
+    lines = format_histogram([1.0, 1.0, 2.0, 10.0], buckets=3, width=4)
+    assert lines == [
+        "      1.0 -       4.0 ms | #### 3",
+        "      4.0 -       7.0 ms |  0",
+        "      7.0 -      10.0 ms | # 1",
+    ], f"Unexpected histogram: {lines}"
+    assert format_histogram([]) == [], "Expected no lines without timings"
+
+def test_budgets_are_checked_for_dict_and_list_params(stub):
+    """Test that params given as a dict or as (name, value) pairs are measured once each and compared"""
+    captured = captured_steps(stub, {"type": "StepsOptions"}) + captured_steps(stub, [("type", "StepsOptions")])
+    requests_before = stub.stats["requests"]
+    assert check_latency_budget(captured, samples=3, warmup=1, max_ms=10000) == [], "Expected the budget to be met"
+    assert stub.stats["requests"] - requests_before == 4, "Expected the two captured requests to be measured as one"
+
+    failures = check_latency_budget(captured_steps(stub, [("type", "StepsOptions")]), samples=3, warmup=0,
+                                    max_ms=0.001)
+    assert len(failures) == 1, f"Expected one failure, got {failures}"
+    assert failures[0].startswith("Latency budget exceeded for GET /api/dealer_radius_factor?type (3 samples"), \
+        f"Unexpected failure: {failures[0]}"
+    assert len(failures[0].splitlines()) == 11, f"Expected the failure to end with a histogram: {failures[0]}"
+
+@pytest.mark.parametrize("samples", [0, -1])
+def test_samples_below_one_are_rejected(stub, samples):
+    """Test that a latency check without samples fails with a clear error instead of a TypeError"""
+    with pytest.raises(ValueError, match="at least one sample"):
+        check_latency_budget(captured_steps(stub, None), samples=samples, p95_ms=300)
+    with pytest.raises(ValueError, match="at least one sample"):
+        measure_latency("GET", dealer_radius_factor.url(base_url=stub.url), samples=samples)
+
+def test_latency_marker_fails_tests_over_budget(run_suite):
+    """Test that the latency marker passes a test within budget and fails one over it with a histogram"""
+    result = run_suite("""
+        import pytest
+        from endpoints.registry import dealer_radius_factor
+        from utils.request_handler import send_request
+
+        def get_steps(auth_provider):
+            return send_request("GET", dealer_radius_factor.url(), params={"type": "StepsOptions"}, auth=auth_provider)
+
+        @pytest.mark.latency(p95_ms=10000, samples=3, warmup=0)
+        def test_within_budget(auth_provider):
+            assert get_steps(auth_provider).status_code == 200
+
+        @pytest.mark.latency(max_ms=0.001, samples=3, warmup=0)
+        def test_over_budget(auth_provider):
+            assert get_steps(auth_provider).status_code == 200
+    """)
+    assert "1 failed, 1 passed" in result.stdout, f"Unexpected result:\n{result.stdout}\n{result.stderr}"
+    assert "Latency budget exceeded for GET /api/dealer_radius_factor?type" in result.stdout, \
+        f"Expected the budget failure in the output:\n{result.stdout}"
+    assert " ms | #" in result.stdout, f"Expected a histogram in the output:\n{result.stdout}"
@@ -0,0 +1,90 @@
+import http.server
+import json
+import threading
+import pytest
+from config.settings import override_settings
+from load.runner import LoadRunner
+from load.scenarios import get_scenarios, get_default_scenarios
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Answers every GET with an empty JSON object and every POST with a 500"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # "<method> <path>" of every request received
+    requests = []
+
+    def _reply(self, status_code):
+        body = json.dumps({}).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StubHandler.requests.append(f"GET {self.path.split('?')[0]}")
+        self._reply(200)
+
+    def do_POST(self):
+        StubHandler.requests.append(f"POST {self.path.split('?')[0]}")
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(500)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def stub_url():
+    """Local HTTP server for load runner tests"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+def test_default_scenarios_do_not_create_data():
+    """Test that the default load mix never creates valuations"""
+    names = [scenario.name for scenario in get_default_scenarios()]
+    assert "create_valuation" not in names, "create_valuation should only run when chosen"
+    assert "valuation_list" in names and "document_eula" in names, f"Unexpected default scenarios: {names}"
+
+def test_closed_model_against_stub(stub_url):
+    """Test sending requests back to back with a fixed concurrency"""
+    scenarios = [scenario for scenario in get_default_scenarios() if scenario.request["method"] == "GET"]
+    runner = LoadRunner(scenarios, duration=1, concurrency=4, interval=0.5, base_url=stub_url, seed=1,
+                        validate=False)
+    report = runner.run()
+    assert report["total"]["requests"] > 0, "Expected requests to be sent"
+    assert report["total"]["error_rate"] == 0, f"Expected no errors, but got {report['status_counts']}"
+    assert set(report["status_counts"]) == {"200"}, f"Unexpected statuses: {report['status_counts']}"
+    assert len(report["windows"]) >= 2, "Expected a report row per window"
+
+def test_open_model_reports_errors(stub_url):
+    """Test sending requests at a target rate and counting server errors"""
+    scenarios = get_scenarios()
+    runner = LoadRunner([scenarios["factors"], scenarios["login"]], duration=1, rps=40, concurrency=4,
+                        base_url=stub_url, seed=1, validate=False)
+    report = runner.run()
+    total = report["total"]
+    assert 30 <= total["requests"] + report["dropped"] <= 41, f"Expected about 40 requests, got {total['requests']}"
+    assert 0 < total["error_rate"] < 1, f"Expected login requests to fail, but error rate was {total['error_rate']}"
+    assert total["p50_ms"] is not None, "Expected latency percentiles"
+
+def test_schema_mismatches_count_as_errors(stub_url):
+    """Test that 200 responses not matching the scenario schema are reported as errors"""
+    runner = LoadRunner([get_scenarios()["factors"]], duration=0.5, concurrency=2, base_url=stub_url, seed=1)
+    report = runner.run()
+    assert report["total"]["error_rate"] == 1, f"Expected every response to fail validation, got {report['status_counts']}"
+    assert set(report["status_counts"]) == {"ResponseSchemaError"}, f"Unexpected statuses: {report['status_counts']}"
+
+def test_scenarios_log_in_when_sending_to_the_run_base_url(stub_url):
+    """Test that listing and building scenarios sends nothing, and the login goes to the load run's base URL"""
+    StubHandler.requests.clear()
+    with override_settings(auth_username="user", auth_password="secret"):
+        scenario = get_scenarios()["factors"]
+        assert "Authorization" not in scenario.build(stub_url).get("headers", {}), "Expected no token in the headers"
+        assert StubHandler.requests == [], f"Expected no request before the run, got {StubHandler.requests}"
+
+        report = LoadRunner([scenario], duration=0.2, concurrency=1, base_url=stub_url, seed=1, validate=False).run()
+    assert StubHandler.requests and set(StubHandler.requests) == {"POST /api/auth/user/login"}, \
+        f"Expected only logins at the run's base URL, got {set(StubHandler.requests)}"
+    assert report["total"]["error_rate"] == 1, "Expected the requests to fail with the login"
@@ -0,0 +1,22 @@
+import json
+import logging
+from utils.logger import RUN_TIMESTAMP_VAR, JsonLinesFormatter, RecordQueueHandler, log_file_path
+
+def test_worker_log_file_name(monkeypatch):
+    """Test that xdist workers get their own log file with the run timestamp"""
+    monkeypatch.setenv(RUN_TIMESTAMP_VAR, "2025-04-25_12-39-39")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    path = log_file_path()
+    assert path.endswith("test_log_2025-04-25_12-39-39_gw3.log"), f"Unexpected log file: {path}"
+
+    monkeypatch.delenv("PYTEST_XDIST_WORKER")
+    path = log_file_path()
+    assert path.endswith("test_log_2025-04-25_12-39-39.log"), f"Unexpected log file: {path}"
+
+def test_queued_record_formats_as_json_line():
+    """Test that a record taken off the queue is written as one JSON object"""
+    record = logging.LogRecord("root", logging.INFO, __file__, 1, "Sending %s request", ("GET",), None)
+    record = RecordQueueHandler(None).prepare(record)
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert entry["message"] == "Sending GET request", f"Unexpected message: {entry}"
+    assert entry["level"] == "INFO", f"Unexpected level: {entry}"
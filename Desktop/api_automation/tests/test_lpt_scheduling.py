@@ -0,0 +1,37 @@
+import json
+
+def test_lpt_scheduler_runs_the_longest_test_first_under_xdist(run_suite, tmp_path):
+    """Test that -n 2 runs every test once through LPTScheduling, starting the test recorded as longest"""
+    durations = {f"test_generated.py::test_short[{index}]": {"duration": 0.1, "network": 0.0, "runs": 1}
+                 for index in range(4)}
+    durations["test_generated.py::test_long"] = {"duration": 5.0, "network": 0.0, "runs": 1}
+    (tmp_path / "durations.json").write_text(json.dumps(durations))
+
+    # The long test comes last in collection order, where the plain xdist scheduler would start it last
+    result = run_suite("""
+        import os
+        import time
+
+        import pytest
+
+        def record_start(name):
+            with open("started.txt", "a") as started:
+                started.write(f"{name} {os.environ['PYTEST_XDIST_WORKER']}\\n")
+
+        @pytest.mark.parametrize("index", range(4), ids=lambda index: str(index))
+        def test_short(index):
+            record_start(f"test_short{index}")
+            time.sleep(0.05)
+
+        def test_long():
+            record_start("test_long")
+            time.sleep(0.5)
+    """, "-n", "2", "--schedule", "lpt", "--durations-file", "durations.json")
+    assert "5 passed" in result.stdout, f"Unexpected result:\n{result.stdout}\n{result.stderr}"
+
+    started = [line.split() for line in (tmp_path / "started.txt").read_text().splitlines()]
+    names = [name for name, _ in started]
+    assert sorted(names) == ["test_long"] + [f"test_short{index}" for index in range(4)], \
+        f"Expected every test to run once: {names}"
+    assert "test_long" in names[:2], f"Expected the longest test to be handed out first: {names}"
+    assert {worker for _, worker in started} == {"gw0", "gw1"}, f"Expected both workers to run tests: {started}"
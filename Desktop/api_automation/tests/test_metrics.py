@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from utils.metrics import MetricsCollector, RequestRecord, endpoint_template, percentile
+
+def make_collector(*timings, endpoint="/api/valuation/{id}", **fields):
+    """Helper function to build a collector with one GET record per timing"""
+    collector = MetricsCollector()
+    for total_ms in timings:
+        collector.record(RequestRecord("GET", f"https://host{endpoint}", endpoint, total_ms=total_ms, **fields))
+    return collector
+
+@pytest.mark.parametrize("url, params, expected", [
+    ("https://host/api/valuation?perPage=10&pageNo=1", None, "/api/valuation?perPage&pageNo"),
+    ("https://host/api/valuation/1012", None, "/api/valuation/{id}"),
+    ("https://host/api/valuation/1012/documents/7", None, "/api/valuation/{id}/documents/{id}"),
+    ("https://host/api/valuation/v2", None, "/api/valuation/v2"),
+    ("https://host/api/factor?perPage=5", {"pageNo": 2, "perPage": 5}, "/api/factor?perPage&pageNo"),
+    ("https://host/api/factor", [("type", "a"), ("type", "b")], "/api/factor?type"),
+    ("https://host", None, "/"),
+])
+def test_endpoint_template_groups_ids_and_keeps_parameter_names(url, params, expected):
+    """Test that ids become {id}, query values are dropped and repeated parameter names are kept once"""
+    assert endpoint_template(url, params) == expected, f"Unexpected template for {url} {params}"
+
+def test_percentile_interpolates_between_ranks():
+    """Test percentiles of sorted values, between and at ranks"""
+    values = [10.0, 20.0, 30.0, 40.0, 50.0]
+    assert percentile(values, 50) == 30.0, "Expected the median to be the middle value"
+    assert percentile(values, 90) == pytest.approx(46.0), "Expected p90 to lie 60% of the way from 40 to 50"
+    assert percentile(values, 25) == 20.0, "Expected p25 to fall on the second value"
+    assert (percentile(values, 0), percentile(values, 100)) == (10.0, 50.0), "Expected p0 and p100 at the ends"
+    assert percentile([7.0], 99) == 7.0, "Expected a single value for every percentile"
+    assert percentile([], 50) is None, "Expected no percentile without values"
+
+def test_worker_records_are_merged_into_the_summary():
+    """Test that records sent by xdist workers as JSON are summarised together with the controller's"""
+    controller = make_collector(10.0, 20.0)
+    workers = [make_collector(30.0, retries=1), make_collector(40.0, 50.0, status=503)]
+    for worker in workers:
+        # workeroutput reaches the controller serialised
+        controller.merge(json.loads(json.dumps(worker.to_list())))
+
+    stats = controller.summary()["GET /api/valuation/{id}"]
+    assert stats["count"] == 5, f"Expected the records of all processes, got {stats}"
+    assert (stats["p50_ms"], stats["p90_ms"], stats["max_ms"]) == (30.0, 46.0, 50.0), f"Unexpected latency: {stats}"
+    assert (stats["errors"], stats["retries"]) == (2, 1), f"Unexpected errors and retries: {stats}"
+    assert all(isinstance(record, RequestRecord) for record in controller.records), "Expected merged RequestRecords"
@@ -0,0 +1,39 @@
+import pytest
+from endpoints.registry import dealer_radius_factor, valuation_list
+from stub_server.server import StubConfig, StubServer
+from utils.paginator import Paginator, PaginationError
+
+STUB_TOKEN = "Token paginator-token"
+
+@pytest.fixture(scope="module")
+def stub_url():
+    """Stub server with 12 valuations for user mohit"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN])).start()
+    yield server.url
+    server.stop()
+
+def make_paginator(stub_url, **kwargs):
+    """Helper function to page through mohit's valuations two at a time"""
+    return Paginator(valuation_list.url(base_url=stub_url), per_page=2, params={"username": "mohit"},
+                     headers={"Authorization": STUB_TOKEN}, **kwargs)
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_yields_every_result_once(stub_url, prefetch):
+    """Test that all pages are crawled in order, with and without prefetching"""
+    valuations = make_paginator(stub_url, prefetch=prefetch)
+    ids = [valuation["id"] for valuation in valuations]
+    assert valuations.page_count == 6, f"Expected 6 pages, but got {valuations.page_count}"
+    assert ids == sorted(ids) and len(set(ids)) == 12, f"Expected 12 valuations in order, but got {ids}"
+    assert valuations.pages_fetched == 6, f"Expected 6 page requests, but got {valuations.pages_fetched}"
+
+def test_stops_when_predicate_matches(stub_url):
+    """Test that paging stops at the first match and later pages are not all requested"""
+    valuations = make_paginator(stub_url, prefetch=1, stop_when=lambda valuation: valuation["id"] == 1002)
+    ids = [valuation["id"] for valuation in valuations]
+    assert ids == [1000, 1001, 1002], f"Expected to stop at valuation 1002, but got {ids}"
+    assert valuations.pages_fetched <= 3, f"Expected at most 3 page requests, but got {valuations.pages_fetched}"
+
+def test_rejects_responses_without_envelope(stub_url):
+    """Test that an endpoint without the paginated envelope raises a clear error"""
+    with pytest.raises(PaginationError, match="missing"):
+        list(Paginator(dealer_radius_factor.url(base_url=stub_url), headers={"Authorization": STUB_TOKEN}))
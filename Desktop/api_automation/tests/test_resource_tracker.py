@@ -0,0 +1,83 @@
+import pytest
+from endpoints.registry import Route, valuation_create, valuation_list
+from data.factories import ValuationFactory
+from stub_server.server import StubConfig, StubServer
+from utils.request_handler import enable_resource_tracking, get_resource_tracker, send_request
+from utils.resource_tracker import ResourceTracker, TrackedEndpoint
+
+STUB_TOKEN = "Token resource-tracker-token"
+
+# Delete route of the stub server; the real API documents none
+valuation = Route("valuation", "/api/valuation/{valuation_id:int}")
+
+@pytest.fixture(scope="module")
+def stub():
+    """Stub server the tracked valuations are created on"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN])).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def tracker(stub):
+    """Resource tracker used by send_request for one test, tracking valuations created on the stub"""
+    previous = get_resource_tracker()
+    endpoint = TrackedEndpoint(valuation_create.url(base_url=stub.url), "Valuation_id",
+                               lambda valuation_id: valuation.url(base_url=stub.url, valuation_id=valuation_id))
+    tracker = ResourceTracker([endpoint], batch_size=3, concurrency=2, retries=1, retry_delay=0)
+    enable_resource_tracking(tracker)
+    yield tracker
+    enable_resource_tracking(previous)
+
+def create_valuations(stub, count):
+    """Helper function to create valuations on the stub and return their ids"""
+    headers = {"Authorization": STUB_TOKEN, "Content-Type": "application/json"}
+    responses = [send_request("POST", valuation_create.url(base_url=stub.url, username="mohit"), data=body, headers=headers)
+                 for body in ValuationFactory(seed=19).bodies(count)]
+    return [response.json()["Valuation_id"] for response in responses]
+
+def count_valuations(stub):
+    """Helper function to get the number of valuations on the stub"""
+    response = send_request("GET", valuation_list.url(base_url=stub.url), headers={"Authorization": STUB_TOKEN})
+    return response.json()["total"]
+
+def test_created_valuations_are_deleted(stub, tracker):
+    """Test that every valuation created through send_request is deleted by cleanup, in batches"""
+    valuations_before = count_valuations(stub)
+    ids = create_valuations(stub, 7)
+    # Failed creates and other endpoints are not tracked
+    send_request("POST", valuation_create.url(base_url=stub.url), json={"name": "incomplete"}, headers={"Authorization": STUB_TOKEN})
+    assert [resource.resource_id for resource in tracker._resources] == ids, "Expected every created id to be tracked"
+
+    report = tracker.cleanup()
+    assert report["deleted"] == 7 and report["failed"] == 0, f"Unexpected cleanup report: {report}"
+    assert count_valuations(stub) == valuations_before, "Expected the created valuations to be gone"
+    assert tracker.cleanup()["tracked"] == 0, "Expected nothing left to delete after cleanup"
+
+def test_failed_deletes_are_retried_and_reported(stub, tracker):
+    """Test that deletes that keep failing are tried again and reported, and missing ones count as gone"""
+    endpoint = next(iter(tracker.endpoints.values()))
+    # A 404 to the first delete only means that valuation is gone; the others are still deleted
+    tracker.add(endpoint, 999999, authorization=STUB_TOKEN)
+    create_valuations(stub, 1)
+    tracker.add(endpoint, 1000, authorization="Token revoked-token")
+    requests_before = stub.stats["requests"]
+
+    report = tracker.cleanup()
+    assert (report["deleted"], report["already_gone"], report["failed"]) == (1, 1, 1), f"Unexpected cleanup report: {report}"
+    assert stub.stats["requests"] - requests_before == 4, "Expected the failed delete to be sent twice"
+    assert report["failures"][0].startswith("Valuation_id=1000: status code 401"), f"Unexpected failures: {report['failures']}"
+
+@pytest.mark.parametrize("delete_path", ["/api/factor?id={}", "/api/valuations/{}/remove"])
+def test_missing_delete_route_is_reported_not_counted_as_gone(stub, tracker, delete_path):
+    """Test that a 405, or the web app page, is reported as a missing route, sent once per resource and not retried"""
+    endpoint = TrackedEndpoint(valuation_create.url(base_url=stub.url), "Valuation_id",
+                               lambda valuation_id: stub.url + delete_path.format(valuation_id))
+    for valuation_id in (1000, 1001, 1002):
+        tracker.add(endpoint, valuation_id, authorization=STUB_TOKEN)
+    requests_before = stub.stats["requests"]
+
+    report = tracker.cleanup()
+    assert (report["deleted"], report["already_gone"], report["failed"]) == (0, 0, 3), f"Unexpected cleanup report: {report}"
+    assert stub.stats["requests"] - requests_before == 3, "Expected every delete to be sent once"
+    assert all("delete route unsupported" in failure for failure in report["failures"]), \
+        f"Unexpected failures: {report['failures']}"
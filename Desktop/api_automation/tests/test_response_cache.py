@@ -0,0 +1,83 @@
+import pytest
+from endpoints.registry import dealer_radius_factor, factor_list, valuation_list
+from stub_server.server import StubConfig, StubServer
+from utils.auth import AuthProvider
+from utils.request_handler import enable_response_cache, get_response_cache, send_request
+from utils.response_cache import ResponseCache
+
+STUB_TOKEN = "Token response-cache-token"
+OTHER_TOKEN = "Token other-user-token"
+
+pytestmark = pytest.mark.no_response_cache
+
+@pytest.fixture(scope="module")
+def stub():
+    """Stub server that accepts two tokens"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN, OTHER_TOKEN])).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def cache():
+    """Response cache used by send_request for one test"""
+    previous = get_response_cache()
+    cache = ResponseCache(ttl=60, max_entries=2, endpoints=["/api/dealer_radius_factor", "/api/factor"])
+    enable_response_cache(cache)
+    yield cache
+    enable_response_cache(previous)
+
+def get_steps(stub, token=STUB_TOKEN, **kwargs):
+    """Helper function to fetch the dealer radius steps"""
+    return send_request("GET", dealer_radius_factor.url(base_url=stub.url), params={"type": "StepsOptions"},
+                        headers={"Authorization": token} if token else {}, **kwargs)
+
+def test_repeated_get_is_served_from_cache(stub, cache):
+    """Test that the second identical GET does not reach the server"""
+    requests_before = stub.stats["requests"]
+    first = get_steps(stub)
+    second = get_steps(stub)
+    assert stub.stats["requests"] - requests_before == 1, "Expected one request to reach the server"
+    assert second.json() == first.json(), "Expected the cached body to match"
+    assert getattr(second, "from_cache", False), "Expected the second response to come from the cache"
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1, f"Unexpected stats: {cache.stats}"
+
+def test_cache_is_keyed_by_auth_and_can_be_skipped(stub, cache):
+    """Test that another token, cache=False and non-cacheable endpoints always reach the server"""
+    requests_before = stub.stats["requests"]
+    get_steps(stub)
+    get_steps(stub, token=OTHER_TOKEN)
+    get_steps(stub, cache=False)
+    send_request("GET", valuation_list.url(base_url=stub.url), headers={"Authorization": STUB_TOKEN})
+    send_request("GET", valuation_list.url(base_url=stub.url), headers={"Authorization": STUB_TOKEN})
+    assert stub.stats["requests"] - requests_before == 5, "Expected every request to reach the server"
+    assert cache.stats["bypassed"] == 1, f"Unexpected stats: {cache.stats}"
+
+def test_cache_is_keyed_by_the_token_of_an_auth_provider(stub, cache):
+    """Test that a request sent with auth= shares entries with requests sending the same token only"""
+    requests_before = stub.stats["requests"]
+    get_steps(stub, token=None, auth=AuthProvider(static_token=OTHER_TOKEN))
+    provider = get_steps(stub, token=None, auth=AuthProvider(static_token=STUB_TOKEN))
+    header = get_steps(stub)
+    assert stub.stats["requests"] - requests_before == 2, "Expected one request per token to reach the server"
+    assert not getattr(provider, "from_cache", False), "Expected another token not to get the cached response"
+    assert getattr(header, "from_cache", False), "Expected the same token in a header to get the cached response"
+
+def test_stale_entry_is_revalidated_with_etag(stub, cache):
+    """Test that an expired entry is refreshed by a 304 answer instead of a new body"""
+    cache.ttl = 0
+    not_modified_before = stub.stats["not_modified"]
+    first = get_steps(stub)
+    second = get_steps(stub)
+    assert stub.stats["not_modified"] - not_modified_before == 1, "Expected the server to answer 304"
+    assert second.status_code == 200 and second.json() == first.json(), "Expected the cached response back"
+    assert cache.stats["revalidated"] == 1, f"Unexpected stats: {cache.stats}"
+
+def test_least_recently_used_entry_is_evicted(stub, cache):
+    """Test that the cache keeps at most max_entries responses"""
+    get_steps(stub)
+    send_request("GET", factor_list.url(base_url=stub.url), headers={"Authorization": STUB_TOKEN})
+    get_steps(stub)
+    send_request("GET", factor_list.url(base_url=stub.url), params={"perPage": 5}, headers={"Authorization": STUB_TOKEN})
+    assert len(cache) == 2 and cache.stats["evictions"] == 1, f"Unexpected stats: {cache.stats}"
+    get_steps(stub)
+    assert cache.stats["hits"] == 2, "Expected the recently used steps response to be kept"
@@ -0,0 +1,76 @@
+import pytest
+import requests
+from utils.retry_policy import RetryPolicy, RetryBudget, parse_retry_after
+
+def make_response(status_code, headers=None):
+    """Helper function to build a response without sending a request"""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+def make_policy(**kwargs):
+    """Helper function to build a policy with its own budget so tests do not share state"""
+    kwargs.setdefault("budget", RetryBudget(ratio=0, min_retries=100, max_backoff_seconds=100))
+    return RetryPolicy(**kwargs)
+
+@pytest.mark.parametrize("status_code", [408, 429, 500, 502, 503, 504])
+def test_retries_retryable_status_for_get(status_code):
+    """Test that idempotent requests are retried on retryable status codes"""
+    policy = make_policy(backoff_base=1, backoff_max=4)
+    delay = policy.next_delay("GET", 1, response=make_response(status_code))
+    assert delay is not None, f"Expected GET with status {status_code} to be retried"
+    assert 0 <= delay <= 1, f"Expected first backoff between 0 and 1 s, but got {delay}"
+
+def test_does_not_retry_post_by_default():
+    """Test that non-idempotent requests are not retried on retryable status codes"""
+    policy = make_policy()
+    assert policy.next_delay("POST", 1, response=make_response(408)) is None, "POST should not be retried by default"
+
+def test_does_not_retry_success_or_client_error():
+    """Test that successful and client error responses are returned straight away"""
+    policy = make_policy()
+    assert policy.next_delay("GET", 1, response=make_response(200)) is None, "200 should not be retried"
+    assert policy.next_delay("GET", 1, response=make_response(401)) is None, "401 should not be retried"
+
+def test_stops_after_max_attempts():
+    """Test that the last attempt is never retried"""
+    policy = make_policy(max_attempts=3)
+    assert policy.next_delay("GET", 2, response=make_response(503)) is not None, "Second attempt should be retried"
+    assert policy.next_delay("GET", 3, response=make_response(503)) is None, "Third attempt should not be retried"
+
+def test_backoff_is_capped():
+    """Test that full-jitter backoff never goes over backoff_max"""
+    policy = make_policy(backoff_base=1, backoff_max=2)
+    assert all(policy.backoff(10) <= 2 for _ in range(100)), "Backoff went over backoff_max"
+
+def test_honours_retry_after():
+    """Test that Retry-After replaces the computed backoff"""
+    policy = make_policy(retry_after_max=10)
+    assert policy.next_delay("GET", 1, response=make_response(429, {"Retry-After": "3"})) == 3
+    assert policy.next_delay("GET", 1, response=make_response(429, {"Retry-After": "60"})) is None, \
+        "Retry-After longer than retry_after_max should not be retried"
+
+def test_parse_retry_after():
+    """Test parsing Retry-After as seconds and as an HTTP date"""
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0, "Dates in the past mean no wait"
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after(None) is None
+
+def test_retries_connection_errors_for_idempotent_methods_only():
+    """Test that errors are retried for GET, and for POST only when the connection never opened"""
+    policy = make_policy()
+    assert policy.next_delay("GET", 1, error=requests.exceptions.ConnectionError()) is not None
+    assert policy.next_delay("POST", 1, error=requests.exceptions.ReadTimeout()) is None
+    assert policy.next_delay("POST", 1, error=requests.exceptions.ConnectTimeout()) is not None
+
+def test_budget_limits_retries():
+    """Test that the session budget stops retries once it is used up"""
+    budget = RetryBudget(ratio=0, min_retries=2, max_backoff_seconds=100)
+    policy = RetryPolicy(budget=budget)
+    response = make_response(503)
+    assert policy.next_delay("GET", 1, response=response) is not None
+    assert policy.next_delay("GET", 1, response=response) is not None
+    assert policy.next_delay("GET", 1, response=response) is None, "Third retry should be over budget"
+    assert budget.stats.retries == 2
@@ -0,0 +1,33 @@
+import pytest
+from stub_server.fixtures import build_factors
+from utils.schema_validator import ResponseSchemaError, validate_response
+
+def make_factor_page():
+    """Helper function to build a factor list page like the API returns"""
+    factors = build_factors()
+    return {"total": len(factors), "pageNo": 1, "perPage": len(factors), "pages": 1, "results": factors}
+
+def test_valid_page_passes():
+    """Test that a well-formed factor page is accepted"""
+    validate_response("factor_list", make_factor_page())
+
+def test_error_reports_path_of_bad_row():
+    """Test that the first mismatch is reported with its location in the response"""
+    data = make_factor_page()
+    del data["results"][3]["weight"][0]["metric_id"]
+    with pytest.raises(ResponseSchemaError) as error:
+        validate_response("factor_list", data)
+    assert "response.results[3].weight[0]" in str(error.value), f"Unexpected message: {error.value}"
+    assert "'metric_id' is a required property" in str(error.value), f"Unexpected message: {error.value}"
+
+def test_boolean_is_not_an_integer():
+    """Test that true/false are rejected where the schema asks for an integer"""
+    with pytest.raises(ResponseSchemaError):
+        validate_response("dealer_radius_factor", [1, 2, True])
+    with pytest.raises(ResponseSchemaError):
+        validate_response("valuation_create", {"Message": "ok", "Valuation_id": 1, "Status": 1})
+
+def test_unknown_schema_name():
+    """Test that a schema name missing from data/schemas.py is a clear error"""
+    with pytest.raises(KeyError, match="no_such_schema"):
+        validate_response("no_such_schema", {})
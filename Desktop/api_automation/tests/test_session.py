@@ -0,0 +1,56 @@
+import os
+
+import pytest
+from config.settings import override_settings
+from utils.request_handler import PooledAdapter, close_session, get_session
+
+def pool_sizes(adapter):
+    """Helper function to return the (pool_connections, pool_maxsize, pool_block) an adapter was built with"""
+    return adapter._pool_connections, adapter._pool_maxsize, adapter._pool_block
+
+def test_session_is_reused_within_a_process():
+    """Test that every call in one process returns the same session until it is closed"""
+    session = get_session()
+    assert get_session() is session, "Expected the same session on every call"
+    assert id(get_session()) == id(session), "Expected the same session object"
+
+    close_session()
+    rebuilt = get_session()
+    assert rebuilt is not session, "Expected a new session after close_session()"
+    assert get_session() is rebuilt, "Expected the new session to be reused"
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_session_is_rebuilt_after_fork():
+    """Test that a forked process builds its own session instead of using the parent's sockets"""
+    parent_session = get_session()
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: report whether it got its own session, which it then keeps using
+        try:
+            child_session = get_session()
+            result = b"1" if child_session is not parent_session and get_session() is child_session else b"0"
+            os.write(write_end, result)
+        finally:
+            os._exit(0)
+
+    os.close(write_end)
+    result = os.read(read_end, 1)
+    os.close(read_end)
+    os.waitpid(pid, 0)
+    assert result == b"1", "Expected the forked process to build and reuse a session of its own"
+    assert get_session() is parent_session, "Expected the parent to keep its session"
+
+def test_pool_size_comes_from_the_settings():
+    """Test that the session's connection pools are sized from the settings, unless given explicitly"""
+    with override_settings(pool_connections=3, pool_maxsize=7, pool_block=True):
+        close_session()
+        try:
+            adapter = get_session().get_adapter("http://127.0.0.1/")
+            assert isinstance(adapter, PooledAdapter), f"Expected a PooledAdapter, got {type(adapter).__name__}"
+            assert pool_sizes(adapter) == (3, 7, True), f"Expected the pool sizes of the settings: {pool_sizes(adapter)}"
+            assert adapter.poolmanager.connection_pool_kw["maxsize"] == 7, "Expected pools of 7 connections"
+            assert pool_sizes(PooledAdapter(pool_maxsize=2)) == (3, 2, True), "Expected arguments to override the settings"
+        finally:
+            # The next test gets a session built with its own settings
+            close_session()
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from config.settings import Settings, get_settings, override_settings
+from endpoints.registry import valuation_list
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported before a test needs them
+SLOW_IMPORTS = ("asyncio", "jsonschema", "faker")
+
+def test_override_settings_is_used_and_restored():
+    """Test that overridden settings are used by URL building and are restored after the block"""
+    before = get_settings()
+    with override_settings(base_url="http://127.0.0.1:1/", test_timeout=3) as settings:
+        assert settings.test_timeout == 3, f"Unexpected settings: {settings}"
+        assert valuation_list.url(per_page=5) == "http://127.0.0.1:1/api/valuation?perPage=5", "Expected the overridden base URL"
+    assert get_settings() is before, "Expected the settings to be restored"
+    assert valuation_list.url(per_page=5).startswith(before.base_url), "Expected the original base URL again"
+
+def test_settings_round_trip_and_reject_bad_values(monkeypatch):
+    """Test that settings survive the dict passed to xdist workers and that invalid numbers are reported"""
+    settings = Settings(env="local", base_url="http://127.0.0.1:8765", pool_maxsize=32, pool_block=True)
+    assert Settings.from_dict({**settings.to_dict(), "unknown": 1}) == settings, "Expected the same settings back"
+
+    monkeypatch.setenv("POOL_MAXSIZE", "many")
+    with pytest.raises(ValueError, match="POOL_MAXSIZE='many'"):
+        Settings.from_environment("local")
+
+def test_conftest_import_is_lazy():
+    """Test that importing conftest reads no settings and imports no slow modules"""
+    script = (
+        "import sys, conftest, config.settings as settings;"
+        f"print(settings._settings is None, [name for name in {SLOW_IMPORTS!r} if name in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, f"Importing conftest failed: {result.stderr}"
+    assert result.stdout.strip() == "True []", f"Expected no settings and no slow imports, got {result.stdout.strip()}"
+
+def test_config_values_are_read_on_first_access():
+    """Test that importing config.config reads neither .env nor the environment until a value is used"""
+    script = (
+        "import os, config.config as config, config.settings as settings;"
+        "print(settings._dotenv_loaded, sorted(set(vars(config)) & set(config._ENVIRONMENT_VALUES)));"
+        "os.environ['RETRY_BACKOFF_BASE'] = '1.5';"
+        "print(config.RETRY_BACKOFF_BASE, settings._dotenv_loaded, 'RETRY_BACKOFF_BASE' in vars(config))"
+    )
+    environment = {name: value for name, value in os.environ.items() if name != "RETRY_BACKOFF_BASE"}
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, env=environment, capture_output=True,
+                            text=True, timeout=60)
+    assert result.returncode == 0, f"Importing config.config failed: {result.stderr}"
+    assert result.stdout.splitlines() == ["False []", "1.5 True True"], \
+        f"Expected values to be read and kept on first access, got {result.stdout.strip()}"
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+from endpoints.registry import factor_list
+from stub_server.server import StubConfig, StubServer
+from utils.request_handler import enable_single_flight, get_single_flight, send_request
+from utils.single_flight import SingleFlight
+
+STUB_TOKEN = "Token single-flight-token"
+OTHER_TOKEN = "Token other-flight-token"
+
+pytestmark = pytest.mark.no_response_cache
+
+@pytest.fixture(scope="module")
+def stub():
+    """Stub server slow enough for requests to overlap"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN, OTHER_TOKEN], latency_ms=300)).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def flight():
+    """SingleFlight used by send_request for one test"""
+    previous = get_single_flight()
+    flight = SingleFlight()
+    enable_single_flight(flight)
+    yield flight
+    enable_single_flight(previous)
+
+def get_factors(stub, token=STUB_TOKEN, **kwargs):
+    """Helper function to fetch the factor list"""
+    return send_request("GET", factor_list.url(base_url=stub.url), headers={"Authorization": token}, **kwargs)
+
+def run_together(*calls):
+    """Helper function to start calls on threads 50 ms apart and return their results in order"""
+    results = [None] * len(calls)
+
+    def run(index, call):
+        results[index] = call()
+
+    threads = [threading.Thread(target=run, args=(index, call)) for index, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_identical_gets_share_one_request(stub, flight, batch_requests):
+    """Test that identical GETs in flight together reach the server once and all get the response"""
+    requests_before = stub.stats["requests"]
+    request = {"method": "GET", "url": factor_list.url(base_url=stub.url), "headers": {"Authorization": STUB_TOKEN}}
+    responses = batch_requests([request] * 8, concurrency=8)
+
+    assert stub.stats["requests"] - requests_before == 1, "Expected one request to reach the server"
+    assert all(response.json() == responses[0].json() for response in responses), "Expected the same body for all"
+    assert sum(getattr(response, "coalesced", False) for response in responses) == 7, \
+        "Expected every response but the sender's to be marked as coalesced"
+    assert flight.stats == {"sent": 1, "coalesced": 7, "from_workers": 0}, f"Unexpected stats: {flight.stats}"
+
+def test_different_or_later_requests_are_sent(stub, flight):
+    """Test that another token, single_flight=False and a request after the first finished all reach the server"""
+    requests_before = stub.stats["requests"]
+    run_together(lambda: get_factors(stub), lambda: get_factors(stub, token=OTHER_TOKEN),
+                 lambda: get_factors(stub, single_flight=False))
+    get_factors(stub)
+    assert stub.stats["requests"] - requests_before == 4, "Expected every request to reach the server"
+    assert flight.stats["coalesced"] == 0, f"Unexpected stats: {flight.stats}"
+
+def test_workers_share_a_response_through_the_folder(stub, tmp_path):
+    """Test that a worker waiting for another worker's identical request uses its response"""
+    # One SingleFlight per "worker"; only the folder is shared
+    first, second = SingleFlight(str(tmp_path)), SingleFlight(str(tmp_path))
+    url = factor_list.url(base_url=stub.url)
+    kwargs = {"headers": {"Authorization": STUB_TOKEN}}
+    requests_before = stub.stats["requests"]
+
+    def send():
+        return send_request("GET", url, single_flight=False, **kwargs)
+
+    sent, shared = run_together(lambda: first.do("GET", url, kwargs, send), lambda: second.do("GET", url, kwargs, send))
+    assert stub.stats["requests"] - requests_before == 1, "Expected one request to reach the server"
+    assert shared.json() == sent.json() and shared.status_code == 200, "Expected the other worker's response"
+    assert (first.stats["sent"], second.stats["from_workers"]) == (1, 1), f"Unexpected stats: {second.stats}"
+
+    first.clear()
+    assert not tmp_path.exists(), "Expected the shared responses to be removed"
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from utils.snapshot import IGNORED, Snapshot, SnapshotMismatch, diff
+
+def make_page(count=20):
+    """Helper function to build a factor page like the API returns"""
+    results = [{"id": index, "name": f"Factor {index}", "createdOn": f"2025-01-{index % 28 + 1:02d}T10:30:00Z",
+                "weight": [{"weight_name": "Low", "weight_value": 1}]} for index in range(count)]
+    return {"total": count, "pageNo": 1, "results": results}
+
+def test_diff_aligns_lists_and_walks_only_changed_branches():
+    """Test that inserted, removed and changed list items are each reported once, at their own path"""
+    expected = make_page()
+    actual = make_page()
+    actual["results"].insert(3, {"id": 99, "name": "New"})
+    actual["results"][10]["weight"][0]["weight_value"] = 2
+    del actual["results"][-1]
+    actual["total"] = 21
+
+    changes = diff(expected, actual)
+    assert len(changes) == 4, f"Expected one line per change, got {changes}"
+    assert changes[0] == 'response.results[3]: added {"id": 99, "name": "New"}', f"Unexpected changes: {changes}"
+    assert changes[1] == "response.results[10].weight[0].weight_value: 1 -> 2", f"Unexpected changes: {changes}"
+    assert changes[2].startswith("response.results[19]: removed {"), f"Unexpected changes: {changes}"
+    assert changes[3] == "response.total: 20 -> 21", f"Unexpected changes: {changes}"
+    assert diff(expected, make_page()) == [], "Expected no changes between equal values"
+
+def test_snapshot_is_written_compared_and_reports_every_change(tmp_path, monkeypatch):
+    """Test the snapshot workflow: missing, written with update, matching with volatile fields, then changed"""
+    # Keep the file written here out of the run's list of updated snapshots
+    monkeypatch.setattr("utils.snapshot.updated_snapshots", [])
+    nodeid = "tests/test_example.py::test_factors"
+    with pytest.raises(SnapshotMismatch, match="--update-snapshots"):
+        Snapshot(nodeid, directory=str(tmp_path)).assert_match(make_page(), ignore=["results[*].createdOn"])
+
+    Snapshot(nodeid, update=True, directory=str(tmp_path)).assert_match(make_page(), ignore=["results[*].createdOn"])
+    path = tmp_path / "test_example" / "test_factors.json"
+    assert json.loads(path.read_text())["results"][0]["createdOn"] == IGNORED, "Expected volatile fields to be stored ignored"
+
+    changed = make_page()
+    for factor in changed["results"]:
+        factor["createdOn"] = "2026-10-18T08:00:00Z"
+    Snapshot(nodeid, directory=str(tmp_path)).assert_match(changed, ignore=["results[*].createdOn"])
+
+    changed["results"][2]["name"] = "Renamed"
+    del changed["results"][5]["weight"]
+    with pytest.raises(SnapshotMismatch) as error:
+        Snapshot(nodeid, directory=str(tmp_path)).assert_match(changed, ignore=["results[*].createdOn"])
+    message = str(error.value)
+    assert 'response.results[2].name: "Factor 2" -> "Renamed"' in message, f"Unexpected message: {message}"
+    assert "response.results[5].weight: removed" in message, f"Unexpected message: {message}"
@@ -0,0 +1,62 @@
+import pytest
+from endpoints.registry import factor_list
+from stub_server.server import StubConfig, StubServer
+from utils.request_handler import add_request_listener, remove_request_listener, send_request
+from utils.soak import SoakMonitor, SoakWindow, find_degradation, find_leaks, parse_duration
+
+STUB_TOKEN = "Token soak-token"
+
+pytestmark = pytest.mark.no_response_cache
+
+@pytest.fixture
+def stub():
+    """Stub server whose latency the test can change"""
+    server = StubServer(port=0, config=StubConfig(tokens=[STUB_TOKEN], latency_ms=0)).start()
+    yield server
+    server.stop()
+
+def make_windows(resources, latency=None):
+    """Helper function to build soak windows from {name: [value per window]} and a latency entry per window"""
+    count = len(next(iter(resources.values())))
+    return [SoakWindow(index=index, started=index, ended=index + 1,
+                       resources={name: values[index] for name, values in resources.items()},
+                       latency={"GET /api/factor": latency[index]} if latency else {})
+            for index in range(count)]
+
+def test_durations_are_parsed():
+    """Test that soak durations accept units and reject anything else"""
+    assert [parse_duration(text) for text in ("90", "45s", "30m", "8h", "1h30m")] == [90, 45, 1800, 28800, 5400]
+    for text in ("", "0s", "10 minutes", "1d", "m30"):
+        with pytest.raises(ValueError):
+            parse_duration(text)
+
+def test_steady_growth_is_flagged_but_noise_is_not():
+    """Test that only resources that keep rising past their limit are reported as leaks"""
+    windows = make_windows({
+        "rss_mb": [100, 130, 160, 190],  # keeps growing
+        "open_fds": [20, 40, 21, 22],  # one spike
+        "pools": [1, 1, 1, 1],
+    })
+    findings = find_leaks(windows, limits={"rss_mb": 50, "open_fds": 10, "pools": 3})
+    assert len(findings) == 1 and findings[0].startswith("rss_mb grew in 3 windows from 100 to 190"), \
+        f"Unexpected findings: {findings}"
+
+def test_latency_drift_is_flagged(stub):
+    """Test that a server getting slower during the run shows up as drift, from real requests"""
+    monitor = SoakMonitor(duration=60, window_seconds=3600, warmup_windows=0)
+    monitor.start()
+    add_request_listener(monitor.record)
+    try:
+        for latency_ms in (0, 0, 0, 40, 40, 40):
+            stub.config.latency_ms = latency_ms
+            for _ in range(5):
+                send_request("GET", factor_list.url(base_url=stub.url), headers={"Authorization": STUB_TOKEN})
+            monitor.close_window()
+    finally:
+        remove_request_listener(monitor.record)
+
+    assert [window.requests for window in monitor.windows] == [5] * 6, "Expected 5 requests per window"
+    findings = find_degradation(monitor.windows)
+    assert len(findings) == 1 and findings[0].startswith("GET /api/factor: p90 drifted"), \
+        f"Expected latency drift, got {findings}"
+    assert monitor.windows[-1].resources["pools"] >= 1, f"Expected pool stats, got {monitor.windows[-1].resources}"
@@ -0,0 +1,84 @@
+import time
+import pytest
+from endpoints.registry import (
+    dealer_radius_factor, documents_by_section, factor_list, login, valuation_create, valuation_list
+)
+from stub_server.server import StubConfig, StubServer
+from utils.request_handler import send_request
+from utils.retry_policy import RetryPolicy, RetryBudget, NO_RETRIES
+
+STUB_TOKEN = "Token stub-test-token"
+
+# These tests check what reaches the server
+pytestmark = pytest.mark.no_response_cache
+
+def start_stub(**kwargs):
+    """Helper function to start a stub server on a free port"""
+    config = StubConfig(tokens=[STUB_TOKEN], users={"user": "secret"}, **kwargs)
+    return StubServer(port=0, config=config).start()
+
+@pytest.fixture
+def stub():
+    """Stub server without injected latency or errors"""
+    server = start_stub()
+    yield server
+    server.stop()
+
+def test_login_token_is_accepted(stub):
+    """Test that a token issued by the stub login works on protected endpoints"""
+    response = send_request("POST", login.url(base_url=stub.url), json={"username": "user", "password": "secret"})
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+    token = f"Token {response.json()['token']}"
+
+    response = send_request("GET", factor_list.url(base_url=stub.url), headers={"Authorization": token},
+                            params={"perPage": 10, "pageNo": 2})
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+    data = response.json()
+    assert data["total"] == 15 and data["pages"] == 2, f"Unexpected pagination: {data}"
+    assert len(data["results"]) == 5, f"Expected 5 factors on page 2, but got {len(data['results'])}"
+
+def test_created_valuation_is_listed(stub):
+    """Test that created valuations show up in the valuation list"""
+    headers = {"Authorization": STUB_TOKEN}
+    payload = {"dealer_info_id": 1, "name": "Stub valuation", "config_id": 2, "dealer_id": "3"}
+    response = send_request("POST", valuation_create.url(base_url=stub.url), params={"username": "stub"}, json=payload,
+                            headers=headers)
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+
+    response = send_request("GET", valuation_list.url(base_url=stub.url), params={"username": "stub", "q": "stub"},
+                            headers=headers)
+    results = response.json()["results"]
+    assert [item["name"] for item in results] == ["Stub valuation"], f"Unexpected results: {results}"
+
+def test_injected_errors_are_retried():
+    """Test that seeded error injection is repeatable and recovered from by the retry policy"""
+    policy = RetryPolicy(max_attempts=10, budget=RetryBudget(ratio=0, min_retries=100, max_backoff_seconds=100),
+                         sleep=lambda delay: None)
+    injected = []
+    for _ in range(2):
+        server = start_stub(error_rate=0.5, retry_after=0, seed=7)
+        try:
+            for _ in range(10):
+                response = send_request("GET", dealer_radius_factor.url(base_url=server.url),
+                                        headers={"Authorization": STUB_TOKEN}, params={"type": "StepsOptions"},
+                                        retry_policy=policy)
+                assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+        finally:
+            server.stop()
+        injected.append(server.stats["injected_errors"])
+    assert injected[0] > 0, "Expected some injected errors"
+    assert injected[0] == injected[1], f"Expected the same errors with the same seed, but got {injected}"
+
+def test_injected_latency():
+    """Test that responses are delayed by the configured latency"""
+    server = start_stub(latency_ms=50)
+    try:
+        start = time.perf_counter()
+        response = send_request("GET", documents_by_section.url(base_url=server.url),
+                                headers={"Authorization": STUB_TOKEN}, params={"section": "help"},
+                                retry_policy=NO_RETRIES)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        server.stop()
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+    assert elapsed_ms >= 50, f"Expected at least 50 ms, but the request took {elapsed_ms:.1f} ms"
@@ -1,19 +1,19 @@
 import pytest
+from endpoints.registry import valuation_create
 from endpoints.valuation_endpoints import valuation_endpoint, get_valuation_list_endpoint
 from utils.request_handler import send_request
+from utils.schema_validator import validate_response
 from data.valuation_data import valid_valuation_payload, INVALID_DEALER_ID, INVALID_CONFIG_ID, MISSING_REQUIRED_FIELDS
 from data.test_data import default_headers, DEFAULT_USERNAME, DEFAULT_PAGE_SIZE, DEFAULT_PAGE_NUMBER
-from config.config import AUTH_TOKEN
 
 def get_message_from_response(response_data):
     """Helper function to get message from response data"""
     return response_data.get("Message")
 
 @pytest.mark.api
-def test_get_valuation_list():
+def test_get_valuation_list(auth_provider):
     """Test getting valuation list with default pagination"""
     headers = default_headers.copy()
-    headers["Authorization"] = AUTH_TOKEN
     headers["Content-Type"] = "text/plain"
     
     endpoint = get_valuation_list_endpoint(
@@ -25,7 +25,8 @@ def test_get_valuation_list():
     response = send_request(
         "GET",
         endpoint,
-        headers=headers
+        headers=headers,
+        auth=auth_provider
     )
     
     # Assert status code
@@ -35,22 +36,16 @@ def test_get_valuation_list():
     response_data = response.json()
     
     # Assert response structure
-    assert isinstance(response_data, dict), f"Expected response to be a dict, but got {type(response_data)}"
-    assert "pageNo" in response_data, f"Response missing pageNo field: {response_data}"
-    assert "perPage" in response_data, f"Response missing perPage field: {response_data}"
-    assert "pages" in response_data, f"Response missing pages field: {response_data}"
-    assert "results" in response_data, f"Response missing results field: {response_data}"
+    validate_response("valuation_list", response_data)
     
     # Assert pagination values
     assert response_data["pageNo"] == 1, f"Expected pageNo to be 1, but got {response_data['pageNo']}"
     assert response_data["perPage"] == 10, f"Expected perPage to be 10, but got {response_data['perPage']}"
-    assert isinstance(response_data["results"], list), f"Expected results to be a list, but got {type(response_data['results'])}"
 
 @pytest.mark.api
-def test_get_valuation_list_with_pagination():
+def test_get_valuation_list_with_pagination(auth_provider):
     """Test getting valuation list with custom pagination"""
     headers = default_headers.copy()
-    headers["Authorization"] = AUTH_TOKEN
     headers["Content-Type"] = "text/plain"
     
     # Test with custom pagination parameters
@@ -59,7 +54,8 @@ def test_get_valuation_list_with_pagination():
     response = send_request(
         "GET",
         endpoint,
-        headers=headers
+        headers=headers,
+        auth=auth_provider
     )
     
     # Assert status code
@@ -69,23 +65,17 @@ def test_get_valuation_list_with_pagination():
     response_data = response.json()
     
     # Assert response structure
-    assert isinstance(response_data, dict), f"Expected response to be a dict, but got {type(response_data)}"
-    assert "pageNo" in response_data, f"Response missing pageNo field: {response_data}"
-    assert "perPage" in response_data, f"Response missing perPage field: {response_data}"
-    assert "pages" in response_data, f"Response missing pages field: {response_data}"
-    assert "results" in response_data, f"Response missing results field: {response_data}"
+    validate_response("valuation_list", response_data)
     
     # Assert pagination values
     assert response_data["pageNo"] == 2, f"Expected pageNo to be 2, but got {response_data['pageNo']}"
     assert response_data["perPage"] == 5, f"Expected perPage to be 5, but got {response_data['perPage']}"
-    assert isinstance(response_data["results"], list), f"Expected results to be a list, but got {type(response_data['results'])}"
     assert len(response_data["results"]) <= 5, f"Expected at most 5 items per page, but got {len(response_data['results'])}"
 
 @pytest.mark.api
-def test_get_valuation_list_with_search():
+def test_get_valuation_list_with_search(auth_provider):
     """Test getting valuation list with search query"""
     headers = default_headers.copy()
-    headers["Authorization"] = AUTH_TOKEN
     headers["Content-Type"] = "text/plain"
     
     # Test with search query
@@ -94,7 +84,8 @@ def test_get_valuation_list_with_search():
     response = send_request(
         "GET",
         endpoint,
-        headers=headers
+        headers=headers,
+        auth=auth_provider
     )
     
     # Assert status code
@@ -104,14 +95,7 @@ def test_get_valuation_list_with_search():
     response_data = response.json()
     
     # Assert response structure
-    assert isinstance(response_data, dict), f"Expected response to be a dict, but got {type(response_data)}"
-    assert "pageNo" in response_data, f"Response missing pageNo field: {response_data}"
-    assert "perPage" in response_data, f"Response missing perPage field: {response_data}"
-    assert "pages" in response_data, f"Response missing pages field: {response_data}"
-    assert "results" in response_data, f"Response missing results field: {response_data}"
-    
-    # Assert results is a list
-    assert isinstance(response_data["results"], list), f"Expected results to be a list, but got {type(response_data['results'])}"
+    validate_response("valuation_list", response_data)
 
 @pytest.mark.api
 def test_get_valuation_list_invalid_token():
@@ -131,20 +115,19 @@ def test_get_valuation_list_invalid_token():
     assert response.status_code == 401, f"Expected status code 401 for unauthorized request, but got {response.status_code}"
 
 @pytest.mark.api
-def test_create_valuation():
+def test_create_valuation(auth_provider):
     """Test successful creation of valuation"""
-    # Add authorization token to headers
     headers = default_headers.copy()
-    headers["Authorization"] = AUTH_TOKEN
     
     # Add username as query parameter
-    endpoint = f"{valuation_endpoint}?username=mohit"
+    endpoint = valuation_create.url(username="mohit")
     
     response = send_request(
         "POST",
         endpoint,
         json=valid_valuation_payload,
-        headers=headers
+        headers=headers,
+        auth=auth_provider
     )
     
     # Assert status code
@@ -154,28 +137,23 @@ def test_create_valuation():
     response_data = response.json()
     
     # Assert response fields
-    assert get_message_from_response(response_data) is not None, f"Response missing Message field: {response_data}"
+    validate_response("valuation_create", response_data)
     assert get_message_from_response(response_data) == "Successfully Created New Valuation", f"Expected message 'Successfully Created New Valuation', but got: {get_message_from_response(response_data)}"
-    
-    assert "Valuation_id" in response_data, f"Response missing Valuation_id field: {response_data}"
-    assert isinstance(response_data["Valuation_id"], int), f"Valuation_id should be an integer, but got: {type(response_data['Valuation_id'])}"
-    
-    assert "Status" in response_data, f"Response missing Status field: {response_data}"
     assert response_data["Status"] is True, f"Expected Status to be True, but got {response_data['Status']}"
 
 @pytest.mark.api
-def test_create_valuation_missing_fields():
+def test_create_valuation_missing_fields(auth_provider):
     """Test valuation creation with missing required fields"""
     headers = default_headers.copy()
-    headers["Authorization"] = AUTH_TOKEN
-    endpoint = f"{valuation_endpoint}?username=mohit"
+    endpoint = valuation_create.url(username="mohit")
     
     # Test with empty payload
     response = send_request(
         "POST",
         endpoint,
         json={},
-        headers=headers
+        headers=headers,
+        auth=auth_provider
     )
     
     # The API returns 408 for timeout, so we'll update our expectation
@@ -186,7 +164,7 @@ def test_create_valuation_invalid_token():
     """Test valuation creation with invalid authorization token"""
     headers = default_headers.copy()
     headers["Authorization"] = "Token invalid_token"
-    endpoint = f"{valuation_endpoint}?username=mohit"
+    endpoint = valuation_create.url(username="mohit")
     
     response = send_request(
         "POST",
@@ -198,16 +176,16 @@ def test_create_valuation_invalid_token():
     assert response.status_code == 401, f"Expected status code 401 for unauthorized request, but got {response.status_code}"
 
 @pytest.mark.api
-def test_create_valuation_missing_username():
+def test_create_valuation_missing_username(auth_provider):
     """Test valuation creation without username parameter"""
     headers = default_headers.copy()
-    headers["Authorization"] = AUTH_TOKEN
     
     response = send_request(
         "POST",
         valuation_endpoint,
         json=valid_valuation_payload,
-        headers=headers
+        headers=headers,
+        auth=auth_provider
     )
     
     # The API accepts requests without username, so we'll update our expectation
@@ -217,11 +195,27 @@ def test_create_valuation_missing_username():
     response_data = response.json()
     
     # Assert response fields
-    assert get_message_from_response(response_data) is not None, f"Response missing Message field: {response_data}"
+    validate_response("valuation_create", response_data)
     assert get_message_from_response(response_data) == "Successfully Created New Valuation", f"Expected message 'Successfully Created New Valuation', but got: {get_message_from_response(response_data)}"
+    assert response_data["Status"] is True, f"Expected Status to be True, but got {response_data['Status']}"
+
+@pytest.mark.api
+def test_get_valuation_list_pagination_combinations(batch_requests, auth_provider):
+    """Test many pagination combinations of the valuation list in one concurrent batch"""
+    headers = default_headers.copy()
+    headers["Content-Type"] = "text/plain"
     
-    assert "Valuation_id" in response_data, f"Response missing Valuation_id field: {response_data}"
-    assert isinstance(response_data["Valuation_id"], int), f"Valuation_id should be an integer, but got: {type(response_data['Valuation_id'])}"
-    
-    assert "Status" in response_data, f"Response missing Status field: {response_data}"
-    assert response_data["Status"] is True, f"Expected Status to be True, but got {response_data['Status']}" 
\ No newline at end of file
+    combinations = [(per_page, page_no) for per_page in (1, 5, 10, 25) for page_no in (1, 2, 3)]
+    responses = batch_requests([
+        {"method": "GET", "url": get_valuation_list_endpoint(per_page=per_page, page_no=page_no), "headers": headers,
+         "auth": auth_provider}
+        for per_page, page_no in combinations
+    ], concurrency=6)
+    
+    for (per_page, page_no), response in zip(combinations, responses):
+        assert response.status_code == 200, f"perPage={per_page} pageNo={page_no}: expected status code 200, but got {response.status_code}"
+        response_data = response.json()
+        validate_response("valuation_list", response_data)
+        assert response_data["pageNo"] == page_no, f"Expected pageNo to be {page_no}, but got {response_data['pageNo']}"
+        assert response_data["perPage"] == per_page, f"Expected perPage to be {per_page}, but got {response_data['perPage']}"
+        assert len(response_data["results"]) <= per_page, f"Expected at most {per_page} items per page, but got {len(response_data['results'])}"
@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import get_logger
+from utils.request_handler import send_request
+from config.config import ASYNC_CONCURRENCY
+from config.settings import get_settings
+
+# Initialize logger for async request handling
+logger = get_logger()
+
+
+async def send_request_async(method, url, executor=None, **kwargs):
+    """
+    Async counterpart of send_request.
+
+    The request runs on a worker thread through send_request, so it uses the same
+    pooled connections, retry mechanism and logging as the blocking version.
+
+    Parameters:
+        method (str): HTTP method to use (GET, POST, PUT, DELETE)
+        url (str): The URL to send the request to
+        executor (Executor): Thread pool to run the request on (default: the loop's executor)
+        **kwargs: Additional arguments for send_request (headers, json, params, timeout, ...)
+
+    Returns:
+        requests.Response: The response object from the request
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, lambda: send_request(method, url, **kwargs))
+
+
+async def send_many_async(requests, concurrency=ASYNC_CONCURRENCY, return_exceptions=False):
+    """
+    Send many requests at once with at most `concurrency` of them in flight.
+
+    Parameters:
+        requests (list): Request definitions, each a dict with "method" and "url" keys plus
+                         any send_request arguments, e.g.
+                         {"method": "GET", "url": endpoint, "params": {"section": "eula"}, "timeout": 5}
+        concurrency (int): Maximum number of requests in flight at the same time
+        return_exceptions (bool): Return failed requests' exceptions in the result list
+                                  instead of raising the first one
+
+    Returns:
+        list: Responses (or exceptions) in the same order as `requests`
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    pool_maxsize = get_settings().pool_maxsize
+    if concurrency > pool_maxsize:
+        logger.warning(f"Concurrency {concurrency} is larger than POOL_MAXSIZE {pool_maxsize}; "
+                       f"extra connections will not be kept alive")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(definition):
+        kwargs = dict(definition)
+        method = kwargs.pop("method")
+        url = kwargs.pop("url")
+        async with semaphore:
+            return await send_request_async(method, url, executor=executor, **kwargs)
+
+    logger.info(f"Sending {len(requests)} requests with concurrency {concurrency}")
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="send_many") as executor:
+        return await asyncio.gather(
+            *(run(definition) for definition in requests),
+            return_exceptions=return_exceptions,
+        )
+
+
+def send_many(requests, concurrency=ASYNC_CONCURRENCY, return_exceptions=False):
+    """
+    Blocking wrapper around send_many_async for use in regular test functions.
+
+    Example:
+        responses = send_many([
+            {"method": "GET", "url": endpoint, "params": {"section": section}}
+            for section in ["eula", "pp", "help", "tc"]
+        ], concurrency=4)
+    """
+    return asyncio.run(send_many_async(requests, concurrency, return_exceptions))
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from requests.auth import AuthBase
+
+from utils.file_lock import file_lock
+from utils.logger import get_logger
+from utils.request_handler import send_request
+from config.config import AUTH_TOKEN_TTL, AUTH_TOKEN_REFRESH_MARGIN, AUTH_CACHE_FILE
+from config.settings import get_settings
+from endpoints.registry import login
+
+# Initialize logger for authentication
+logger = get_logger()
+
+
+class AuthError(Exception):
+    """Raised when logging in does not return a usable token"""
+
+
+class TokenCache:
+    """
+    Token cache on disk, shared by every process on the machine (e.g. all xdist workers).
+
+    Entries are stored as {key: {"token": ..., "expires_at": ...}} in one JSON file,
+    which is only read and written while holding a file lock.
+
+    Parameters:
+        path (str): Location of the cache file
+    """
+
+    def __init__(self, path=AUTH_CACHE_FILE):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+
+    def _read(self):
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as cache_file:
+            json.dump(entries, cache_file)
+        os.replace(temp_path, self.path)
+
+    def get_or_create(self, key, create, is_valid):
+        """
+        Return the cached entry for `key`, calling `create()` to make a new one when needed.
+
+        Parameters:
+            key (str): Cache key
+            create (callable): Returns a new entry dict
+            is_valid (callable): Tells whether a cached entry can still be used
+
+        Returns:
+            dict: The cached or new entry
+        """
+        with file_lock(self.lock_path):
+            entries = self._read()
+            entry = entries.get(key)
+            if entry is not None and is_valid(entry):
+                return entry
+            entry = create()
+            entries[key] = entry
+            self._write(entries)
+            return entry
+
+    def discard(self, key, token):
+        """Remove the entry for `key` if it still holds `token` (another process may have refreshed it)"""
+        with file_lock(self.lock_path):
+            entries = self._read()
+            if entries.get(key, {}).get("token") == token:
+                del entries[key]
+                self._write(entries)
+
+
+class AuthProvider(AuthBase):
+    """
+    Logs in once and shares the token across tests and xdist workers.
+
+    When no username and password are configured, the static AUTH_TOKEN from the
+    environment settings is used instead and nothing is cached.
+
+    The provider can be used as a requests auth object. It then sets the
+    Authorization header and, if the server answers 401 before the token was due
+    to expire, logs in again and resends the request once.
+
+    Parameters:
+        login_url (str): Login endpoint (default: the login route of the base URL in the settings)
+        username (str): Login username (default: AUTH_USERNAME)
+        password (str): Login password (default: AUTH_PASSWORD)
+        static_token (str): Token used when no credentials are configured (default: AUTH_TOKEN)
+        cache (TokenCache): Shared token cache
+
+    Example:
+        response = send_request("GET", endpoint, auth=auth_provider)
+    """
+
+    def __init__(self, login_url=None, username=None, password=None, static_token=None, cache=None):
+        settings = get_settings()
+        self.login_url = login.url() if login_url is None else login_url
+        self.username = settings.auth_username if username is None else username
+        self.password = settings.auth_password if password is None else password
+        self.static_token = settings.auth_token if static_token is None else static_token
+        self.cache = cache or TokenCache()
+        self.cache_key = hashlib.sha256(
+            f"{settings.base_url}|{self.login_url}|{self.username}".encode()
+        ).hexdigest()[:16]
+        self.logins = 0
+        self._lock = threading.Lock()
+        self._entry = None
+
+    @property
+    def uses_login(self):
+        return bool(self.username and self.password)
+
+    @staticmethod
+    def _is_fresh(entry):
+        return entry["expires_at"] - AUTH_TOKEN_REFRESH_MARGIN > time.time()
+
+    def _login(self):
+        """Log in and return a cache entry with the token and its expiry time"""
+        logger.info(f"Logging in as {self.username}")
+        response = send_request("POST", self.login_url,
+                                json={"username": self.username, "password": self.password},
+                                headers={"Content-Type": "application/json"})
+        if response.status_code != 200:
+            raise AuthError(f"Login failed with status code {response.status_code}: {response.text[:200]}")
+        self.logins += 1
+        return parse_login_response(response.json())
+
+    def get_token(self):
+        """Return a valid token, logging in only when no fresh token is cached"""
+        if not self.uses_login:
+            return self.static_token
+
+        with self._lock:
+            if self._entry is None or not self._is_fresh(self._entry):
+                self._entry = self.cache.get_or_create(self.cache_key, self._login, self._is_fresh)
+            return self._entry["token"]
+
+    def invalidate(self, token):
+        """Forget `token` so the next get_token() logs in again"""
+        if not self.uses_login:
+            return
+        with self._lock:
+            if self._entry is not None and self._entry["token"] == token:
+                self._entry = None
+        self.cache.discard(self.cache_key, token)
+
+    def __call__(self, request):
+        token = self.get_token()
+        request.headers["Authorization"] = token
+        if self.uses_login:
+            request.register_hook("response", self._refresh_on_401)
+        return request
+
+    def _refresh_on_401(self, response, **kwargs):
+        """Log in again and resend once when the server rejects a token that should still be valid"""
+        if response.status_code != 401 or getattr(response.request, "_auth_retried", False):
+            return response
+
+        stale_token = response.request.headers.get("Authorization")
+        logger.warning("Got 401 with an unexpired token; logging in again")
+        self.invalidate(stale_token)
+
+        # Release the connection before sending the request again
+        response.content
+        response.close()
+        retry = response.request.copy()
+        retry.headers["Authorization"] = self.get_token()
+        retry._auth_retried = True
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
+
+
+def parse_login_response(data):
+    """
+    Read the token and expiry from a login response body.
+
+    Accepts the token as "token", "access", "access_token" or "key", at the top level
+    or under "data", and the lifetime as "expires_in" (seconds) or "expires_at" (epoch
+    seconds). Tokens without a scheme get the "Token " prefix used by AUTH_TOKEN.
+
+    Returns:
+        dict: {"token": ..., "expires_at": ...}
+    """
+    body = data.get("data") if isinstance(data.get("data"), dict) else data
+    token = next((body[key] for key in ("token", "access", "access_token", "key") if body.get(key)), None)
+    if not token:
+        raise AuthError(f"Login response has no token: {data}")
+    if " " not in token:
+        token = f"Token {token}"
+
+    if body.get("expires_at"):
+        expires_at = float(body["expires_at"])
+    else:
+        expires_at = time.time() + float(body.get("expires_in") or AUTH_TOKEN_TTL)
+    return {"token": token, "expires_at": expires_at}
+
+
+# Provider shared by the whole process
+_auth_provider = None
+
+
+def get_auth_provider():
+    """Return the auth provider shared by this process"""
+    global _auth_provider
+    if _auth_provider is None:
+        _auth_provider = AuthProvider()
+    return _auth_provider
@@ -0,0 +1,366 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from utils.file_lock import file_lock
+from utils.logger import get_logger
+from utils.request_handler import PooledAdapter, get_current_test, set_transport_adapter
+from config.config import CASSETTE_LOCKS_DIR
+from config.settings import get_settings
+
+# Initialize logger for record/replay
+logger = get_logger()
+
+TRANSPORT_MODES = ("live", "record", "replay")
+
+# Cassette used for requests sent outside of a test (e.g. session fixtures)
+SESSION_CASSETTE = "_session"
+
+# Response headers that change on every request and are not stored
+VOLATILE_HEADERS = {
+    "date", "age", "via", "connection", "keep-alive", "transfer-encoding", "content-encoding",
+    "content-length", "x-cache", "x-amz-cf-id", "x-amz-cf-pop", "x-amzn-requestid", "x-amzn-trace-id",
+}
+
+# Response headers and JSON fields whose values are secrets
+SECRET_HEADERS = {"set-cookie", "authorization"}
+SECRET_FIELDS = {"token", "access", "access_token", "refresh", "refresh_token", "key"}
+
+REDACTED = "REDACTED"
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when no recorded response matches a request"""
+
+
+def normalize_url(url):
+    """
+    Return the host, path and sorted query parameters of a URL, so equal requests get equal keys.
+
+    The host is kept so requests to different servers (e.g. two stub servers) do not share
+    recorded responses; the scheme is left out.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(("", parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def body_hash(body):
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def request_key(method, url, body):
+    """Key used to find a recorded response: method, normalized URL and body hash"""
+    return f"{method.upper()} {normalize_url(url)} {body_hash(body)}"
+
+
+def cassette_name(test_id):
+    """Return the cassette name for a test node id: one cassette per test module"""
+    if not test_id:
+        return SESSION_CASSETTE
+    module_path = test_id.split("::", 1)[0]
+    return os.path.splitext(os.path.basename(module_path))[0]
+
+
+def test_key(test_id):
+    """
+    Return the part of a test node id that identifies it in its cassette: file name and test name.
+
+    The folder is left out because xdist workers can report node ids relative to another root.
+    """
+    if not test_id:
+        return None
+    module_path, _, name = test_id.partition("::")
+    return f"{os.path.basename(module_path)}::{name}"
+
+
+def _redact_json(value):
+    if isinstance(value, dict):
+        return {key: (REDACTED if key.lower() in SECRET_FIELDS else _redact_json(item)) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact_json(item) for item in value]
+    return value
+
+
+def serialize_response(response):
+    """Turn a response into a compact, redacted dict for a cassette"""
+    headers = {}
+    for name, value in response.headers.items():
+        name = name.lower()
+        if name in VOLATILE_HEADERS:
+            continue
+        headers[name] = REDACTED if name in SECRET_HEADERS else value
+
+    content = response.content or b""
+    data = {"status": response.status_code, "reason": response.reason, "headers": headers}
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        data["body_b64"] = base64.b64encode(content).decode()
+        return data
+    if "json" in headers.get("content-type", ""):
+        try:
+            text = json.dumps(_redact_json(json.loads(text)), separators=(",", ":"))
+        except ValueError:
+            pass
+    data["body"] = text
+    return data
+
+
+def build_response(data, request, connection=None):
+    """
+    Build a requests.Response from a cassette entry.
+
+    Parameters:
+        data (dict): Recorded response
+        request (requests.PreparedRequest): Request being answered
+        connection (BaseAdapter): Adapter that answered it, used by hooks that resend (e.g. AuthProvider on 401)
+    """
+    response = Response()
+    response.status_code = data["status"]
+    response.reason = data.get("reason")
+    response.headers = CaseInsensitiveDict(data["headers"])
+    if "body_b64" in data:
+        response._content = base64.b64decode(data["body_b64"])
+    else:
+        response._content = data["body"].encode("utf-8")
+    response._content_consumed = True
+    response.headers["content-length"] = str(len(response._content))
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.connection = connection
+    response.elapsed = timedelta(0)
+    return response
+
+
+class Cassette:
+    """
+    Recorded request/response pairs of one test module.
+
+    Stored as JSON with one interaction per line:
+    {"test": node id, "key": request key, "response": {...}}
+
+    Parameters:
+        path (str): Cassette file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = []
+        self._index = None
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    @property
+    def lock_path(self):
+        """Lock file taken while saving, under CASSETTE_LOCKS_DIR so tests/cassettes only holds cassettes"""
+        path_hash = hashlib.sha256(os.path.abspath(self.path).encode()).hexdigest()[:16]
+        return os.path.join(CASSETTE_LOCKS_DIR, f"{os.path.basename(self.path)}.{path_hash}.lock")
+
+    def load(self):
+        try:
+            with open(self.path) as cassette_file:
+                self.interactions = json.load(cassette_file)["interactions"]
+        except FileNotFoundError:
+            self.interactions = []
+        self._index = None
+        return self
+
+    def add(self, test_id, key, response_data):
+        with self._lock:
+            self.interactions.append({"test": test_key(test_id), "key": key, "response": response_data})
+
+    def _build_index(self):
+        # Responses by (test, key) and by key alone, in recorded order
+        index = {}
+        for interaction in self.interactions:
+            index.setdefault((test_key(interaction["test"]), interaction["key"]), []).append(interaction["response"])
+            index.setdefault((None, interaction["key"]), []).append(interaction["response"])
+        return index
+
+    def find(self, test_id, key):
+        """
+        Return the next recorded response for the request.
+
+        Responses recorded by the same test are preferred; repeated requests get the
+        recorded responses in order and then keep getting the last one.
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            for lookup in ((test_key(test_id), key), (None, key)):
+                responses = self._index.get(lookup)
+                if responses:
+                    position = self._positions.get(lookup, 0)
+                    self._positions[lookup] = position + 1
+                    return responses[min(position, len(responses) - 1)]
+        return None
+
+    def save(self):
+        """Write the recorded interactions, merging with what other xdist workers wrote"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with file_lock(self.lock_path):
+            recorded_tests = {test_key(interaction["test"]) for interaction in self.interactions}
+            try:
+                with open(self.path) as cassette_file:
+                    existing = json.load(cassette_file)["interactions"]
+            except (FileNotFoundError, ValueError, KeyError):
+                existing = []
+            # Re-recorded tests replace their old interactions
+            merged = [interaction for interaction in existing if test_key(interaction["test"]) not in recorded_tests]
+            merged.extend(self.interactions)
+
+            lines = ",\n".join(json.dumps(interaction, separators=(",", ":"), sort_keys=True) for interaction in merged)
+            with open(self.path, "w") as cassette_file:
+                cassette_file.write('{"version":1,"interactions":[\n' + lines + "\n]}\n")
+
+
+class CassetteLibrary:
+    """
+    Cassettes of a test run, one per test module, loaded on first use.
+
+    Parameters:
+        directory (str): Folder holding the cassette files
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.cassettes = {}
+        self._lock = threading.Lock()
+
+    def get(self, test_id, load=True):
+        name = cassette_name(test_id)
+        with self._lock:
+            if name not in self.cassettes:
+                cassette = Cassette(os.path.join(self.directory, f"{name}.json"))
+                self.cassettes[name] = cassette.load() if load else cassette
+            return self.cassettes[name]
+
+    def save(self):
+        for cassette in self.cassettes.values():
+            if cassette.interactions:
+                cassette.save()
+        logger.info(f"Saved {len(self.cassettes)} cassettes to {self.directory}")
+
+
+def _base_hosts():
+    """Hosts recorded and replayed by default: the one of the base URL in the settings"""
+    return {urlsplit(get_settings().base_url).netloc.lower()}
+
+
+class RecordingAdapter(PooledAdapter):
+    """
+    Sends requests over the network and records the exchanges with `hosts` in the test module's cassette.
+
+    Requests to other hosts (e.g. stub servers started by the tests themselves) are sent without recording.
+    """
+
+    def __init__(self, library, hosts=None, **kwargs):
+        super().__init__(**kwargs)
+        self.library = library
+        self.hosts = {host.lower() for host in hosts} if hosts else _base_hosts()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if urlsplit(request.url).netloc.lower() not in self.hosts:
+            return response
+        # Streamed bodies are read in full here; they are then streamed from memory
+        test_id = get_current_test()
+        key = request_key(request.method, request.url, request.body)
+        self.library.get(test_id, load=False).add(test_id, key, serialize_response(response))
+        return response
+
+
+class ReplayAdapter(PooledAdapter):
+    """
+    Answers requests to `hosts` from the recorded cassettes without touching the network.
+
+    Requests to other hosts (e.g. stub servers started by the tests themselves) go over
+    the network as in live mode, through the adapter's connection pools.
+    """
+
+    def __init__(self, library, hosts=None, **kwargs):
+        super().__init__(**kwargs)
+        self.library = library
+        self.hosts = {host.lower() for host in hosts} if hosts else _base_hosts()
+
+    def send(self, request, **kwargs):
+        if urlsplit(request.url).netloc.lower() not in self.hosts:
+            return super().send(request, **kwargs)
+        test_id = get_current_test()
+        key = request_key(request.method, request.url, request.body)
+        data = self.library.get(test_id).find(test_id, key)
+        if data is None:
+            raise CassetteMiss(f"No recorded response for {key} (test {test_id}); "
+                               f"record it with --transport=record")
+        return build_response(data, request, connection=self)
+
+
+# Transport mode, cassettes and recorded hosts in use
+_mode = "live"
+_library = None
+_hosts = None
+
+
+def use_transport(mode, directory, hosts=None):
+    """
+    Switch send_request to live, record or replay mode.
+
+    Parameters:
+        mode (str): "live", "record" or "replay"
+        directory (str): Folder holding the cassette files
+        hosts (iterable): Hosts ("host:port") to record or replay (default: the base URL's host)
+    """
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"Unknown transport mode {mode!r}; use one of {', '.join(TRANSPORT_MODES)}")
+    _install(mode, None if mode == "live" else CassetteLibrary(directory), hosts)
+    if mode != "live":
+        logger.info(f"Using {mode} transport with cassettes in {directory}")
+
+
+def _install(mode, library, hosts):
+    global _mode, _library, _hosts
+    _mode, _library, _hosts = mode, library, hosts
+    if mode == "record":
+        set_transport_adapter(lambda: RecordingAdapter(library, hosts))
+    elif mode == "replay":
+        set_transport_adapter(lambda: ReplayAdapter(library, hosts))
+    else:
+        set_transport_adapter(None)
+
+
+@contextmanager
+def transport(mode, directory, hosts=None):
+    """
+    Use a transport mode inside the block and go back to the previous one after it.
+
+    Example:
+        with transport("record", tmp_dir, hosts=[stub_host]):
+            send_request("GET", url)
+            save_cassettes()
+    """
+    previous = (_mode, _library, _hosts)
+    use_transport(mode, directory, hosts)
+    try:
+        yield _library
+    finally:
+        _install(*previous)
+
+
+def save_cassettes():
+    """Write recorded cassettes (only does something in record mode)"""
+    if _mode == "record" and any(cassette.interactions for cassette in _library.cassettes.values()):
+        _library.save()
@@ -0,0 +1,234 @@
+from collections import deque
+
+# Phrase target meaning "each paragraph of every section", and paragraph count key meaning
+# "every section not named" (see DocumentSpec)
+EVERY_PARAGRAPH = "*"
+EVERY_SECTION = "*"
+
+# Phrase count from which the automaton is faster than a substring search per phrase. Python
+# steps the automaton one character at a time (about 0.1 µs each) while `in` runs in C, so
+# below this many phrases searching for each one is quicker (measured on a 1.4 MB text).
+AUTOMATON_MIN_PHRASES = 200
+
+# Joins texts that are searched together; phrases cannot span it
+TEXT_SEPARATOR = "\x00"
+
+
+class DocumentContentError(AssertionError):
+    """A document is missing sections or phrases; the message lists every problem found"""
+
+
+class PhraseMatcher:
+    """
+    Finds which of a set of phrases occur in a text, in one pass over the text.
+
+    With AUTOMATON_MIN_PHRASES or more phrases, an Aho–Corasick automaton is built over
+    all of them once, so scanning costs one step per character however many phrases there
+    are. Transitions through failure links are worked out on first use and kept, which
+    makes the scan a dict lookup per character. Fewer phrases are each searched for in
+    the joined texts, which is faster than stepping through the text in Python.
+
+    Parameters:
+        phrases (iterable): Phrases to look for
+        ignore_case (bool): Match phrases whatever their case
+        use_automaton (bool): Force the automaton on or off (default: by the number of phrases)
+
+    Example:
+        matcher = PhraseMatcher(["AS IS", "IN NO EVENT"])
+        matcher.missing(paragraphs)  # ['IN NO EVENT'] if no paragraph contains it
+    """
+
+    def __init__(self, phrases, ignore_case=False, use_automaton=None):
+        self.phrases = list(dict.fromkeys(phrases))
+        self.ignore_case = ignore_case
+        self.all_found = (1 << len(self.phrases)) - 1
+        self._folded = [self._fold(phrase) for phrase in self.phrases]
+        if not all(self._folded) or any(TEXT_SEPARATOR in phrase for phrase in self._folded):
+            raise ValueError("Phrases must not be empty or contain NUL characters")
+        if use_automaton is None:
+            use_automaton = len(self.phrases) >= AUTOMATON_MIN_PHRASES
+        self._delta = None
+        if use_automaton:
+            self._build_automaton()
+
+    def _build_automaton(self):
+        # Trie of the phrases; outputs[state] has bit i set if phrase i ends in that state
+        goto, outputs = [{}], [0]
+        for index, phrase in enumerate(self._folded):
+            state = 0
+            for char in phrase:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(0)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state] |= 1 << index
+
+        # Failure links, breadth first, so each state also reports the phrases ending in its suffixes
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+                outputs[child] |= outputs[fail[child]]
+                queue.append(child)
+
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+        self._delta = [dict(transitions) for transitions in goto]
+
+    def _fold(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def _step(self, state, char):
+        """Work out and keep the transition of `state` on `char`"""
+        link = state
+        while link and char not in self._goto[link]:
+            link = self._fail[link]
+        target = self._goto[link].get(char, 0)
+        self._delta[state][char] = target
+        return target
+
+    def find(self, text, found=0):
+        """
+        Return the phrases found in `text` as a bit mask (bit i: phrase i).
+
+        Parameters:
+            text (str): Text to scan
+            found (int): Phrases already found elsewhere; the scan stops once all are found
+        """
+        if found == self.all_found:
+            return found
+        text = self._fold(text)
+        if self._delta is None:
+            for index, phrase in enumerate(self._folded):
+                if not found >> index & 1 and phrase in text:
+                    found |= 1 << index
+            return found
+        delta, outputs, step, all_found = self._delta, self._outputs, self._step, self.all_found
+        state = 0
+        for char in text:
+            next_state = delta[state].get(char)
+            state = step(state, char) if next_state is None else next_state
+            if outputs[state]:
+                found |= outputs[state]
+                if found == all_found:
+                    break
+        return found
+
+    def missing(self, texts):
+        """Return the phrases that occur in none of `texts`, in the order they were given"""
+        found = self.find(TEXT_SEPARATOR.join(texts))
+        return [phrase for index, phrase in enumerate(self.phrases) if not found >> index & 1]
+
+
+class DocumentSpec:
+    """
+    What a get_documents_by_section document has to contain.
+
+    check() goes over the whole document and returns every problem, so one failed run
+    shows all missing sections and phrases. Phrases are grouped per target and searched
+    with one PhraseMatcher each, so each paragraph is scanned once per target however
+    many phrases it needs. Phrase targets are:
+        "Section name"            the phrase is in at least one paragraph of the section
+        ("Section name", 0)       the phrase is in that paragraph of the section
+        EVERY_PARAGRAPH           the phrase is in each paragraph of every section
+
+    Parameters:
+        name (str): Document name used in problem messages, e.g. "EULA"
+        title (str): Exact title
+        title_phrases (list): Phrases the title has to contain
+        sections (list): Sections the document has to have
+        only_sections (bool): Also report sections that are not in `sections`
+        paragraph_counts (dict): {section or EVERY_SECTION: number of paragraphs}
+        content (dict): {section: exact list of paragraphs}
+        phrases (dict): {target: [phrases]}, matched with their case
+        phrases_ignore_case (dict): {target: [phrases]}, matched whatever their case
+        allow_empty_paragraphs (bool): Whether empty paragraphs are allowed
+
+    Example:
+        spec = DocumentSpec("EULA", sections=["Introduction", "Disclaimers"],
+                            phrases={("Introduction", 0): ["Jump IQ, Inc."], "Disclaimers": ["AS IS"]})
+        spec.validate(response.json())  # raises DocumentContentError listing every problem
+    """
+
+    def __init__(self, name, title=None, title_phrases=(), sections=(), only_sections=False, paragraph_counts=None,
+                 content=None, phrases=None, phrases_ignore_case=None, allow_empty_paragraphs=True):
+        self.name = name
+        self.title = title
+        self.title_matcher = PhraseMatcher(title_phrases) if title_phrases else None
+        self.sections = list(sections)
+        self.only_sections = only_sections
+        self.paragraph_counts = dict(paragraph_counts or {})
+        self.content = dict(content or {})
+        self.allow_empty_paragraphs = allow_empty_paragraphs
+        # One matcher per target and case mode
+        self.matchers = [(target, PhraseMatcher(target_phrases, ignore_case))
+                         for ignore_case, targets in ((False, phrases), (True, phrases_ignore_case))
+                         for target, target_phrases in (targets or {}).items() if target_phrases]
+
+    def check(self, data):
+        """
+        Return every problem with a document, as text lines (empty if it is as expected).
+
+        Parameters:
+            data (dict): Parsed get_documents_by_section response with "Title" and "Sections"
+        """
+        problems = []
+        title = data.get("Title") or ""
+        if self.title is not None and title != self.title:
+            problems.append(f"title is {title!r}, expected {self.title!r}")
+        if self.title_matcher is not None:
+            problems.extend(f"title {title!r} is missing {phrase!r}" for phrase in self.title_matcher.missing([title]))
+
+        sections = data.get("Sections") or {}
+        problems.extend(f"missing section {section!r}" for section in self.sections if section not in sections)
+        if self.only_sections:
+            expected = set(self.sections)
+            problems.extend(f"unexpected section {section!r}" for section in sections if section not in expected)
+
+        default_count = self.paragraph_counts.get(EVERY_SECTION)
+        for section, paragraphs in sections.items():
+            count = self.paragraph_counts.get(section, default_count)
+            if count is not None and len(paragraphs) != count:
+                problems.append(f"section {section!r} has {len(paragraphs)} paragraphs, expected {count}")
+        for section, paragraphs in self.content.items():
+            if section in sections and sections[section] != paragraphs:
+                problems.append(f"section {section!r} content mismatch: {sections[section]!r} != {paragraphs!r}")
+        if not self.allow_empty_paragraphs:
+            problems.extend(f"empty paragraph {index} in section {section!r}"
+                            for section, paragraphs in sections.items()
+                            for index, paragraph in enumerate(paragraphs) if not paragraph)
+
+        for target, matcher in self.matchers:
+            problems.extend(self._check_phrases(target, matcher, sections))
+        return problems
+
+    def validate(self, data):
+        """Raise DocumentContentError listing every problem with a document"""
+        problems = self.check(data)
+        if problems:
+            raise DocumentContentError(f"{self.name}: {len(problems)} problem(s)\n" + "\n".join(
+                f"  - {problem}" for problem in problems))
+
+    @staticmethod
+    def _check_phrases(target, matcher, sections):
+        if target == EVERY_PARAGRAPH:
+            return [f"section {section!r} paragraph {index} is missing {phrase!r}"
+                    for section, paragraphs in sections.items()
+                    for index, paragraph in enumerate(paragraphs)
+                    for phrase in matcher.missing([paragraph])]
+        if isinstance(target, tuple):
+            section, index = target
+            paragraphs = sections.get(section) or []
+            if index >= len(paragraphs):
+                # A missing section is reported already
+                return [f"section {section!r} has no paragraph {index}"] if section in sections else []
+            return [f"section {section!r} paragraph {index} is missing {phrase!r}"
+                    for phrase in matcher.missing([paragraphs[index]])]
+        if target not in sections:
+            return []
+        return [f"section {target!r} is missing {phrase!r}" for phrase in matcher.missing(sections[target])]
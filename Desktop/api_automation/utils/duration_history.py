@@ -0,0 +1,135 @@
+import json
+import os
+import statistics
+from collections import OrderedDict
+
+from config.config import RESPONSE_CACHE_ENDPOINTS, SCHEDULE_AFFINITY_FIXTURES, TEST_DURATIONS_FILE
+
+# Cost of a test that has no recorded duration yet, when nothing is recorded at all
+DEFAULT_COST = 1.0
+
+
+class DurationHistory:
+    """
+    Wall time of every test in earlier runs, kept in a JSON file.
+
+    For each test node id the file holds the wall time (setup, call and teardown),
+    the part of it spent in send_request, the session-scoped fixtures the test uses
+    and the URL paths it requested. Times are smoothed over runs, so one slow run does
+    not reorder the suite.
+
+    Parameters:
+        path (str): Location of the history file
+        smoothing (float): Weight of the newest run in the smoothed times (1: only the newest run)
+
+    Example:
+        history = DurationHistory().load()
+        history.update("tests/test_eula.py::test_get_eula_content", duration=0.8, network=0.7)
+        history.save()
+    """
+
+    def __init__(self, path=TEST_DURATIONS_FILE, smoothing=0.5):
+        self.path = path
+        self.smoothing = smoothing
+        self.tests = {}
+
+    def load(self):
+        try:
+            with open(self.path) as history_file:
+                self.tests = json.load(history_file)
+        except (OSError, ValueError):
+            self.tests = {}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as history_file:
+            json.dump(dict(sorted(self.tests.items())), history_file, indent=1)
+        os.replace(temp_path, self.path)
+
+    def update(self, nodeid, duration, network=0.0, fixtures=(), endpoints=()):
+        """Add the times of one run of a test"""
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            entry = self.tests[nodeid] = {"duration": duration, "network": network, "runs": 0}
+        else:
+            entry["duration"] += self.smoothing * (duration - entry["duration"])
+            entry["network"] += self.smoothing * (network - entry.get("network", 0.0))
+        entry["duration"] = round(entry["duration"], 4)
+        entry["network"] = round(entry["network"], 4)
+        entry["fixtures"] = sorted(fixtures)
+        entry["endpoints"] = sorted(endpoints)
+        entry["runs"] += 1
+
+    def default_cost(self):
+        """Cost used for tests without history: the median of the recorded tests"""
+        durations = [entry["duration"] for entry in self.tests.values()]
+        return statistics.median(durations) if durations else DEFAULT_COST
+
+    def cost(self, nodeid, default=None):
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            return self.default_cost() if default is None else default
+        return entry["duration"]
+
+    def resources(self, nodeid):
+        """Return the session fixtures and URL paths a test used"""
+        entry = self.tests.get(nodeid, {})
+        return entry.get("fixtures", []) + entry.get("endpoints", [])
+
+
+def plan_work_units(nodeids, history, workers, affinity=SCHEDULE_AFFINITY_FIXTURES + RESPONSE_CACHE_ENDPOINTS):
+    """
+    Split tests into work units and order them longest first, for LPT scheduling.
+
+    Tests that use the same `affinity` resource (by the history) are kept together, so a
+    session fixture is set up, and a cacheable endpoint fetched (see --response-cache), on
+    as few workers as possible; a test using several is grouped by the first one listed.
+    A group is split into several units when it would take longer than an even share of
+    the suite (total cost / workers), so one group cannot keep the other workers waiting.
+    Every other test is a unit on its own. Units keep the collection order of their tests.
+
+    Parameters:
+        nodeids (list): Collected test node ids, in collection order
+        history (DurationHistory): Recorded test times
+        workers (int): Number of xdist workers
+        affinity (list): Session fixture names and URL paths whose tests should share a worker
+
+    Returns:
+        list: (unit name, [node ids], cost in seconds) tuples, most expensive first
+    """
+    default = history.default_cost()
+    costs = {nodeid: history.cost(nodeid, default) for nodeid in nodeids}
+    share = sum(costs.values()) / max(workers, 1)
+
+    groups = OrderedDict()
+    for nodeid in nodeids:
+        used = history.resources(nodeid)
+        resource = next((name for name in affinity if name in used), None)
+        groups.setdefault(f"shared:{resource}" if resource else nodeid, []).append(nodeid)
+
+    units = []
+    for name, members in groups.items():
+        if len(members) == 1:
+            units.append((name, members, costs[members[0]]))
+            continue
+        part, chunk, chunk_cost = 0, [], 0.0
+        for nodeid in members:
+            if chunk and chunk_cost + costs[nodeid] > share:
+                units.append((f"{name}#{part}", chunk, chunk_cost))
+                part, chunk, chunk_cost = part + 1, [], 0.0
+            chunk.append(nodeid)
+            chunk_cost += costs[nodeid]
+        units.append((f"{name}#{part}", chunk, chunk_cost))
+
+    units.sort(key=lambda unit: unit[2], reverse=True)
+    return units
+
+
+def estimate_makespan(units, workers):
+    """Return the finish time of the slowest worker when units are handed out in order to the first free worker"""
+    finish = [0.0] * max(workers, 1)
+    for _, _, cost in units:
+        finish[finish.index(min(finish))] += cost
+    return max(finish)
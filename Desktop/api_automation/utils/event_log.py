@@ -0,0 +1,285 @@
+"""
+JSON-lines event log of every send_request exchange, and a summary of event log files.
+
+Usage:
+    python -m utils.event_log reports/events/*.jsonl
+    python -m utils.event_log reports/events/ --sort p99 --top 20
+    python -m utils.event_log nightly/*.jsonl.gz --json reports/event_summary.json
+"""
+import argparse
+import glob
+import gzip
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+from config.config import EVENT_LOG_BATCH_SIZE, EVENT_LOG_FLUSH_SECONDS
+from utils.logger import RUN_TIMESTAMP_VAR
+
+
+def event_from_record(record):
+    """Return the compact event dict written for a RequestRecord (unset fields are left out)"""
+    event = {
+        "ts": round(time.time(), 3),
+        "test": record.test_id,
+        "method": record.method,
+        "endpoint": record.endpoint,
+        "status": record.status,
+        "error": record.error,
+        "total_ms": round(record.total_ms, 2),
+        "ttfb_ms": round(record.ttfb_ms, 2) if record.ttfb_ms is not None else None,
+        "connect_ms": round(record.connect_ms, 2) if record.connect_ms is not None else None,
+        "tls_ms": round(record.tls_ms, 2) if record.tls_ms is not None else None,
+        "new_connection": record.new_connection,
+        "request_bytes": record.request_bytes,
+        "response_bytes": record.response_bytes,
+        "retries": record.retries,
+        "response_hash": record.response_hash,
+    }
+    return {key: value for key, value in event.items() if value is not None}
+
+
+class EventLog:
+    """
+    Request listener that appends one JSON line per exchange to a file.
+
+    Lines are buffered in memory and written in batches, when `batch_size` lines are
+    waiting or `flush_seconds` have passed since the last write, and on close().
+
+    Parameters:
+        path (str): File to append to
+        batch_size (int): Lines kept in memory before writing
+        flush_seconds (float): Longest time a line waits in memory while requests keep coming
+
+    Example:
+        event_log = EventLog("reports/events/events.jsonl")
+        add_request_listener(event_log.record)
+    """
+
+    def __init__(self, path, batch_size=EVENT_LOG_BATCH_SIZE, flush_seconds=EVENT_LOG_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.events = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, record):
+        line = json.dumps(event_from_record(record), separators=(",", ":"))
+        with self._lock:
+            self._buffer.append(line)
+            self.events += 1
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds:
+                self._write()
+
+    def _write(self):
+        if self._buffer:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def close(self):
+        with self._lock:
+            self._write()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def event_log_path(directory):
+    """Return the event log file of this process, named like the log file (events_<timestamp>_gw3.jsonl)"""
+    timestamp = os.environ.get(RUN_TIMESTAMP_VAR, time.strftime("%Y-%m-%d_%H-%M-%S"))
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    suffix = f"_{worker}" if worker else ""
+    return os.path.join(directory, f"events_{timestamp}{suffix}.jsonl")
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with logarithmic buckets, so percentiles of any number of values
+    fit in constant memory. Buckets are about 2% wide, which bounds the percentile error.
+    """
+
+    BUCKETS_PER_E = 50
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+
+    def add(self, value_ms):
+        bucket = int(math.log1p(max(value_ms, 0.0)) * self.BUCKETS_PER_E)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def percentile(self, pct):
+        if not self.count:
+            return None
+        target = pct / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return math.expm1((bucket + 0.5) / self.BUCKETS_PER_E)
+        return math.expm1((max(self.counts) + 0.5) / self.BUCKETS_PER_E)
+
+
+class EndpointStats:
+    """Running totals of the events of one endpoint"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.new_connections = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.statuses = {}
+        self.histogram = LatencyHistogram()
+
+    def add(self, event):
+        total_ms = event.get("total_ms", 0.0)
+        status = event.get("status")
+        self.count += 1
+        if event.get("error") or (status or 0) >= 500:
+            self.errors += 1
+        self.retries += event.get("retries", 0)
+        self.new_connections += 1 if event.get("new_connection") else 0
+        self.request_bytes += event.get("request_bytes", 0)
+        self.response_bytes += event.get("response_bytes", 0)
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        key = str(status) if status is not None else "error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.histogram.add(total_ms)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "new_connections": self.new_connections,
+            "mean_ms": round(self.total_ms / self.count, 1),
+            "p50_ms": round(self.histogram.percentile(50), 1),
+            "p90_ms": round(self.histogram.percentile(90), 1),
+            "p99_ms": round(self.histogram.percentile(99), 1),
+            "max_ms": round(self.max_ms, 1),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "avg_response_bytes": round(self.response_bytes / self.count),
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+def expand_paths(paths):
+    """Turn files, directories and glob patterns into a sorted list of event log files"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "*.jsonl")) + glob.glob(os.path.join(path, "*.jsonl.gz")))
+        else:
+            files.extend(glob.glob(path) or [path])
+    return sorted(set(files))
+
+
+def read_events(path):
+    """Yield the events of one file (plain or gzipped), one line at a time; bad lines yield None"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as events_file:
+        for line in events_file:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def aggregate(paths):
+    """
+    Stream over event log files and return per-endpoint stats.
+
+    Returns:
+        tuple: ({"GET /api/factor": EndpointStats, ...}, number of unreadable lines)
+    """
+    endpoints = {}
+    bad_lines = 0
+    for path in expand_paths(paths):
+        for event in read_events(path):
+            if event is None:
+                bad_lines += 1
+                continue
+            key = f"{event.get('method')} {event.get('endpoint')}"
+            stats = endpoints.get(key)
+            if stats is None:
+                stats = endpoints[key] = EndpointStats()
+            stats.add(event)
+    return endpoints, bad_lines
+
+
+def format_summary(summary):
+    """Return the per-endpoint summary as text table lines"""
+    if not summary:
+        return []
+    width = max(len(key) for key in summary)
+    lines = [f"{'endpoint':<{width}}  {'count':>8}  {'p50':>8}  {'p90':>8}  {'p99':>8}  {'max':>8}  "
+             f"{'errors':>6}  {'retries':>7}  {'avg size':>9}"]
+    for key, stats in summary.items():
+        lines.append(
+            f"{key:<{width}}  {stats['count']:>8}  {stats['p50_ms']:>6.1f}ms  {stats['p90_ms']:>6.1f}ms  "
+            f"{stats['p99_ms']:>6.1f}ms  {stats['max_ms']:>6.1f}ms  {stats['errors']:>6}  {stats['retries']:>7}  "
+            f"{stats['avg_response_bytes']:>8}B"
+        )
+    return lines
+
+
+SORT_KEYS = {"count": "count", "p50": "p50_ms", "p90": "p90_ms", "p99": "p99_ms", "max": "max_ms",
+             "errors": "errors", "bytes": "response_bytes"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.event_log",
+                                     description="Summarise request event logs per endpoint")
+    parser.add_argument("paths", nargs="+", help="Event log files, directories or glob patterns (.jsonl or .jsonl.gz)")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="p99", help="Sort endpoints by this column (default: p99)")
+    parser.add_argument("--top", type=int, help="Only show this many endpoints")
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    endpoints, bad_lines = aggregate(args.paths)
+    if not endpoints:
+        print("No events found", file=sys.stderr)
+        return 1
+
+    summary = {key: stats.to_dict() for key, stats in endpoints.items()}
+    ordered = sorted(summary.items(), key=lambda item: item[1][SORT_KEYS[args.sort]], reverse=True)
+    summary = dict(ordered[:args.top] if args.top else ordered)
+    for line in format_summary(summary):
+        print(line)
+    if bad_lines:
+        print(f"Skipped {bad_lines} unreadable lines", file=sys.stderr)
+    if args.json_path:
+        with open(args.json_path, "w") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
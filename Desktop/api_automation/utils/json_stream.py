@@ -0,0 +1,208 @@
+import codecs
+import json
+
+from config.config import STREAM_CHUNK_SIZE
+from utils.logger import get_logger
+from utils.request_handler import send_request
+
+# Initialize logger for streamed responses
+logger = get_logger()
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonStreamError(ValueError):
+    """Raised when a streamed body is not valid JSON or does not have the expected shape"""
+
+
+class _IncompleteValue(Exception):
+    """The buffer ends before the value does; more data is needed"""
+
+
+class ResultStream:
+    """
+    Parses the items of one list in a JSON response while the body is downloaded.
+
+    Only the unread part of the current chunk and the item being parsed are held in
+    memory, so memory stays the same for any page size, and the first item can be
+    checked before the rest of the body has arrived. The other top-level keys of the
+    body (e.g. "total" and "pages") are collected in `envelope` as they are passed.
+
+    Validators are called with each item, in order, before it is yielded. The first
+    one that raises AssertionError stops the download; the error names the item index.
+
+    Parameters:
+        response (requests.Response): Response sent with stream=True
+        key (str): Top-level key of the list to stream, or None if the body itself is a list
+        validators (list): Callables that get each item and raise AssertionError if it is bad
+        chunk_size (int): Bytes read from the connection at a time
+
+    Example:
+        with ResultStream(response, validators=[lambda item: item["id"] > 0]) as results:
+            for item in results:
+                ...
+        print(results.count, results.envelope["total"])
+    """
+
+    def __init__(self, response, key="results", validators=(), chunk_size=STREAM_CHUNK_SIZE):
+        self.response = response
+        self.key = key
+        self.validators = list(validators)
+        self.envelope = {}
+        self.count = 0
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+        self._decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop reading and give the connection back to the pool"""
+        self.response.close()
+
+    def __iter__(self):
+        try:
+            yield from self._parse()
+        finally:
+            self.close()
+
+    def _read(self):
+        """Append the next chunk to the buffer; return False at the end of the body"""
+        if self._eof:
+            return False
+        # Drop what was parsed, so the buffer only holds unread text
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+        self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it ("" at the end)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def _expect(self, characters):
+        character = self._peek()
+        if character not in characters or not character:
+            found = repr(character) if character else "end of body"
+            raise JsonStreamError(f"Expected one of {characters!r} at offset {self._pos}, found {found}")
+        self._pos += 1
+        return character
+
+    def _value(self):
+        """Decode one complete JSON value at the current position, reading more chunks as needed"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may go on in the next chunk
+                if end == len(self._buffer) and not self._eof:
+                    raise _IncompleteValue
+            except (json.JSONDecodeError, _IncompleteValue) as error:
+                if self._read() or isinstance(error, _IncompleteValue):
+                    continue
+                raise JsonStreamError(f"Invalid JSON in streamed body: {error}") from None
+            break
+        self._pos = end
+        return value
+
+    def _parse(self):
+        if self.key is None:
+            yield from self._items()
+            self._end()
+            return
+
+        found = False
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            while True:
+                name = self._value()
+                self._expect(":")
+                if name == self.key and self._peek() == "[":
+                    found = True
+                    yield from self._items()
+                else:
+                    self.envelope[name] = self._value()
+                if self._expect(",}") == "}":
+                    break
+        self._end()
+        if self.key in self.envelope:
+            raise JsonStreamError(f"{self.key!r} is not a list: {str(self.envelope[self.key])[:200]}")
+        if not found:
+            raise JsonStreamError(f"Response has no {self.key!r} list, only {', '.join(self.envelope) or 'nothing'}")
+
+    def _items(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            item = self._value()
+            for validator in self.validators:
+                try:
+                    validator(item)
+                except AssertionError as error:
+                    location = f"{self.key}[{self.count}]" if self.key else f"[{self.count}]"
+                    logger.error(f"Stopped streaming {self.response.url} at {location}: {error}")
+                    raise type(error)(f"{location}: {error}") from error
+            self.count += 1
+            yield item
+            if self._expect(",]") == "]":
+                return
+
+    def _end(self):
+        if self._peek():
+            raise JsonStreamError(f"Unexpected data after the JSON body at offset {self._pos}")
+
+
+def stream_results(method, url, key="results", validators=(), chunk_size=STREAM_CHUNK_SIZE, **kwargs):
+    """
+    Send a request with a streamed body and return a ResultStream over one of its lists.
+
+    Parameters:
+        method (str): HTTP method
+        url (str): The URL to send the request to
+        key (str): Top-level key of the list to stream ("results" for paginated endpoints), or None
+        validators (list): Callables run on every item before it is yielded
+        chunk_size (int): Bytes read from the connection at a time
+        **kwargs: Additional arguments for send_request (headers, params, timeout, ...)
+
+    Returns:
+        ResultStream: Iterate it to get the items; `envelope` holds the other keys
+
+    Raises:
+        JsonStreamError: If the status code is not 200 or the body is not the expected JSON
+
+    Example:
+        results = stream_results("GET", factor_list.url(), params={"perPage": 5000},
+                                 headers={"Authorization": token},
+                                 validators=[item_validator("factor_list")])
+        ids = [factor["id"] for factor in results]
+        assert len(ids) == results.envelope["total"]
+    """
+    response = send_request(method, url, stream=True, **kwargs)
+    if response.status_code != 200:
+        body = response.text[:200]
+        response.close()
+        raise JsonStreamError(f"{method} {url} failed with status code {response.status_code}: {body}")
+    return ResultStream(response, key=key, validators=validators, chunk_size=chunk_size)
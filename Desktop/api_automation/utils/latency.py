@@ -0,0 +1,131 @@
+import time
+
+from utils.logger import get_logger
+from utils.metrics import endpoint_template, percentile
+from utils.request_handler import send_request
+from utils.retry_policy import NO_RETRIES
+
+# Initialize logger for latency checks
+logger = get_logger()
+
+# Only requests without side effects are sent again to measure latency
+REPLAYABLE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Percentile budgets the latency marker understands, as (marker argument, percentile)
+BUDGETS = [("p50_ms", 50), ("p90_ms", 90), ("p95_ms", 95), ("p99_ms", 99), ("max_ms", 100)]
+
+DEFAULT_SAMPLES = 20
+DEFAULT_WARMUP = 2
+
+
+def measure_latency(method, url, samples=DEFAULT_SAMPLES, warmup=DEFAULT_WARMUP, **kwargs):
+    """
+    Send the same request `warmup + samples` times and return the sample timings.
+
+    Warm-up requests open connections and fill server caches; their timings are
+    discarded. Requests are sent once each (no retries, not from the response cache)
+    so retries and cache hits do not hide latency.
+
+    Parameters:
+        method (str): HTTP method to use
+        url (str): The URL to send the request to
+        samples (int): Number of timed requests
+        warmup (int): Number of untimed requests sent first
+        **kwargs: Additional arguments for send_request
+
+    Returns:
+        list: Sorted request times in milliseconds
+
+    Raises:
+        ValueError: If samples is less than 1
+    """
+    if samples < 1:
+        raise ValueError(f"Latency needs at least one sample, got samples={samples}")
+    kwargs["retry_policy"] = NO_RETRIES
+    kwargs["cache"] = False
+    timings = []
+    for iteration in range(warmup + samples):
+        start = time.perf_counter()
+        send_request(method, url, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if iteration >= warmup:
+            timings.append(elapsed_ms)
+    return sorted(timings)
+
+
+def format_histogram(timings, buckets=10, width=40):
+    """Return text lines with a histogram of the timings in milliseconds"""
+    if not timings:
+        return []
+    low, high = timings[0], timings[-1]
+    step = (high - low) / buckets or 1.0
+    counts = [0] * buckets
+    for value in timings:
+        counts[min(int((value - low) / step), buckets - 1)] += 1
+
+    lines = []
+    largest = max(counts)
+    for index, count in enumerate(counts):
+        start = low + index * step
+        bar = "#" * max(round(count / largest * width), 1 if count else 0)
+        lines.append(f"{start:>9.1f} - {start + step:>9.1f} ms | {bar} {count}")
+    return lines
+
+
+def check_latency_budget(captured, samples=DEFAULT_SAMPLES, warmup=DEFAULT_WARMUP, **budgets):
+    """
+    Measure every distinct request a test sent and compare it with the budgets.
+
+    Parameters:
+        captured (list): (method, url, kwargs) tuples from capture_requests()
+        samples (int): Number of timed requests per distinct request
+        warmup (int): Number of untimed requests sent first
+        **budgets: Limits in milliseconds, any of p50_ms, p90_ms, p95_ms, p99_ms, max_ms
+
+    Returns:
+        list: Failure messages (with histograms); empty if every budget was met
+
+    Raises:
+        ValueError: For unknown or missing budgets, or samples less than 1
+    """
+    unknown = set(budgets) - {name for name, _ in BUDGETS}
+    if unknown:
+        raise ValueError(f"Unknown latency budget(s): {', '.join(sorted(unknown))}")
+    if not budgets:
+        raise ValueError("The latency marker needs at least one budget, e.g. p95_ms=300")
+    if samples < 1:
+        raise ValueError(f"The latency marker needs at least one sample, got samples={samples}")
+
+    # Measure each distinct request once, even if the test sent it several times
+    distinct = {}
+    for method, url, kwargs in captured:
+        if method.upper() not in REPLAYABLE_METHODS:
+            continue
+        # params may be a dict or a list of (name, value) pairs, as in requests
+        params = kwargs.get("params") or {}
+        items = params.items() if isinstance(params, dict) else params
+        key = (method.upper(), url, repr(sorted((str(name), str(value)) for name, value in items)))
+        distinct.setdefault(key, (method, url, kwargs))
+    if not distinct:
+        return ["The test sent no GET, HEAD or OPTIONS requests to measure"]
+
+    failures = []
+    for method, url, kwargs in distinct.values():
+        name = f"{method.upper()} {endpoint_template(url, kwargs.get('params'))}"
+        timings = measure_latency(method, url, samples=samples, warmup=warmup, **kwargs)
+
+        results = {budget: percentile(timings, pct) for budget, pct in BUDGETS}
+        logger.info(f"Latency of {name} over {samples} samples: "
+                    + ", ".join(f"{budget[:-3]}={value:.1f} ms" for budget, value in results.items()))
+
+        exceeded = [
+            f"{budget[:-3]} {results[budget]:.1f} ms > {limit} ms"
+            for budget, limit in budgets.items()
+            if results[budget] > limit
+        ]
+        if exceeded:
+            failures.append("\n".join(
+                [f"Latency budget exceeded for {name} ({samples} samples, {warmup} warm-up): {'; '.join(exceeded)}"]
+                + format_histogram(timings)
+            ))
+    return failures
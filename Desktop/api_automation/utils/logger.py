@@ -1,11 +1,149 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
 from datetime import datetime
 
+from config.config import LOG_BACKUP_COUNT, LOG_FORMAT, LOG_JSON, LOG_LEVEL, LOG_MAX_BYTES, LOGS_DIR
+
+# Shared by the controller and its xdist workers (which inherit the environment),
+# so all log files of one run get the same timestamp
+RUN_TIMESTAMP_VAR = "TEST_LOG_TIMESTAMP"
+
+# Log files of one run: test_log_<timestamp>[_<worker>].<log|jsonl>[.<rotation>]
+LOG_FILE_PATTERN = re.compile(r"^test_log_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})(?:_\w+)?\.(?:log|jsonl)(?:\.\d+)?$")
+
+# Listener writing queued records to the log file, and the process it belongs to
+_listener = None
+_listener_pid = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The standard handler formats and copies every record on the calling thread; this
+    one only merges the message arguments, since they may change before the listener
+    gets to the record.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "master"),
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def log_file_path():
+    """
+    Return the log file of this process: logs/test_log_<timestamp>.log, with the
+    xdist worker id added for workers (test_log_<timestamp>_gw3.log).
+    """
+    timestamp = os.environ.setdefault(RUN_TIMESTAMP_VAR, datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    suffix = f"_{worker}" if worker else ""
+    extension = "jsonl" if LOG_JSON else "log"
+    return os.path.join(LOGS_DIR, f"test_log_{timestamp}{suffix}.{extension}")
+
+
+def prune_logs(keep_runs, logs_dir=LOGS_DIR):
+    """
+    Delete the log files of all but the newest `keep_runs` earlier runs.
+
+    A run's files share its timestamp (controller, xdist workers and rotated files),
+    so they are kept or deleted together. The files of the current run are never deleted.
+
+    Returns:
+        int: Number of files deleted
+    """
+    if keep_runs <= 0 or not os.path.isdir(logs_dir):
+        return 0
+    current = os.environ.get(RUN_TIMESTAMP_VAR)
+    runs = {}
+    for name in os.listdir(logs_dir):
+        match = LOG_FILE_PATTERN.match(name)
+        if match and match.group(1) != current:
+            runs.setdefault(match.group(1), []).append(name)
+    deleted = 0
+    # Timestamps sort by time
+    for timestamp in sorted(runs)[:-keep_runs]:
+        for name in runs[timestamp]:
+            try:
+                os.remove(os.path.join(logs_dir, name))
+                deleted += 1
+            except OSError:
+                pass
+    return deleted
+
+
+def setup_logging():
+    """
+    Send log records through a queue to a size-rotated file, once per process.
+
+    The root logger only gets a QueueHandler, so logging calls on test threads just
+    put the record on a queue; a QueueListener thread formats it and writes the file.
+    The listener is flushed and stopped when the process exits.
+    """
+    global _listener, _listener_pid, _queue_handler
+    if _listener_pid == os.getpid():
+        return
+    with _setup_lock:
+        if _listener_pid == os.getpid():
+            return
+
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file_path(), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True
+        )
+        file_handler.setFormatter(JsonLinesFormatter() if LOG_JSON else logging.Formatter(LOG_FORMAT))
+
+        root = logging.getLogger()
+        if _queue_handler is not None:
+            # A forked child inherits the parent's handler but not its listener thread
+            root.removeHandler(_queue_handler)
+        records = queue.SimpleQueue()
+        _queue_handler = RecordQueueHandler(records)
+        root.addHandler(_queue_handler)
+        root.setLevel(LOG_LEVEL)
+
+        _listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+        atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _listener_pid = None
+
+
 def get_logger():
-    log_file = f'logs/test_log_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.log'
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-    )
+    setup_logging()
     return logging.getLogger()
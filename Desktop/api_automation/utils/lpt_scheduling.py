@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+from xdist.scheduler import LoadScopeScheduling
+
+from utils.duration_history import estimate_makespan, plan_work_units
+
+
+class LPTScheduling(LoadScopeScheduling):
+    """
+    xdist scheduler that hands out the longest work units first (longest processing time).
+
+    Work units come from plan_work_units(): tests grouped by shared session fixtures, and
+    ordered by the durations recorded in earlier runs. Like xdist's loadscope scheduler,
+    a worker gets its next unit when it is close to running out of tests, so the short
+    units at the end fill up the workers that finish first.
+
+    Parameters:
+        config: pytest config
+        log: xdist log producer
+        history (DurationHistory): Recorded test times
+    """
+
+    def __init__(self, config, log, history):
+        super().__init__(config, log)
+        self.history = history
+        self.unit_of = {}
+
+    def _split_scope(self, nodeid):
+        return self.unit_of.get(nodeid, nodeid)
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Nodes added later only need work
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        self.collection = list(next(iter(self.registered_collections.values())))
+        if not self.collection:
+            return
+
+        units = plan_work_units(self.collection, self.history, len(self.nodes))
+        for name, nodeids, _ in units:
+            self.workqueue[name] = OrderedDict((nodeid, False) for nodeid in nodeids)
+            for nodeid in nodeids:
+                self.unit_of[nodeid] = name
+        self.log(f"LPT schedule: {len(units)} work units, estimated makespan "
+                 f"{estimate_makespan(units, len(self.nodes)):.1f} s on {len(self.nodes)} workers")
+
+        # Shut down workers that would get nothing to do
+        for _ in range(len(self.nodes) - len(self.workqueue)):
+            unused_node, _ = self.assigned_work.popitem(last=True)
+            unused_node.shutdown()
+
+        for node in self.nodes:
+            self._assign_work_unit(node)
+        for node in self.nodes:
+            self._reschedule(node)
+        if not self.workqueue:
+            for node in self.nodes:
+                node.shutdown()
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl
+
+
+@dataclass
+class RequestRecord:
+    """
+    Timings and sizes of one send_request call (including all of its retries).
+
+    Connection timings are only set when the request opened a new connection:
+    connect_ms covers DNS lookup and TCP connect, tls_ms the TLS handshake.
+    ttfb_ms is the time from sending the last attempt until its response headers
+    were parsed, as reported by requests. response_hash is only set when response
+    hashing is enabled (see utils.request_handler.set_response_hashing).
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    status: int = None
+    error: str = None
+    test_id: str = None
+    total_ms: float = 0.0
+    ttfb_ms: float = None
+    connect_ms: float = None
+    tls_ms: float = None
+    new_connection: bool = False
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    response_hash: str = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def endpoint_template(url, params=None):
+    """
+    Turn a URL into a stable key that groups requests to the same endpoint.
+
+    Query values are dropped and only the parameter names are kept, in order, e.g.
+    'https://host/api/valuation?perPage=10&pageNo=1' -> '/api/valuation?perPage&pageNo'.
+    Numeric path segments are ids: '/api/valuation/1012' -> '/api/valuation/{id}'
+
+    Parameters:
+        url (str): Request URL, with or without a query string
+        params (dict or list): Extra query parameters passed to requests
+
+    Returns:
+        str: Path followed by the query parameter names
+    """
+    parts = urlsplit(url)
+    path = "/".join("{id}" if segment.isdigit() else segment for segment in parts.path.split("/"))
+    names = [name for name, _ in parse_qsl(parts.query, keep_blank_values=True)]
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        names.extend(name for name, _ in items)
+    # Drop repeated names but keep their first position
+    names = list(dict.fromkeys(names))
+    return f"{path or '/'}?{'&'.join(names)}" if names else (path or "/")
+
+
+def percentile(sorted_values, pct):
+    """Return the pct-th percentile of already sorted values, interpolating between ranks"""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class MetricsCollector:
+    """
+    Collects RequestRecords for a test session and summarises latency per endpoint.
+
+    Register it with utils.request_handler.add_request_listener(collector.record).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+
+    def record(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def merge(self, records):
+        """Add records received from another process (e.g. an xdist worker) as dicts"""
+        with self._lock:
+            self.records.extend(RequestRecord(**record) for record in records)
+
+    def to_list(self):
+        with self._lock:
+            return [record.to_dict() for record in self.records]
+
+    def summary(self):
+        """
+        Summarise latency, errors and sizes per method and endpoint template.
+
+        Returns:
+            dict: {"GET /api/factor": {"count": ..., "p50_ms": ..., ...}, ...}
+        """
+        with self._lock:
+            records = list(self.records)
+
+        grouped = {}
+        for record in records:
+            grouped.setdefault(f"{record.method} {record.endpoint}", []).append(record)
+
+        summary = {}
+        for key in sorted(grouped):
+            group = grouped[key]
+            totals = sorted(record.total_ms for record in group)
+            summary[key] = {
+                "count": len(group),
+                "errors": sum(1 for record in group if record.error or (record.status or 0) >= 500),
+                "retries": sum(record.retries for record in group),
+                "new_connections": sum(1 for record in group if record.new_connection),
+                "p50_ms": round(percentile(totals, 50), 1),
+                "p90_ms": round(percentile(totals, 90), 1),
+                "p99_ms": round(percentile(totals, 99), 1),
+                "max_ms": round(totals[-1], 1),
+                "request_bytes": sum(record.request_bytes for record in group),
+                "response_bytes": sum(record.response_bytes for record in group),
+            }
+        return summary
+
+    def format_summary(self):
+        """Return the summary as text table lines"""
+        summary = self.summary()
+        if not summary:
+            return []
+        width = max(len(key) for key in summary)
+        lines = [f"{'endpoint':<{width}}  {'count':>6}  {'p50':>8}  {'p90':>8}  {'p99':>8}  {'max':>8}  {'errors':>6}  {'retries':>7}"]
+        for key, stats in summary.items():
+            lines.append(
+                f"{key:<{width}}  {stats['count']:>6}  {stats['p50_ms']:>6.1f}ms  {stats['p90_ms']:>6.1f}ms  "
+                f"{stats['p99_ms']:>6.1f}ms  {stats['max_ms']:>6.1f}ms  {stats['errors']:>6}  {stats['retries']:>7}"
+            )
+        return lines
+
+    def write_json(self, path):
+        """Write the summary and all records to a JSON file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "endpoints": self.summary(),
+            "requests": self.to_list(),
+        }
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
@@ -0,0 +1,142 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from utils.logger import get_logger
+from utils.request_handler import send_request
+from utils.schema_validator import validate_response
+
+# Initialize logger for paginated requests
+logger = get_logger()
+
+# Keys of the envelope paginated endpoints (/api/valuation, /api/factor) answer with
+ENVELOPE_KEYS = ("total", "pageNo", "perPage", "pages", "results")
+
+
+class PaginationError(Exception):
+    """Raised when a page cannot be fetched or does not have the paginated envelope"""
+
+
+@dataclass
+class Page:
+    """One page of a paginated endpoint"""
+
+    number: int
+    results: list
+    total: int
+    pages: int
+
+
+class Paginator:
+    """
+    Walks every page of an endpoint that answers with the
+    {"total", "pageNo", "perPage", "pages", "results"} envelope.
+
+    Pages are fetched lazily: only the page being looked at and up to `prefetch`
+    following pages (requested concurrently in the background) are held in memory.
+    Pages that are no longer needed, e.g. after `stop_when` matched or the loop was
+    left early, are not requested.
+
+    Parameters:
+        url (str): Endpoint URL without the paging parameters
+        per_page (int): Page size to request
+        prefetch (int): Number of following pages to fetch while the current one is used (0: one at a time)
+        stop_when (callable): Stop after the first result for which this returns True
+        max_pages (int): Fetch at most this many pages
+        params (dict): Other query parameters (e.g. {"username": "mohit"})
+        schema (str): Check every page against this schema from data/schemas.py (e.g. "factor_list")
+        **kwargs: Additional arguments for send_request (headers, timeout, retry_policy, ...)
+
+    Example:
+        factors = Paginator(factor_list.url(), per_page=10, headers={"Authorization": token})
+        for factor in factors:
+            assert factor["id"] > 0
+        assert factors.fetched == factors.total
+    """
+
+    def __init__(self, url, per_page=10, prefetch=2, stop_when=None, max_pages=None, params=None, schema=None,
+                 **kwargs):
+        if prefetch < 0:
+            raise ValueError("prefetch must be 0 or more")
+        self.url = url
+        self.per_page = per_page
+        self.prefetch = prefetch
+        self.stop_when = stop_when
+        self.max_pages = max_pages
+        self.params = dict(params or {})
+        self.schema = schema
+        self.kwargs = kwargs
+        self.total = None
+        self.page_count = None
+        self.pages_fetched = 0
+        self.fetched = 0
+
+    def fetch_page(self, number):
+        """Request one page and check its envelope"""
+        params = {**self.params, "perPage": self.per_page, "pageNo": number}
+        response = send_request("GET", self.url, params=params, **self.kwargs)
+        self.pages_fetched += 1
+        if response.status_code != 200:
+            raise PaginationError(f"Page {number} of {self.url} failed with status code {response.status_code}")
+        data = response.json()
+        if self.schema:
+            validate_response(self.schema, data)
+        missing = [key for key in ENVELOPE_KEYS if not isinstance(data, dict) or key not in data]
+        if missing:
+            raise PaginationError(f"Page {number} of {self.url} is missing {', '.join(missing)}: {str(data)[:200]}")
+        return Page(number=number, results=data["results"], total=data["total"], pages=data["pages"])
+
+    def pages(self):
+        """Yield Page objects in order, fetching ahead while each page is used"""
+        current = self.fetch_page(1)
+        self.total = current.total
+        self.page_count = current.pages
+        last_page = current.pages if self.max_pages is None else min(current.pages, self.max_pages)
+
+        executor = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="paginator") if self.prefetch else None
+        pending = deque()
+        next_number = 2
+        try:
+            while True:
+                # Start the following pages before handing out this one
+                while executor and next_number <= last_page and len(pending) < self.prefetch:
+                    pending.append(executor.submit(self.fetch_page, next_number))
+                    next_number += 1
+                yield current
+
+                if pending:
+                    current = pending.popleft().result()
+                elif next_number <= last_page:
+                    current = self.fetch_page(next_number)
+                    next_number += 1
+                else:
+                    break
+                if not current.results:
+                    break
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self):
+        """Yield the results of every page, stopping after the first one matching stop_when"""
+        pages = self.pages()
+        try:
+            for page in pages:
+                for item in page.results:
+                    self.fetched += 1
+                    yield item
+                    if self.stop_when is not None and self.stop_when(item):
+                        logger.info(f"Stopped paging {self.url} at page {page.number} of {self.page_count}")
+                        return
+        finally:
+            pages.close()
+
+
+def paginate(url, per_page=10, prefetch=2, stop_when=None, **kwargs):
+    """
+    Yield every result of a paginated endpoint (see Paginator).
+
+    Example:
+        names = [factor["name"] for factor in paginate(factor_list.url(), headers=headers)]
+    """
+    return iter(Paginator(url, per_page=per_page, prefetch=prefetch, stop_when=stop_when, **kwargs))
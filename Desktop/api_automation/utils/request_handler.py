@@ -1,69 +1,550 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
 from utils.logger import get_logger
-from config.config import TEST_TIMEOUT, MAX_RETRIES
+from utils.metrics import RequestRecord, endpoint_template
+from utils.retry_policy import get_default_retry_policy, get_current_test_stats
+from config.settings import get_settings
 
 # Initialize logger for request handling
 logger = get_logger()
 
+# Per-thread connection timings of the request that is being sent
+_local = threading.local()
+
+# Functions called with a RequestRecord after every send_request call
+_request_listeners = []
+
+# Whether RequestRecords get a hash of the response body (see set_response_hashing)
+_hash_responses = False
+
+# Node id of the test that is currently running in this process
+_current_test = None
+
+# Lists collecting the arguments of every send_request call (see capture_requests)
+_captures = []
+
+# Builds the transport adapter mounted on new sessions (see set_transport_adapter)
+_adapter_factory = None
+
+# ResponseCache answering GETs of static endpoints (see enable_response_cache)
+_response_cache = None
+
+# SingleFlight sharing one request between identical concurrent reads (see enable_single_flight)
+_single_flight = None
+
+# ResourceTracker recording what the tests create (see enable_resource_tracking)
+_resource_tracker = None
+
+# The shared session for this process. Each pytest-xdist worker is a separate
+# process, so every worker gets its own connection pool.
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# Timing totals used to show how much time connection reuse saves
+_connection_stats = {
+    "new": {"count": 0, "seconds": 0.0},
+    "reused": {"count": 0, "seconds": 0.0},
+}
+_stats_lock = threading.Lock()
+
+
+def _reset_connection_timings():
+    _local.new_connections = 0
+    _local.connect_seconds = 0.0
+    _local.handshake_seconds = 0.0
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that records how long connecting took"""
+
+    def _new_conn(self):
+        # DNS lookup and TCP connect
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _local.connect_seconds = getattr(_local, "connect_seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that records how long connecting and the TLS handshake took"""
+
+    def _new_conn(self):
+        # DNS lookup and TCP connect
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _local.connect_seconds = getattr(_local, "connect_seconds", 0.0) + time.perf_counter() - start
+
+    def connect(self):
+        # TCP connect plus TLS handshake
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _local.handshake_seconds = getattr(_local, "handshake_seconds", 0.0) + time.perf_counter() - start
+
+
+class _TrackingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP pool that marks the calling thread whenever a new connection is opened"""
+
+    ConnectionCls = _TimedHTTPConnection
+
+    def _new_conn(self):
+        _local.new_connections = getattr(_local, "new_connections", 0) + 1
+        return super()._new_conn()
+
+
+class _TrackingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS pool that marks the calling thread whenever a new connection is opened"""
+
+    ConnectionCls = _TimedHTTPSConnection
+
+    def _new_conn(self):
+        _local.new_connections = getattr(_local, "new_connections", 0) + 1
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    Transport adapter with keep-alive connection pools that track connection reuse.
+
+    Parameters:
+        pool_connections (int): Number of hosts to keep connection pools for (default: from the settings)
+        pool_maxsize (int): Maximum number of keep-alive connections per host (default: from the settings)
+        pool_block (bool): Wait for a free connection instead of opening extra ones (default: from the settings)
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, pool_block=None):
+        settings = get_settings()
+        # Retries are handled by send_request, not by urllib3
+        super().__init__(
+            pool_connections=settings.pool_connections if pool_connections is None else pool_connections,
+            pool_maxsize=settings.pool_maxsize if pool_maxsize is None else pool_maxsize,
+            pool_block=settings.pool_block if pool_block is None else pool_block,
+            max_retries=0,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TrackingHTTPConnectionPool,
+            "https": _TrackingHTTPSConnectionPool,
+        }
+
+
+def _create_session():
+    """Build a keep-alive session that behaves like the one-off session of requests.request()"""
+    session = requests.Session()
+
+    # Do not carry cookies from one test to the next
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    adapter = _adapter_factory() if _adapter_factory else PooledAdapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_worker_id():
+    """Return the pytest-xdist worker id (gw0, gw1, ...) or 'master' when not running under xdist"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def get_session():
+    """
+    Return the shared pooled session for this process, creating it on first use.
+
+    A new session is created after a fork so that processes never share sockets.
+
+    Returns:
+        requests.Session: Session with keep-alive connection pools
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _create_session()
+                _session_pid = pid
+                settings = get_settings()
+                logger.info(f"Created pooled HTTP session for worker {get_worker_id()} "
+                            f"(pool_maxsize={settings.pool_maxsize}, pool_block={settings.pool_block})")
+    return _session
+
+
+def close_session():
+    """Close the shared session and all of its pooled connections"""
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def set_transport_adapter(factory):
+    """
+    Use `factory()` to build the transport adapter of the shared session.
+
+    The current session is closed so the next request uses the new adapter.
+    Pass None to go back to the default PooledAdapter.
+    """
+    global _adapter_factory
+    _adapter_factory = factory
+    close_session()
+
+
+def get_connection_stats():
+    """
+    Return request timings split by new and reused connections.
+
+    Returns:
+        dict: Counts and average milliseconds for new and reused connections, and
+              an estimate of the time saved by reusing connections
+    """
+    with _stats_lock:
+        stats = {kind: dict(values) for kind, values in _connection_stats.items()}
+
+    for values in stats.values():
+        values["avg_ms"] = (values["seconds"] / values["count"] * 1000) if values["count"] else 0.0
+
+    # Every reused request would otherwise have paid the new-connection cost
+    saved_per_request = max(stats["new"]["avg_ms"] - stats["reused"]["avg_ms"], 0.0)
+    stats["saved_ms"] = saved_per_request * stats["reused"]["count"] if stats["new"]["count"] else 0.0
+    return stats
+
+
+def get_pool_stats():
+    """
+    Return the state of the shared session's connection pools.
+
+    Returns:
+        dict: "pools" (hosts with a connection pool), "idle" (keep-alive connections waiting
+              in the pools), "opened" (connections opened by the pools so far) and
+              "requests" (requests sent through the pools so far)
+    """
+    stats = {"pools": 0, "idle": 0, "opened": 0, "requests": 0}
+    session = _session
+    if session is None or _session_pid != os.getpid():
+        return stats
+    for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+        # Adapters that do not pool connections have no pool manager
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["pools"] += 1
+            stats["opened"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+            # Free slots of the pool queue hold None
+            if pool.pool is not None:
+                stats["idle"] += sum(1 for connection in list(pool.pool.queue) if connection is not None)
+    return stats
+
+
+def add_request_listener(listener):
+    """
+    Call `listener(record)` with a RequestRecord after every send_request call.
+
+    Listeners run on the thread that sent the request and must not raise.
+    """
+    _request_listeners.append(listener)
+
+
+def remove_request_listener(listener):
+    if listener in _request_listeners:
+        _request_listeners.remove(listener)
+
+
+def set_response_hashing(enabled):
+    """Add a truncated SHA-256 of the response body to RequestRecords (off by default, it costs CPU)"""
+    global _hash_responses
+    _hash_responses = enabled
+
+
+def enable_response_cache(cache):
+    """Answer GETs of cacheable endpoints from `cache` (a ResponseCache); None turns caching off"""
+    global _response_cache
+    _response_cache = cache
+
+
+def get_response_cache():
+    """Return the ResponseCache in use, or None"""
+    return _response_cache
+
+
+def enable_single_flight(flight):
+    """Let identical concurrent reads share one request through `flight` (a SingleFlight); None turns it off"""
+    global _single_flight
+    _single_flight = flight
+
+
+def get_single_flight():
+    """Return the SingleFlight in use, or None"""
+    return _single_flight
+
+
+def enable_resource_tracking(tracker):
+    """Pass every response to `tracker.observe` (a ResourceTracker); None turns tracking off"""
+    global _resource_tracker
+    _resource_tracker = tracker
+
+
+def get_resource_tracker():
+    """Return the ResourceTracker in use, or None"""
+    return _resource_tracker
+
+
+def set_current_test(test_id):
+    """Set the node id of the running test; it is added to every RequestRecord"""
+    global _current_test
+    _current_test = test_id
+
+
+def get_current_test():
+    """Return the node id of the running test, or None outside of tests"""
+    return _current_test
+
+
+@contextmanager
+def capture_requests():
+    """
+    Collect the arguments of every send_request call made inside the block.
+
+    Example:
+        with capture_requests() as captured:
+            send_request("GET", endpoint, params={"type": "StepsOptions"})
+        method, url, kwargs = captured[0]
+    """
+    captured = []
+    _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _captures.remove(captured)
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    # Streamed or file uploads: size is not known up front
+    return 0
+
+
+def _response_size(response):
+    # Do not read streamed bodies just to measure them
+    if response._content_consumed or not response.raw:
+        return len(response.content or b"")
+    return int(response.headers.get("Content-Length") or 0)
+
+
+def _notify_listeners(method, url, params, started, attempt, response=None, error=None):
+    """Build a RequestRecord for a finished send_request call and pass it to the listeners"""
+    if not _request_listeners:
+        return
+
+    record = RequestRecord(
+        method=method.upper(),
+        url=url,
+        endpoint=endpoint_template(url, params),
+        test_id=_current_test,
+        total_ms=(time.perf_counter() - started) * 1000,
+        retries=attempt - 1,
+        new_connection=_local.new_connections > 0,
+    )
+    if _local.new_connections:
+        record.connect_ms = _local.connect_seconds * 1000
+        if _local.handshake_seconds:
+            record.tls_ms = max(_local.handshake_seconds - _local.connect_seconds, 0.0) * 1000
+    if response is not None:
+        record.status = response.status_code
+        record.ttfb_ms = response.elapsed.total_seconds() * 1000
+        record.request_bytes = _body_size(response.request.body)
+        record.response_bytes = _response_size(response)
+        if _hash_responses and response._content_consumed:
+            record.response_hash = hashlib.sha256(response.content or b"").hexdigest()[:16]
+    if error is not None:
+        record.error = f"{type(error).__name__}: {error}"
+
+    for listener in list(_request_listeners):
+        try:
+            listener(record)
+        except Exception as listener_error:
+            logger.error(f"Request listener {listener!r} failed: {listener_error}")
+
+
+def _record_connection_timing(new_connection, seconds):
+    kind = "new" if new_connection else "reused"
+    with _stats_lock:
+        _connection_stats[kind]["count"] += 1
+        _connection_stats[kind]["seconds"] += seconds
+
+
+def _key_headers(kwargs):
+    """Return the headers a request is cached and coalesced by, with the Authorization its auth object will set"""
+    headers = kwargs.get("headers") or {}
+    auth = kwargs.get("auth")
+    if auth is None:
+        return headers
+    # An AuthProvider replaces any Authorization header with its token when the request is prepared
+    get_token = getattr(auth, "get_token", None)
+    authorization = get_token() if get_token is not None else repr(auth)
+    return {**{name: value for name, value in headers.items() if name.lower() != "authorization"},
+            "Authorization": authorization}
+
+
 def send_request(method, url, **kwargs):
     """
     Send HTTP requests with retry mechanism and logging.
-    
+
     This function handles all API requests with the following features:
-    - Automatic retry on failure
+    - Automatic retry with exponential backoff (see utils/retry_policy.py)
     - Request timeout handling
+    - Keep-alive connection pooling (one pool per xdist worker)
     - Detailed logging
     - Error handling
-    
+
     Parameters:
         method (str): HTTP method to use (GET, POST, PUT, DELETE)
         url (str): The URL to send the request to
         **kwargs: Additional arguments for the request:
             - headers: Request headers
+            - auth: requests auth object, e.g. an AuthProvider (see utils/auth.py)
             - json: JSON data for POST/PUT requests
             - params: Query parameters
             - data: Form data
             - files: Files to upload
             - timeout: Request timeout (overrides default)
-    
+            - retry_policy: RetryPolicy to use (overrides the default policy)
+            - cache: False to skip the response cache (see enable_response_cache)
+            - single_flight: False to always send the request itself (see enable_single_flight)
+
     Returns:
-        requests.Response: The response object from the request
-    
+        requests.Response: The response object from the request. If the last
+        attempt still got a retryable status (e.g. 503), that response is returned.
+
     Raises:
         requests.exceptions.RequestException: If all retry attempts fail
-    
+
     Example:
         # Send a GET request
         response = send_request('GET', 'https://api.example.com/data')
-        
+
         # Send a POST request with JSON data
         response = send_request('POST', 'https://api.example.com/create',
                               json={'name': 'test'})
+
+        # Send a request exactly once
+        response = send_request('GET', 'https://api.example.com/data',
+                              retry_policy=NO_RETRIES)
     """
-    # Try the request multiple times if it fails
-    for attempt in range(MAX_RETRIES):
+    for captured in _captures:
+        captured.append((method, url, dict(kwargs)))
+
+    # Answer GETs of static endpoints from the response cache when it is enabled
+    cache = _response_cache
+    cache_key = etag = None
+    if cache is not None and cache.accepts(method, url, kwargs):
+        cache_key = cache.key(url, kwargs.get("params"), _key_headers(kwargs))
+        cached, etag = cache.lookup(cache_key)
+        if cached is not None:
+            logger.info(f"Served {method} request to {url} from the response cache")
+            return cached
+        if etag:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": etag}
+    kwargs.pop("cache", None)
+
+    # Use the default timeout unless the caller gave one
+    if "timeout" not in kwargs:
+        kwargs["timeout"] = get_settings().test_timeout
+
+    # Share one request between identical reads sent at the same time
+    flight = _single_flight
+    coalesce = flight is not None and flight.accepts(method, kwargs)
+    kwargs.pop("single_flight", None)
+    if coalesce:
+        # Requests sent with different auth objects are different requests
+        key_kwargs = dict(kwargs, headers=_key_headers(kwargs))
+        return flight.do(method, url, key_kwargs, lambda: _send(method, url, kwargs, cache, cache_key, etag))
+    return _send(method, url, kwargs, cache, cache_key, etag)
+
+
+def _send(method, url, kwargs, cache=None, cache_key=None, etag=None):
+    """Send a request of send_request over the pooled session, retrying as the retry policy allows"""
+    policy = kwargs.pop("retry_policy", None) or get_default_retry_policy()
+    policy.get_budget().record_request()
+    session = get_session()
+    started = time.perf_counter()
+
+    # Try the request until it succeeds or the retry policy gives up
+    attempt = 0
+    while True:
+        attempt += 1
         try:
             # Log the request details
             logger.info(f"Sending {method} request to {url}")
-            
-            # Make the HTTP request
-            response = requests.request(
+
+            # Make the HTTP request over the pooled session
+            _reset_connection_timings()
+            response = session.request(
                 method=method,      # HTTP method (GET, POST, etc.)
                 url=url,           # Target URL
-                timeout=TEST_TIMEOUT,  # Request timeout in seconds
                 **kwargs           # Additional request parameters
             )
-            
-            # Log the response status
-            logger.info(f"Response status code: {response.status_code}")
-            
-            # Return the response if successful
-            return response
-            
+
         except requests.exceptions.RequestException as e:
-            # Log the error and retry if attempts remain
-            logger.error(f"Request failed (attempt {attempt + 1}/{MAX_RETRIES}): {str(e)}")
-            
-            # If this was the last attempt, raise the exception
-            if attempt == MAX_RETRIES - 1:
-                raise 
\ No newline at end of file
+            # Log the error and retry if the policy allows it
+            logger.error(f"Request failed (attempt {attempt}/{policy.max_attempts}): {str(e)}")
+            delay = policy.next_delay(method, attempt, error=e)
+
+            # If no retry is allowed, raise the exception
+            if delay is None:
+                _notify_listeners(method, url, kwargs.get("params"), started, attempt, error=e)
+                raise
+
+        else:
+            # Log the response status and whether the connection was reused
+            new_connection = _local.new_connections > 0
+            _record_connection_timing(new_connection, response.elapsed.total_seconds())
+            logger.info(f"Response status code: {response.status_code} "
+                        f"({response.elapsed.total_seconds() * 1000:.0f} ms, "
+                        f"{'new' if new_connection else 'reused'} connection)")
+
+            # Return the response unless its status should be retried
+            delay = policy.next_delay(method, attempt, response=response)
+            if delay is None:
+                _notify_listeners(method, url, kwargs.get("params"), started, attempt, response=response)
+                if _resource_tracker is not None:
+                    _resource_tracker.observe(method, url, response)
+                if cache_key is not None:
+                    return cache.update(cache_key, response, revalidating=etag is not None)
+                return response
+
+            logger.warning(f"Retryable status {response.status_code} "
+                           f"(attempt {attempt}/{policy.max_attempts})")
+            response.close()
+
+        # Wait before the next attempt
+        get_current_test_stats().record(delay)
+        logger.info(f"Retrying {method} request to {url} in {delay:.2f} s")
+        policy.sleep(delay)
@@ -0,0 +1,221 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from config.config import CLEANUP_BATCH_SIZE, CLEANUP_CONCURRENCY, CLEANUP_RETRIES, CLEANUP_RETRY_DELAY
+from utils.logger import get_logger
+
+# Initialize logger for created resources
+logger = get_logger()
+
+# DELETE statuses that mean the resource was deleted, or was already gone
+DELETED_STATUSES = frozenset({200, 202, 204})
+GONE_STATUSES = frozenset({404, 410})
+
+# DELETE status that means the API has no such delete route (see _route_missing)
+UNSUPPORTED_ROUTE_STATUSES = frozenset({405})
+
+
+@dataclass(frozen=True)
+class TrackedEndpoint:
+    """
+    An endpoint that creates resources the tests should delete again.
+
+    Parameters:
+        url (str): URL the resources are created with by POST, without query parameters
+        id_field (str): Key of the new resource's id in the response body
+        delete_url (callable): Returns the URL that deletes the resource with a given id
+    """
+
+    url: str
+    id_field: str
+    delete_url: object
+
+
+@dataclass
+class CreatedResource:
+    """A resource created during the session, and the Authorization header it was created with"""
+
+    endpoint: TrackedEndpoint
+    resource_id: object
+    authorization: str = None
+
+    def __str__(self):
+        return f"{self.endpoint.id_field}={self.resource_id}"
+
+
+class ResourceTracker:
+    """
+    Records the resources created through send_request and deletes them again.
+
+    Every response is passed to observe() (see enable_resource_tracking). A 200 answer to a
+    POST to a tracked endpoint adds the id from its body, with the Authorization header it
+    was created with. cleanup() deletes the recorded resources in batches of `batch_size`,
+    `concurrency` at a time. Deletes that still fail after the retry policy of send_request
+    are tried again in up to `retries` more rounds; a 404 counts as already deleted.
+
+    A 405, or a 2xx answer with a body that is not JSON (e.g. the web app's HTML page),
+    means the delete route does not exist: that resource is reported as failed and not
+    tried again, and the endpoint's other resources are still sent.
+
+    Parameters:
+        endpoints (list): TrackedEndpoints whose created resources are recorded
+        batch_size (int): Resources deleted per batch
+        concurrency (int): DELETE requests in flight at once
+        retries (int): Extra rounds for deletes that failed
+        retry_delay (float): Seconds before the first extra round, doubled for every next one
+
+    Example:
+        tracker = ResourceTracker([TrackedEndpoint(valuation_endpoint, "Valuation_id", get_valuation_endpoint)])
+        enable_resource_tracking(tracker)
+        send_request("POST", valuation_endpoint, json=valid_valuation_payload, headers=headers)
+        report = tracker.cleanup()  # {"tracked": 1, "deleted": 1, ...}
+    """
+
+    def __init__(self, endpoints, batch_size=CLEANUP_BATCH_SIZE, concurrency=CLEANUP_CONCURRENCY,
+                 retries=CLEANUP_RETRIES, retry_delay=CLEANUP_RETRY_DELAY):
+        self.endpoints = {endpoint.url.rstrip("/"): endpoint for endpoint in endpoints}
+        self.batch_size = max(batch_size, 1)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._resources = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._resources)
+
+    def observe(self, method, url, response):
+        """Record the resource created by a response, if it is a successful create of a tracked endpoint"""
+        if method.upper() != "POST" or response.status_code != 200:
+            return
+        endpoint = self.endpoints.get(url.split("?", 1)[0].rstrip("/"))
+        # Streamed bodies are left to the caller
+        if endpoint is None or not response._content_consumed:
+            return
+        try:
+            body = response.json()
+        except ValueError:
+            return
+        resource_id = body.get(endpoint.id_field) if isinstance(body, dict) else None
+        if resource_id is None:
+            logger.warning(f"Created resource at {url} has no {endpoint.id_field}; it will not be deleted")
+            return
+        self.add(endpoint, resource_id, response.request.headers.get("Authorization"))
+
+    def add(self, endpoint, resource_id, authorization=None):
+        """Record a resource to delete in cleanup(), e.g. one created without send_request"""
+        with self._lock:
+            self._resources.append(CreatedResource(endpoint, resource_id, authorization))
+
+    def cleanup(self):
+        """
+        Delete every recorded resource.
+
+        Returns:
+            dict: Counts of "tracked", "deleted", "already_gone" and "failed" resources, and
+                  "failures": one "<id>: <reason>" line per resource that could not be deleted
+        """
+        with self._lock:
+            pending, self._resources = self._resources, []
+        report = {"tracked": len(pending), "deleted": 0, "already_gone": 0, "failed": 0, "failures": []}
+        if not pending:
+            return report
+
+        # Imported here: asyncio is slow to import and most sessions create nothing
+        from utils.async_request_handler import send_many
+
+        started = time.perf_counter()
+        reasons = {}
+        unsupported = []
+        missing_routes = set()
+
+        def count(resource, response, failed):
+            if _route_missing(response):
+                reasons[id(resource)] = (f"delete route unsupported: DELETE {response.url} "
+                                         f"answered {response.status_code}")
+                unsupported.append(resource)
+                # One error per endpoint; the failures list names every resource
+                if resource.endpoint not in missing_routes:
+                    missing_routes.add(resource.endpoint)
+                    logger.error(f"{reasons[id(resource)]}; resources created at {resource.endpoint.url} "
+                                 f"are not deleted")
+                return
+            outcome = _outcome(response)
+            if outcome in ("deleted", "already_gone"):
+                report[outcome] += 1
+            else:
+                reasons[id(resource)] = outcome
+                failed.append(resource)
+
+        for round_no in range(self.retries + 1):
+            if round_no:
+                delay = self.retry_delay * 2 ** (round_no - 1)
+                logger.info(f"Retrying {len(pending)} failed deletes in {delay:.2f} s "
+                            f"(round {round_no + 1}/{self.retries + 1})")
+                time.sleep(delay)
+            failed = []
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                responses = send_many([self._delete_request(resource) for resource in batch],
+                                      concurrency=self.concurrency, return_exceptions=True)
+                for resource, response in zip(batch, responses):
+                    count(resource, response, failed)
+            pending = failed
+            if not pending:
+                break
+
+        pending = unsupported + pending
+        report["failed"] = len(pending)
+        report["failures"] = [f"{resource}: {reasons[id(resource)]}" for resource in pending]
+        logger.info(f"Cleanup deleted {report['deleted']} of {report['tracked']} created resources "
+                    f"in {time.perf_counter() - started:.2f} s ({report['already_gone']} already gone, "
+                    f"{report['failed']} failed)")
+        for failure in report["failures"]:
+            logger.error(f"Could not delete {failure}")
+        return report
+
+    @staticmethod
+    def _delete_request(resource):
+        headers = {"Authorization": resource.authorization} if resource.authorization else {}
+        return {"method": "DELETE", "url": resource.endpoint.delete_url(resource.resource_id), "headers": headers}
+
+
+def _route_missing(response):
+    """Return True if a DELETE response shows the route does not exist"""
+    if isinstance(response, Exception):
+        return False
+    if response.status_code in UNSUPPORTED_ROUTE_STATUSES:
+        return True
+    # CloudFront answers unknown paths with the web app's HTML page; an empty 204 is a delete
+    return (response.status_code in DELETED_STATUSES and bool(response.content)
+            and "json" not in response.headers.get("Content-Type", ""))
+
+
+def _outcome(response):
+    """Return the report key for a DELETE response, or the reason it failed"""
+    if isinstance(response, Exception):
+        return f"{type(response).__name__}: {response}"
+    if response.status_code in DELETED_STATUSES:
+        return "deleted"
+    if response.status_code in GONE_STATUSES:
+        return "already_gone"
+    return f"status code {response.status_code}: {response.text[:200]}"
+
+
+def merge_cleanup_reports(reports):
+    """Add up the cleanup reports of several processes (e.g. one per xdist worker)"""
+    total = {"tracked": 0, "deleted": 0, "already_gone": 0, "failed": 0, "failures": []}
+    for report in reports:
+        for name in ("tracked", "deleted", "already_gone", "failed"):
+            total[name] += report.get(name, 0)
+        total["failures"].extend(report.get("failures", ()))
+    return total
+
+
+def format_cleanup_report(report):
+    """Return the lines of a cleanup summary"""
+    lines = [f"Deleted {report['deleted']} of {report['tracked']} created resources "
+             f"({report['already_gone']} already gone, {report['failed']} failed)"]
+    lines.extend(f"Could not delete {failure}" for failure in report["failures"])
+    return lines
@@ -0,0 +1,164 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from config.config import RESPONSE_CACHE_ENDPOINTS, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL
+
+
+@dataclass
+class CacheEntry:
+    """A cached response and when it has to be revalidated"""
+
+    response: object
+    expires: float
+    etag: str = None
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of GET responses from endpoints that serve static reference data.
+
+    Responses are keyed by URL, query parameters and a hash of the Authorization header,
+    so different users never share entries. A fresh entry is returned without a request.
+    When an entry is older than `ttl` seconds, the next request sends If-None-Match with
+    its ETag, and a 304 answer makes the entry fresh again without a new body.
+    Only 200 responses are stored. With more than `max_entries` entries, the least
+    recently used one is dropped.
+
+    Parameters:
+        ttl (float): Seconds an entry is used without asking the server
+        max_entries (int): Largest number of entries kept
+        endpoints (iterable): URL paths whose GET responses may be cached (e.g. "/api/factor")
+
+    Example:
+        cache = ResponseCache(ttl=300, endpoints=["/api/factor"])
+        enable_response_cache(cache)
+        send_request("GET", factor_url, headers=headers)  # sent
+        send_request("GET", factor_url, headers=headers)  # served from the cache
+    """
+
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 endpoints=RESPONSE_CACHE_ENDPOINTS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.endpoints = {endpoint.rstrip("/") for endpoint in endpoints}
+        self.bypass = False
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0, "bypassed": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def accepts(self, method, url, kwargs):
+        """Return True if this request may be answered from the cache"""
+        if method.upper() != "GET" or kwargs.get("stream") or urlsplit(url).path.rstrip("/") not in self.endpoints:
+            return False
+        if self.bypass or kwargs.get("cache") is False:
+            with self._lock:
+                self.stats["bypassed"] += 1
+            return False
+        return True
+
+    @staticmethod
+    def key(url, params=None, headers=None):
+        """Return the cache key of a request: URL, sorted query parameters and a hash of the auth header"""
+        items = params.items() if isinstance(params, dict) else (params or ())
+        query = tuple(sorted((str(name), str(value)) for name, value in items))
+        token = next((value for name, value in (headers or {}).items() if name.lower() == "authorization"), None)
+        identity = hashlib.sha256(token.encode()).hexdigest()[:16] if token else None
+        return url, query, identity
+
+    def lookup(self, key):
+        """
+        Return (response, etag): a copy of the cached response if it is fresh, otherwise
+        None and the ETag to revalidate a stale entry with (None if there is no entry).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if time.monotonic() < entry.expires:
+                self.stats["hits"] += 1
+                return _copy_response(entry.response), None
+            if entry.etag is None:
+                del self._entries[key]
+                self.stats["misses"] += 1
+                return None, None
+            return None, entry.etag
+
+    def update(self, key, response, revalidating=False):
+        """
+        Store a 200 response, or turn a 304 answer to a revalidation into the cached response.
+
+        Parameters:
+            key (tuple): Cache key from key()
+            response (requests.Response): Response from the server
+            revalidating (bool): True if the request was sent with the ETag from lookup()
+
+        Returns:
+            requests.Response: The response to hand to the caller
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if revalidating:
+                if response.status_code == 304 and entry is not None:
+                    entry.expires = time.monotonic() + self.ttl
+                    entry.etag = response.headers.get("ETag", entry.etag)
+                    self.stats["revalidated"] += 1
+                    return _copy_response(entry.response)
+                # The data changed (or the entry is gone): a new body counts as a miss
+                self.stats["misses"] += 1
+                self._entries.pop(key, None)
+
+            if response.status_code != 200 or not response._content_consumed:
+                return response
+            self._entries[key] = CacheEntry(response, time.monotonic() + self.ttl, response.headers.get("ETag"))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def hit_rate(self):
+        """Share of cacheable requests answered without a new body (hits and 304 revalidations)"""
+        served = self.stats["hits"] + self.stats["revalidated"]
+        total = served + self.stats["misses"]
+        return served / total if total else 0.0
+
+
+def _copy_response(response):
+    """Return a copy of a cached response, so callers cannot change the cached one"""
+    cached = copy.copy(response)
+    cached.headers = response.headers.copy()
+    cached.from_cache = True
+    return cached
+
+
+def merge_cache_stats(stats_list):
+    """Add up the stats of several caches (e.g. one per xdist worker)"""
+    total = {}
+    for stats in stats_list:
+        for name, value in stats.items():
+            total[name] = total.get(name, 0) + value
+    return total
+
+
+def format_cache_stats(stats):
+    """Return a one-line summary of cache stats"""
+    served = stats.get("hits", 0) + stats.get("revalidated", 0)
+    total = served + stats.get("misses", 0)
+    hit_rate = served / total * 100 if total else 0.0
+    return (f"{stats.get('hits', 0)} hits, {stats.get('revalidated', 0)} revalidated (304), "
+            f"{stats.get('misses', 0)} misses: {hit_rate:.1f}% hit rate; "
+            f"{stats.get('evictions', 0)} evictions, {stats.get('bypassed', 0)} bypassed requests")
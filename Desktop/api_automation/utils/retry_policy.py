@@ -0,0 +1,221 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from config.config import (
+    MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_AFTER_MAX,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MIN_RETRIES,
+    RETRY_BUDGET_MAX_BACKOFF,
+)
+
+# Status codes that usually mean "try again later"
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Methods that can be sent twice without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryStats:
+    """Retry counters for one test (or any other unit of work)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.backoff_seconds = 0.0
+
+    def record(self, delay):
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += delay
+
+    def reset(self):
+        with self._lock:
+            self.retries = 0
+            self.backoff_seconds = 0.0
+
+
+class RetryBudget:
+    """
+    Limit on retries shared by every request in the test session.
+
+    The budget allows `min_retries` retries plus `ratio` retries per request sent,
+    and at most `max_backoff_seconds` spent sleeping between attempts. Once it is
+    used up, requests fail (or return their last response) without retrying, so a
+    degraded backend cannot double the suite runtime.
+
+    Parameters:
+        ratio (float): Extra retries allowed per request sent
+        min_retries (int): Retries always allowed, even before many requests are sent
+        max_backoff_seconds (float): Total time allowed for sleeping between attempts
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, min_retries=RETRY_BUDGET_MIN_RETRIES,
+                 max_backoff_seconds=RETRY_BUDGET_MAX_BACKOFF):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.max_backoff_seconds = max_backoff_seconds
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.stats = RetryStats()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self, delay):
+        """Reserve one retry and `delay` seconds of backoff; return False if the budget is used up"""
+        with self._lock:
+            allowed_retries = self.min_retries + self.ratio * self.requests
+            if self.stats.retries + 1 > allowed_retries:
+                return False
+            if self.stats.backoff_seconds + delay > self.max_backoff_seconds:
+                return False
+            self.stats.record(delay)
+            return True
+
+
+class RetryPolicy:
+    """
+    Decides whether a request should be retried and how long to wait first.
+
+    Waits use exponential backoff with full jitter: a random time between zero and
+    `backoff_base * 2 ** (attempt - 1)` seconds, capped at `backoff_max`. A
+    `Retry-After` header on the response is used instead when present.
+
+    Parameters:
+        max_attempts (int): Total attempts per request, including the first one
+        backoff_base (float): Backoff for the first retry, in seconds
+        backoff_max (float): Upper limit for a single backoff, in seconds
+        retry_statuses (set): Status codes that are retried
+        retry_methods (set): Methods that are retried on these statuses or on errors
+        retry_after_max (float): Longest Retry-After that is honoured; longer waits are not retried
+        budget (RetryBudget): Session-wide retry budget (default: the shared budget)
+        sleep (callable): Function used to wait between attempts
+
+    Example:
+        # Also retry POST requests that time out on the server
+        policy = RetryPolicy(retry_methods=IDEMPOTENT_METHODS | {"POST"}, retry_statuses={408})
+        response = send_request("POST", endpoint, json=payload, retry_policy=policy)
+    """
+
+    def __init__(self, max_attempts=MAX_RETRIES, backoff_base=RETRY_BACKOFF_BASE,
+                 backoff_max=RETRY_BACKOFF_MAX, retry_statuses=RETRY_STATUSES,
+                 retry_methods=IDEMPOTENT_METHODS, retry_after_max=RETRY_AFTER_MAX,
+                 budget=None, sleep=time.sleep):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.retry_after_max = retry_after_max
+        self.budget = budget
+        self.sleep = sleep
+
+    def get_budget(self):
+        return self.budget if self.budget is not None else get_session_budget()
+
+    def backoff(self, attempt):
+        """Return a full-jitter backoff for the given attempt number (1 = first attempt)"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def is_retryable_error(self, method, error):
+        # A connect timeout means the request never reached the server, so any method is safe
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        return method.upper() in self.retry_methods
+
+    def is_retryable_response(self, method, response):
+        return method.upper() in self.retry_methods and response.status_code in self.retry_statuses
+
+    def next_delay(self, method, attempt, response=None, error=None):
+        """
+        Return how long to wait before the next attempt, or None if the request should not be retried.
+
+        Parameters:
+            method (str): HTTP method of the request
+            attempt (int): Number of the attempt that just finished (1 = first attempt)
+            response (requests.Response): Response of that attempt, if any
+            error (Exception): Exception raised by that attempt, if any
+
+        Returns:
+            float or None: Seconds to wait, or None to stop retrying
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if error is not None and not self.is_retryable_error(method, error):
+            return None
+        if response is not None and not self.is_retryable_response(method, response):
+            return None
+
+        delay = self.backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > self.retry_after_max:
+                    return None
+                delay = retry_after
+
+        if not self.get_budget().try_spend(delay):
+            return None
+        return delay
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+# Policy for requests that must be sent exactly once, e.g. tests that expect an error status
+NO_RETRIES = RetryPolicy(max_attempts=1)
+
+# Shared budget for the whole test session in this process
+_session_budget = RetryBudget()
+
+# Retries made by the test that is currently running in this process
+_current_test_stats = RetryStats()
+
+# Policy used by send_request when the caller does not pass one
+_default_policy = RetryPolicy()
+
+
+def get_session_budget():
+    return _session_budget
+
+
+def get_current_test_stats():
+    return _current_test_stats
+
+
+def get_default_retry_policy():
+    return _default_policy
+
+
+def set_default_retry_policy(policy):
+    """Replace the policy send_request uses when no retry_policy argument is given"""
+    global _default_policy
+    _default_policy = policy
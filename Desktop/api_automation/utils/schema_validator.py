@@ -0,0 +1,165 @@
+from functools import lru_cache
+
+from data.schemas import RESPONSE_SCHEMAS
+
+# Exact type checks for the JSON schema types (bool is not an integer here, as in JSON schema)
+TYPE_CHECKS = {
+    "object": lambda value: type(value) is dict,
+    "array": lambda value: type(value) is list,
+    "string": lambda value: type(value) is str,
+    "integer": lambda value: type(value) is int or (type(value) is float and value.is_integer()),
+    "number": lambda value: type(value) in (int, float),
+    "boolean": lambda value: type(value) is bool,
+    "null": lambda value: value is None,
+}
+
+# Keywords the compiled fast path understands; schemas using others are only checked by jsonschema
+FAST_PATH_KEYWORDS = {"type", "required", "properties", "items", "additionalProperties"}
+
+
+class ResponseSchemaError(AssertionError):
+    """Raised when a response body does not match its schema"""
+
+
+def compile_checker(schema):
+    """
+    Turn a schema into a plain Python function that returns True when a value matches.
+
+    The function does no error reporting, which makes it much faster than jsonschema on
+    large `results` arrays; a failing value is checked again with jsonschema to find out why.
+
+    Returns:
+        callable: The check function, or None if the schema uses keywords the fast path does not support
+    """
+    if not isinstance(schema, dict) or set(schema) - FAST_PATH_KEYWORDS:
+        return None
+
+    checks = []
+    if "type" in schema:
+        types = [schema["type"]] if isinstance(schema["type"], str) else schema["type"]
+        if any(type_name not in TYPE_CHECKS for type_name in types):
+            return None
+        type_checks = [TYPE_CHECKS[type_name] for type_name in types]
+        checks.append(type_checks[0] if len(type_checks) == 1 else
+                      lambda value: any(check(value) for check in type_checks))
+
+    required = tuple(schema.get("required", ()))
+    properties = {}
+    for key, property_schema in schema.get("properties", {}).items():
+        properties[key] = compile_checker(property_schema)
+        if properties[key] is None:
+            return None
+    additional = None
+    if "additionalProperties" in schema:
+        additional = compile_checker(schema["additionalProperties"])
+        if additional is None:
+            return None
+    if required or properties or additional:
+        def check_object(value):
+            if type(value) is not dict:
+                return True
+            for key in required:
+                if key not in value:
+                    return False
+            for key, check in properties.items():
+                if key in value and not check(value[key]):
+                    return False
+            if additional is not None:
+                return all(additional(item) for key, item in value.items() if key not in properties)
+            return True
+        checks.append(check_object)
+
+    if "items" in schema:
+        items = compile_checker(schema["items"])
+        if items is None:
+            return None
+        checks.append(lambda value: type(value) is not list or all(map(items, value)))
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda value: all(check(value) for check in checks)
+
+
+@lru_cache(maxsize=None)
+def get_validator(name):
+    """
+    Return the (jsonschema validator, fast check function) for a schema in data/schemas.py.
+
+    Both are built once per process and reused for every response.
+    """
+    if name not in RESPONSE_SCHEMAS:
+        raise KeyError(f"Unknown response schema {name!r}; add it to data/schemas.py")
+    schema = RESPONSE_SCHEMAS[name]
+    # Imported here: jsonschema is slow to import and only needed once a response is validated
+    from jsonschema import Draft202012Validator
+    Draft202012Validator.check_schema(schema)
+    return Draft202012Validator(schema), compile_checker(schema)
+
+
+@lru_cache(maxsize=None)
+def get_item_validator(name):
+    """Return the (jsonschema validator, fast check function) for the list items of a schema"""
+    schema = RESPONSE_SCHEMAS.get(name)
+    if schema is None:
+        raise KeyError(f"Unknown response schema {name!r}; add it to data/schemas.py")
+    if schema.get("type") == "object":
+        schema = schema.get("properties", {}).get("results", {})
+    if "items" not in schema:
+        raise KeyError(f"Response schema {name!r} has no list items to check")
+    item_schema = schema["items"]
+    from jsonschema import Draft202012Validator
+    Draft202012Validator.check_schema(item_schema)
+    return Draft202012Validator(item_schema), compile_checker(item_schema)
+
+
+def _format_path(path, root="response"):
+    text = root
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}"
+    return text
+
+
+def validate_response(name, data):
+    """
+    Check a response body against a schema from data/schemas.py.
+
+    Parameters:
+        name (str): Schema name, e.g. "factor_list"
+        data: Parsed response body
+
+    Raises:
+        ResponseSchemaError: With the location of the first mismatch, e.g.
+            "factor_list: response.results[3].weight[0]: 'metric_id' is a required property"
+
+    Example:
+        validate_response("factor_list", response.json())
+    """
+    validator, check = get_validator(name)
+    if check is not None and check(data):
+        return
+    error = next(validator.iter_errors(data), None)
+    if error is not None:
+        raise ResponseSchemaError(f"{name}: {_format_path(error.absolute_path)}: {error.message}")
+
+
+def item_validator(name):
+    """
+    Return a function that checks one item of a list response against a schema from data/schemas.py,
+    for checking items one at a time (see utils/json_stream.py).
+
+    For paginated schemas the items are those of `results`.
+
+    Example:
+        check = item_validator("factor_list")
+        check(factor)  # raises ResponseSchemaError, e.g. "factor_list: item.weight[0]: ..."
+    """
+    validator, check = get_item_validator(name)
+
+    def validate_item(item):
+        if check is not None and check(item):
+            return
+        error = next(validator.iter_errors(item), None)
+        if error is not None:
+            raise ResponseSchemaError(f"{name}: {_format_path(error.absolute_path, root='item')}: {error.message}")
+
+    return validate_item
@@ -0,0 +1,224 @@
+import base64
+import copy
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config.config import SINGLE_FLIGHT_DIR
+from utils.file_lock import file_lock
+from utils.logger import get_logger
+
+# Initialize logger for request coalescing
+logger = get_logger()
+
+# Reads that may share one response; they have no body and do not change anything
+SINGLE_FLIGHT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class _Call:
+    """A request in flight and what its waiting callers get once it finishes"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical reads share one request.
+
+    The first caller with a given method, URL, query parameters and headers sends the
+    request; callers on other threads asking for the same thing while it is in flight
+    wait for it and get a copy of its response (or its exception). A request made after
+    the previous one finished is sent again, so nothing is served stale.
+
+    With `directory`, xdist workers coordinate too: the sender holds a lock file per
+    request while it sends and then writes the response next to it. A worker that had to
+    wait for the lock uses that response instead of sending its own. Responses are only
+    kept for the run; the directory is removed with clear().
+
+    Parameters:
+        directory (str): Folder shared by the workers of one run (default: threads of this process only)
+
+    Example:
+        flight = SingleFlight()
+        enable_single_flight(flight)
+        send_many([{"method": "GET", "url": factor_url, "headers": headers}] * 8)  # one request sent
+        flight.stats  # {'sent': 1, 'coalesced': 7, 'from_workers': 0}
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.stats = {"sent": 0, "coalesced": 0, "from_workers": 0}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def accepts(method, kwargs):
+        """Return True if this request may share its response with identical ones"""
+        return (method.upper() in SINGLE_FLIGHT_METHODS and kwargs.get("single_flight") is not False
+                and not kwargs.get("stream")
+                and all(kwargs.get(name) is None for name in ("data", "json", "files")))
+
+    @staticmethod
+    def key(method, url, params=None, headers=None):
+        """Return the key of a request: a hash of method, URL, sorted query parameters and headers"""
+        items = params.items() if isinstance(params, dict) else (params or ())
+        query = sorted((str(name), str(value)) for name, value in items)
+        header_items = sorted((str(name).lower(), str(value)) for name, value in (headers or {}).items())
+        text = json.dumps([method.upper(), url, query, header_items])
+        return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+    def do(self, method, url, kwargs, send):
+        """
+        Return the response of `send()`, sharing it with identical requests in flight.
+
+        Parameters:
+            method (str): HTTP method
+            url (str): URL of the request
+            kwargs (dict): send_request arguments; params and headers are part of the key
+            send (callable): Sends the request and returns its response
+
+        Returns:
+            requests.Response: A copy of the shared response
+        """
+        key = self.key(method, url, kwargs.get("params"), kwargs.get("headers"))
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            logger.info(f"Shared the response of an identical {method} request to {url} in flight")
+            return _share(call.response)
+
+        try:
+            if self.directory:
+                call.response = self._send_once_across_workers(key, method, url, kwargs, send)
+            else:
+                call.response = self._send(send)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # The sender gets a copy too, so changing it cannot reach the callers still waking up
+        return _share(call.response, coalesced=False)
+
+    def _send(self, send):
+        response = send()
+        with self._lock:
+            self.stats["sent"] += 1
+        return response
+
+    def _send_once_across_workers(self, key, method, url, kwargs, send):
+        """Send while holding the request's lock file, unless another worker just got the response"""
+        result_path = os.path.join(self.directory, f"{key}.json")
+        before = _read_result(result_path)
+        with file_lock(os.path.join(self.directory, f"{key}.lock")):
+            result = _read_result(result_path)
+            # A new result appeared while this worker waited: its request was in flight
+            if result is not None and (before is None or result["generation"] != before["generation"]):
+                with self._lock:
+                    self.stats["from_workers"] += 1
+                logger.info(f"Used another worker's response to an identical {method} request to {url}")
+                return _load_response(result, method, url, kwargs)
+            response = self._send(send)
+            _write_result(result_path, response)
+            return response
+
+    def clear(self):
+        """Remove the responses shared between workers"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        try:
+            os.rmdir(self.directory)
+        except OSError:
+            pass
+
+
+def new_run_directory(root=SINGLE_FLIGHT_DIR):
+    """Return a folder name for the responses the workers of one run share"""
+    return os.path.join(root, uuid.uuid4().hex[:12])
+
+
+def _share(response, coalesced=True):
+    """Return a copy of a shared response, so callers cannot change each other's"""
+    shared = copy.copy(response)
+    shared.headers = response.headers.copy()
+    shared.coalesced = coalesced
+    return shared
+
+
+def _read_result(path):
+    try:
+        with open(path, encoding="utf-8") as result_file:
+            return json.load(result_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_result(path, response):
+    """Write a response for the other workers; the file is replaced in one step so it is never read half written"""
+    if not response._content_consumed:
+        return
+    result = {
+        "generation": uuid.uuid4().hex,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": dict(response.headers),
+        "encoding": response.encoding,
+        "url": response.url,
+        "elapsed_s": response.elapsed.total_seconds(),
+        "body_b64": base64.b64encode(response.content or b"").decode(),
+    }
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as result_file:
+        json.dump(result, result_file)
+    os.replace(temporary_path, path)
+
+
+def _load_response(result, method, url, kwargs):
+    """Build a requests.Response from another worker's result"""
+    response = requests.Response()
+    response.status_code = result["status"]
+    response.reason = result["reason"]
+    response.headers = CaseInsensitiveDict(result["headers"])
+    response.encoding = result["encoding"]
+    response.url = result["url"]
+    response.elapsed = timedelta(seconds=result["elapsed_s"])
+    response._content = base64.b64decode(result["body_b64"])
+    response._content_consumed = True
+    response.request = requests.Request(method, url, params=kwargs.get("params"),
+                                        headers=kwargs.get("headers")).prepare()
+    return response
+
+
+def format_single_flight_stats(stats):
+    """Return a one-line summary of single-flight stats"""
+    coalesced = stats.get("coalesced", 0) + stats.get("from_workers", 0)
+    total = coalesced + stats.get("sent", 0)
+    share = coalesced / total * 100 if total else 0.0
+    return (f"{coalesced} of {total} reads coalesced ({share:.1f}%): {stats.get('coalesced', 0)} waited on "
+            f"an identical request in flight, {stats.get('from_workers', 0)} used another worker's response; "
+            f"{stats.get('sent', 0)} sent")
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from difflib import SequenceMatcher
+
+from config.config import SNAPSHOT_MAX_CHANGES, SNAPSHOTS_DIR
+from utils.logger import get_logger
+
+# Initialize logger for snapshots
+logger = get_logger()
+
+# Stored in place of ignored values, so the key still has to be there
+IGNORED = "<ignored>"
+
+# One segment of an ignore path: ".name" / "name", "[3]", "[*]" or ".*" / ".**"
+PATH_SEGMENT = re.compile(r"\.?([^.\[\]]+)|\[(\*|\d+)\]")
+
+# Characters of test ids and snapshot names replaced in file names
+UNSAFE_FILE_CHARACTERS = re.compile(r"[^\w.-]+")
+
+# Snapshot files written in this process with --update-snapshots
+updated_snapshots = []
+_updated_lock = threading.Lock()
+
+
+class SnapshotMismatch(AssertionError):
+    """A response differs from its stored snapshot; the message lists the differences"""
+
+
+def parse_path(pattern):
+    """
+    Split an ignore path into segments.
+
+    "results[*].createdOn" -> ("results", "*", "createdOn"); "*" matches any one key or
+    index, "**" any number of them ("**.createdOn": createdOn at any depth).
+    """
+    segments, position = [], 0
+    while position < len(pattern):
+        match = PATH_SEGMENT.match(pattern, position)
+        if match is None:
+            raise ValueError(f"Invalid snapshot ignore path {pattern!r}, e.g. use 'results[*].createdOn'")
+        key, index = match.groups()
+        segments.append(key if key is not None else "*" if index == "*" else int(index))
+        position = match.end()
+    if not segments:
+        raise ValueError("Snapshot ignore paths must not be empty")
+    return tuple(segments)
+
+
+def normalize(data, ignore=()):
+    """
+    Return a JSON value with the values at the ignore paths replaced by IGNORED.
+
+    Only branches an ignore path leads into are copied; the rest is shared with `data`.
+
+    Parameters:
+        data: Parsed JSON value
+        ignore (iterable): Ignore paths, e.g. ["results[*].createdOn", "**.updatedOn"]
+    """
+    patterns = [parse_path(pattern) for pattern in ignore]
+    if not patterns:
+        return data
+
+    def closure(states):
+        # "**" also matches no segment at all
+        states = set(states)
+        pending = list(states)
+        while pending:
+            index, position = pending.pop()
+            if position < len(patterns[index]) and patterns[index][position] == "**" and (index, position + 1) not in states:
+                states.add((index, position + 1))
+                pending.append((index, position + 1))
+        return frozenset(states)
+
+    # Transitions are the same for every item of a list, so they are worked out once
+    transitions = {}
+
+    def advance(states, key):
+        try:
+            return transitions[states, key]
+        except KeyError:
+            pass
+        following = []
+        for index, position in states:
+            pattern = patterns[index]
+            if position == len(pattern):
+                continue
+            segment = pattern[position]
+            if segment == "**":
+                following.append((index, position))
+            elif segment == "*" or (segment == key and type(segment) is type(key)):
+                following.append((index, position + 1))
+        result = transitions[states, key] = closure(following)
+        return result
+
+    def walk(value, states):
+        if not states:
+            return value
+        if any(position == len(patterns[index]) for index, position in states):
+            return IGNORED
+        if isinstance(value, dict):
+            return {key: walk(item, advance(states, key)) for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item, advance(states, index)) for index, item in enumerate(value)]
+        return value
+
+    return walk(data, closure((index, 0) for index in range(len(patterns))))
+
+
+def canonical(data):
+    """Return the JSON text two values share exactly when they are equal (key order does not matter)"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class SubtreeDigests:
+    """
+    Digests of the dicts and lists of a JSON value, worked out when first asked for.
+
+    A digest covers the whole subtree, so equal subtrees can be skipped without walking
+    them. Each one hashes the subtree's canonical text, which json serializes in C; only
+    the branches a diff walks into get digests of their own.
+    """
+
+    def __init__(self):
+        self._digests = {}
+
+    def __call__(self, value):
+        try:
+            return self._digests[id(value)]
+        except KeyError:
+            digest = self._digests[id(value)] = hashlib.blake2b(canonical(value).encode(), digest_size=16).digest()
+            return digest
+
+    def key(self, value):
+        """Return what a list item is aligned by: its digest, or its type and value if it is not a container"""
+        return self(value) if isinstance(value, (dict, list)) else (type(value), value)
+
+
+def format_path(path, root="response"):
+    text = root
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}"
+    return text
+
+
+def _preview(value, limit=80):
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def diff(expected, actual, max_changes=SNAPSHOT_MAX_CHANGES):
+    """
+    Return the differences between two JSON values, one line per change.
+
+    Subtree digests are compared first, so only branches that differ are walked. List
+    items are aligned by their digests, so an inserted item shows up as one addition
+    instead of every later item changing. Items a list starts and ends with on both sides
+    are skipped before aligning, so one change in a long list aligns a single item.
+
+    Parameters:
+        expected: Stored value
+        actual: New value
+        max_changes (int): Stop after this many changes
+
+    Example:
+        diff({"total": 15, "results": [1, 2]}, {"total": 16, "results": [1, 3, 2]})
+        # ['response.results[1]: added 3', 'response.total: 15 -> 16']
+    """
+    expected_digests, actual_digests = SubtreeDigests(), SubtreeDigests()
+    changes = []
+
+    def same(old, new):
+        if type(old) is not type(new):
+            return False
+        if isinstance(old, (dict, list)):
+            return expected_digests(old) == actual_digests(new)
+        return old == new
+
+    def walk(old, new, path):
+        if len(changes) >= max_changes or same(old, new):
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in sorted(old.keys() - new.keys(), key=str):
+                changes.append(f"{format_path(path + (key,))}: removed {_preview(old[key])}")
+            for key in sorted(new.keys() - old.keys(), key=str):
+                changes.append(f"{format_path(path + (key,))}: added {_preview(new[key])}")
+            for key in sorted(old.keys() & new.keys(), key=str):
+                walk(old[key], new[key], path + (key,))
+        elif isinstance(old, list) and isinstance(new, list):
+            old_keys = [expected_digests.key(item) for item in old]
+            new_keys = [actual_digests.key(item) for item in new]
+            start, old_end, new_end = 0, len(old), len(new)
+            while start < old_end and start < new_end and old_keys[start] == new_keys[start]:
+                start += 1
+            while old_end > start and new_end > start and old_keys[old_end - 1] == new_keys[new_end - 1]:
+                old_end, new_end = old_end - 1, new_end - 1
+            # Only the part between the common start and end is aligned
+            matcher = SequenceMatcher(None, old_keys[start:old_end], new_keys[start:new_end], autojunk=False)
+            blocks = [(start + i1, start + i2, start + j1, start + j2)
+                      for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+            for old_start, old_end, new_start, new_end in blocks:
+                # Items replaced one for one are compared field by field
+                paired = min(old_end - old_start, new_end - new_start)
+                for offset in range(paired):
+                    walk(old[old_start + offset], new[new_start + offset], path + (new_start + offset,))
+                for index in range(old_start + paired, old_end):
+                    changes.append(f"{format_path(path + (index,))}: removed {_preview(old[index])}")
+                for index in range(new_start + paired, new_end):
+                    changes.append(f"{format_path(path + (index,))}: added {_preview(new[index])}")
+        else:
+            changes.append(f"{format_path(path)}: {_preview(old)} -> {_preview(new)}")
+
+    walk(expected, actual, ())
+    return changes[:max_changes]
+
+
+def snapshot_path(nodeid, name=None, directory=SNAPSHOTS_DIR):
+    """
+    Return the file of a test's snapshot: <directory>/<test module>/<test name>[_<name>].json
+
+    Example:
+        snapshot_path("tests/test_getfactors.py::test_get_factors")
+        # 'tests/snapshots/test_getfactors/test_get_factors.json'
+    """
+    module, _, test = nodeid.partition("::")
+    module = os.path.splitext(os.path.basename(module))[0]
+    file_name = UNSAFE_FILE_CHARACTERS.sub("_", test.replace("::", ".")).strip("_")
+    if name:
+        file_name += "_" + UNSAFE_FILE_CHARACTERS.sub("_", name)
+    return os.path.join(directory, module, f"{file_name}.json")
+
+
+class Snapshot:
+    """
+    Compares responses of one test with golden files stored under SNAPSHOTS_DIR.
+
+    Values are normalized first: ignored paths hold IGNORED and keys are sorted. An equal
+    response costs one JSON serialization, compared as text with the stored file; only a
+    response that differs is diffed, branch by branch (see diff). With `update` the
+    snapshot is written instead, when it is missing or differs.
+
+    Parameters:
+        nodeid (str): Node id of the test, which names the snapshot files
+        update (bool): Write snapshots instead of comparing (pytest --update-snapshots)
+        directory (str): Folder the snapshots are kept in
+
+    Example:
+        def test_get_factors(snapshot, auth_token):
+            response = send_request("GET", factor_list.url(), headers={"Authorization": auth_token})
+            snapshot.assert_match(response.json(), ignore=["results[*].createdOn"])
+    """
+
+    def __init__(self, nodeid, update=False, directory=SNAPSHOTS_DIR):
+        self.nodeid = nodeid
+        self.update = update
+        self.directory = directory
+        self._names = set()
+
+    def assert_match(self, data, name=None, ignore=()):
+        """
+        Check `data` against the stored snapshot.
+
+        Parameters:
+            data: Parsed JSON response body
+            name (str): Tells several snapshots of one test apart
+            ignore (iterable): Ignore paths of volatile values, e.g. ["results[*].createdOn"]
+
+        Raises:
+            SnapshotMismatch: With every difference (up to SNAPSHOT_MAX_CHANGES), or when there is no snapshot yet
+        """
+        if name in self._names:
+            raise ValueError(f"Snapshot {name!r} is used twice in {self.nodeid}; pass a different name")
+        self._names.add(name)
+        path = snapshot_path(self.nodeid, name, self.directory)
+        actual = normalize(data, ignore)
+
+        stored = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as snapshot_file:
+                stored = normalize(json.load(snapshot_file), ignore)
+            if canonical(stored) == canonical(actual):
+                return
+        if self.update:
+            self._write(path, actual)
+            return
+        if stored is None:
+            raise SnapshotMismatch(f"No snapshot at {path}; run pytest with --update-snapshots to create it")
+
+        changes = diff(stored, actual)
+        raise SnapshotMismatch(
+            f"Response differs from snapshot {path} (run pytest with --update-snapshots if the change is expected):\n"
+            + "\n".join(f"  {change}" for change in changes)
+        )
+
+    @staticmethod
+    def _write(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(data, snapshot_file, indent=2, sort_keys=True, ensure_ascii=False)
+            snapshot_file.write("\n")
+        with _updated_lock:
+            updated_snapshots.append(path)
+        logger.info(f"Wrote snapshot {path}")
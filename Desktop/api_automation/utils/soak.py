@@ -0,0 +1,311 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from config.config import (
+    SOAK_ERROR_RATE_RISE, SOAK_GROWTH_LIMITS, SOAK_LATENCY_DRIFT, SOAK_MIN_SAMPLES, SOAK_WARMUP_WINDOWS,
+    SOAK_WINDOW_SECONDS,
+)
+from utils.logger import get_logger
+from utils.metrics import percentile
+from utils.request_handler import get_pool_stats
+
+# Initialize logger for soak runs
+logger = get_logger()
+
+# Durations like "90s", "30m", "2h" or "1h30m"; a plain number is seconds
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)([hms])")
+DURATION_UNITS = {"h": 3600, "m": 60, "s": 1}
+
+# Windows whose median is compared when looking for latency drift (first and last ones)
+DRIFT_WINDOWS = 3
+
+
+def parse_duration(text):
+    """
+    Return the number of seconds in a duration such as "45s", "30m", "8h" or "1h30m".
+
+    Raises:
+        ValueError: If the text is not a positive duration
+    """
+    text = text.strip().lower()
+    try:
+        seconds = float(text)
+    except ValueError:
+        parts = DURATION_PART.findall(text)
+        if not parts or "".join(number + unit for number, unit in parts) != text:
+            raise ValueError(f"Invalid duration {text!r}; use e.g. 90s, 30m, 8h or 1h30m") from None
+        seconds = sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+    if seconds <= 0:
+        raise ValueError(f"Duration {text!r} must be longer than 0 s")
+    return seconds
+
+
+def _rss_mb():
+    """Return the resident memory of this process in MB, or None where it cannot be read"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Without /proc (macOS) only the peak is known, which still shows growth
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _open_fds():
+    """Return the number of open file descriptors of this process, or None where it cannot be read"""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            # Listing the folder opens one descriptor itself
+            return len(os.listdir(path)) - 1
+        except OSError:
+            continue
+    return None
+
+
+def sample_resources():
+    """Return the process and connection pool values a soak run watches"""
+    rss_mb = _rss_mb()
+    pools = get_pool_stats()
+    return {
+        "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+        "open_fds": _open_fds(),
+        "pools": pools["pools"],
+        "idle_connections": pools["idle"],
+        "opened_connections": pools["opened"],
+    }
+
+
+@dataclass
+class SoakWindow:
+    """
+    Resource samples and request latency of one window of a soak run.
+
+    Resource values are sampled when the window closes; `latency` has the count, errors,
+    p50 and p90 of the requests sent during the window per "METHOD /endpoint".
+    """
+
+    index: int
+    started: float
+    ended: float
+    runs: int = 0
+    failures: int = 0
+    requests: int = 0
+    errors: int = 0
+    resources: dict = field(default_factory=dict)
+    latency: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def is_growing(values, min_increase):
+    """
+    Return True if `values` keep rising: by at least `min_increase` overall, falling in at
+    most a fifth of the steps (memory can drop after garbage collection).
+    """
+    values = [value for value in values if value is not None]
+    if len(values) < 3 or values[-1] - values[0] < min_increase:
+        return False
+    steps = [after - before for before, after in zip(values, values[1:])]
+    return sum(1 for step in steps if step < 0) <= len(steps) / 5
+
+
+def _median(values):
+    return percentile(sorted(values), 50) if values else None
+
+
+def find_leaks(windows, limits=SOAK_GROWTH_LIMITS):
+    """Return a finding for every resource that kept growing over the windows"""
+    findings = []
+    for name, limit in limits.items():
+        values = [window.resources.get(name) for window in windows]
+        if is_growing(values, limit):
+            known = [value for value in values if value is not None]
+            findings.append(f"{name} grew in {len(known) - 1} windows from {known[0]} to {known[-1]} "
+                            f"(limit {limit}): possible leak")
+    return findings
+
+
+def find_degradation(windows, drift=SOAK_LATENCY_DRIFT, error_rate_rise=SOAK_ERROR_RATE_RISE,
+                     min_samples=SOAK_MIN_SAMPLES):
+    """
+    Return a finding for every endpoint whose latency or error rate got worse.
+
+    The median p90 of the first DRIFT_WINDOWS windows is compared with that of the last
+    ones; windows where an endpoint had fewer than `min_samples` requests are left out.
+    """
+    findings = []
+    if len(windows) < 2:
+        return findings
+    count = min(DRIFT_WINDOWS, len(windows) // 2)
+    endpoints = sorted({endpoint for window in windows for endpoint in window.latency})
+    for endpoint in endpoints:
+        stats = [window.latency.get(endpoint) for window in windows]
+        stats = [entry for entry in stats if entry and entry["count"] >= min_samples]
+        if len(stats) < 2:
+            continue
+        first, last = stats[:count], stats[-count:]
+        before, after = _median([entry["p90_ms"] for entry in first]), _median([entry["p90_ms"] for entry in last])
+        if before and after > before * (1 + drift):
+            findings.append(f"{endpoint}: p90 drifted from {before:.1f} ms to {after:.1f} ms "
+                            f"(+{(after / before - 1) * 100:.0f} %)")
+        rate_before = sum(entry["errors"] for entry in first) / sum(entry["count"] for entry in first)
+        rate_after = sum(entry["errors"] for entry in last) / sum(entry["count"] for entry in last)
+        if rate_after - rate_before >= error_rate_rise:
+            findings.append(f"{endpoint}: error rate rose from {rate_before:.1%} to {rate_after:.1%}")
+    return findings
+
+
+class SoakMonitor:
+    """
+    Samples a soak run in windows of `window_seconds` and looks for leaks and degradation.
+
+    Register record() with add_request_listener for the per-endpoint latency, call
+    test_finished() after every test and tick() between tests; tick() closes the window
+    when its time is up. The first `warmup_windows` windows are reported but left out of
+    the analysis, since pools, caches and imports fill them.
+
+    Parameters:
+        duration (float): Length of the soak run in seconds
+        window_seconds (float): Length of one sampling window in seconds
+        warmup_windows (int): Windows left out of the analysis
+
+    Example:
+        monitor = SoakMonitor(duration=parse_duration("2h"))
+        add_request_listener(monitor.record)
+        monitor.start()
+        while not monitor.expired():
+            run_tests()
+            monitor.tick()
+        monitor.stop()
+        print("\n".join(monitor.format_summary()))
+    """
+
+    def __init__(self, duration, window_seconds=SOAK_WINDOW_SECONDS, warmup_windows=SOAK_WARMUP_WINDOWS):
+        self.duration = duration
+        self.window_seconds = window_seconds
+        self.warmup_windows = warmup_windows
+        self.windows = []
+        self.passes = 0
+        self.started = None
+        self.baseline = None
+        self._window_started = None
+        self._runs = 0
+        self._failures = 0
+        self._latencies = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started = self._window_started = time.monotonic()
+        self.baseline = sample_resources()
+        logger.info(f"Soak run for {self.duration:.0f} s in windows of {self.window_seconds:.0f} s, "
+                    f"starting at {self.baseline}")
+
+    def expired(self):
+        return time.monotonic() - self.started >= self.duration
+
+    def record(self, record):
+        """Request listener: add a request to the current window"""
+        key = f"{record.method} {record.endpoint}"
+        with self._lock:
+            self._latencies.setdefault(key, []).append(record.total_ms)
+            if record.error or (record.status or 0) >= 500:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def test_finished(self, passed):
+        self._runs += 1
+        if not passed:
+            self._failures += 1
+
+    def tick(self):
+        """Close the current window if its time is up"""
+        if time.monotonic() - self._window_started >= self.window_seconds:
+            self.close_window()
+
+    def stop(self):
+        """Close the last window, if anything ran in it"""
+        if self._runs or self._latencies:
+            self.close_window()
+
+    def close_window(self):
+        now = time.monotonic()
+        with self._lock:
+            latencies, self._latencies = self._latencies, {}
+            errors, self._errors = self._errors, {}
+        latency = {}
+        for key in sorted(latencies):
+            totals = sorted(latencies[key])
+            latency[key] = {
+                "count": len(totals),
+                "errors": errors.get(key, 0),
+                "p50_ms": round(percentile(totals, 50), 1),
+                "p90_ms": round(percentile(totals, 90), 1),
+            }
+        window = SoakWindow(
+            index=len(self.windows), started=round(self._window_started - self.started, 3),
+            ended=round(now - self.started, 3), runs=self._runs, failures=self._failures,
+            requests=sum(entry["count"] for entry in latency.values()),
+            errors=sum(entry["errors"] for entry in latency.values()),
+            resources=sample_resources(), latency=latency,
+        )
+        self.windows.append(window)
+        self._window_started, self._runs, self._failures = now, 0, 0
+        logger.info(f"Soak window {window.index}: {window.runs} tests ({window.failures} failed), "
+                    f"{window.requests} requests ({window.errors} errors), {window.resources}")
+        return window
+
+    def findings(self):
+        """Return the possible leaks and degradations found in the windows after warm-up"""
+        windows = self.windows[self.warmup_windows:]
+        return find_leaks(windows) + find_degradation(windows)
+
+    def format_summary(self):
+        """Return the lines of the soak summary: one row per window, then the findings"""
+        runs = sum(window.runs for window in self.windows)
+        failures = sum(window.failures for window in self.windows)
+        lines = [f"{self.passes} passes, {runs} tests ({failures} failed) in {len(self.windows)} windows "
+                 f"of {self.window_seconds:.0f} s; {self.warmup_windows} warm-up window(s) not analysed",
+                 f"{'window':>6}  {'end':>8}  {'tests':>6}  {'failed':>6}  {'requests':>8}  {'errors':>6}  "
+                 f"{'rss':>9}  {'fds':>5}  {'pools':>5}  {'idle':>5}  {'opened':>6}"]
+        for window in self.windows:
+            resources = window.resources
+            rss = f"{resources['rss_mb']:.1f}MB" if resources.get("rss_mb") is not None else "-"
+            fds = resources["open_fds"] if resources.get("open_fds") is not None else "-"
+            lines.append(
+                f"{window.index:>6}  {window.ended:>7.0f}s  {window.runs:>6}  {window.failures:>6}  "
+                f"{window.requests:>8}  {window.errors:>6}  {rss:>9}  {fds:>5}  {resources['pools']:>5}  "
+                f"{resources['idle_connections']:>5}  {resources['opened_connections']:>6}"
+            )
+        findings = self.findings()
+        lines.extend(f"FLAG: {finding}" for finding in findings)
+        if not findings:
+            lines.append("No resource growth or latency drift found")
+        return lines
+
+    def write_json(self, path):
+        """Write the windows and findings to a JSON file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_s": self.duration,
+            "window_s": self.window_seconds,
+            "warmup_windows": self.warmup_windows,
+            "passes": self.passes,
+            "baseline": self.baseline,
+            "windows": [window.to_dict() for window in self.windows],
+            "findings": self.findings(),
+        }
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)